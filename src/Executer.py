@@ -3,10 +3,12 @@
 import random
 import threading
 import time
-from typing import Dict, List, Optional
+from typing import Dict, Optional
 from pacman.game.constants import MOVE, GHOST, DELAY, INTERVAL_WAIT
 from pacman.game.game import Game
 from pacman.game.game_view import GameView
+from pacman.game.internal import state_codec
+from pacman.game.profiler import PhaseProfiler
 from pacman.controllers.controller import Controller
 from pacman.controllers.human_controller import HumanController
 from pacman.controllers.keyboard_input import KeyBoardInput
@@ -24,25 +26,51 @@ from pacman.controllers.agents.q_learning_agent import QLearningAgent
 from data_recording.data_collector_controller import DataCollectorController
 
 
+# Replays saved under this suffix hold binary states (Game.to_bytes()) instead of text lines.
+REPLAY_BINARY_SUFFIX = ".bin"
+
+
 class Executor:
-    def run_experiment(self, pacman_controller: Controller[MOVE], ghost_controller: Controller[Dict[GHOST, MOVE]], trials: int):
-        # ... (This function remains the same)
+    def run_experiment(self, pacman_controller: Controller[MOVE], ghost_controller: Controller[Dict[GHOST, MOVE]], trials: int,
+                       profile_file: Optional[str] = None):
+        """
+        Plays a number of games without visuals and prints their scores.
+
+        :param pacman_controller: The Pac-Man controller.
+        :param ghost_controller: The Ghosts controller.
+        :param trials: The number of games.
+        :param profile_file: If given, times the engine phases and writes them to this file (.csv or .json).
+        """
         avg_score = 0
         rnd = random.Random(0)
+        game = None
+        profiler = PhaseProfiler() if profile_file else None
 
         for i in range(trials):
-            game = Game(rnd.randint(0, 2**32 - 1))
+            seed = rnd.randint(0, 2**32 - 1)
+            if game is None:
+                game = Game(seed)
+                if profiler is not None:
+                    profiler.attach(game)
+            else:
+                game.reset(seed)
             while not game.game_over():
                 game.advance_game(
                     pacman_controller.get_move(
-                        game.copy(), time.time() * 1000 + DELAY),
+                        game.snapshot(), time.time() * 1000 + DELAY),
                     ghost_controller.get_move(
-                        game.copy(), time.time() * 1000 + DELAY)
+                        game.snapshot(), time.time() * 1000 + DELAY)
                 )
             avg_score += game.get_score()
             print(f"{i}\t{game.get_score()}")
 
         print(avg_score / trials)
+        if game is not None:
+            print(f"  [DEBUG] {game.copy_stats.snapshots} snapshots, {game.copy_stats.copies} real copies")
+        if profiler is not None:
+            print(profiler)
+            profiler.save(profile_file)
+            print(f"  [DEBUG] Phase timings written to {profile_file}")
 
     def run_game(self, pacman_controller: Controller[MOVE], ghost_controller: Controller[Dict[GHOST, MOVE]], visual: bool, delay: int):
         """
@@ -75,8 +103,8 @@ class Executor:
                 if not game.game_over():
                     # Compute moves synchronously for this frame
                     current_time_ms = int(time.time() * 1000)
-                    pac_move = pacman_controller._get_move(game.copy(), current_time_ms + DELAY)
-                    # ghost_moves = ghost_controller._get_move(game.copy(), current_time_ms + DELAY)
+                    pac_move = pacman_controller._get_move(game.snapshot(), current_time_ms + DELAY)
+                    # ghost_moves = ghost_controller._get_move(game.snapshot(), current_time_ms + DELAY)
                     # Keep controller state consistent
                     pacman_controller.last_move = pac_move
                     # ghost_controller.last_move = ghost_moves
@@ -96,13 +124,13 @@ class Executor:
         else:
             print("[DEBUG] Visual mode is OFF. Running game logic only.")
             while not game.game_over():
-                pac_move = pacman_controller._get_move(game.copy(), -1)
-                ghost_moves = ghost_controller._get_move(game.copy(), -1)
+                pac_move = pacman_controller._get_move(game.snapshot(), -1)
+                ghost_moves = ghost_controller._get_move(game.snapshot(), -1)
                 pacman_controller.last_move = pac_move
                 ghost_controller.last_move = ghost_moves
                 game.advance_game(pac_move, ghost_moves)
-                pac_move = pacman_controller._get_move(game.copy(), -1)
-                ghost_moves = ghost_controller._get_move(game.copy(), -1)
+                pac_move = pacman_controller._get_move(game.snapshot(), -1)
+                ghost_moves = ghost_controller._get_move(game.snapshot(), -1)
                 pacman_controller.last_move = pac_move
                 ghost_controller.last_move = ghost_moves
                 game.advance_game(pac_move, ghost_moves)
@@ -130,9 +158,9 @@ class Executor:
             def update_game():
                 if not game.game_over():
                     pacman_controller.update(
-                        game.copy(), time.time() * 100 + DELAY)
+                        game.snapshot(), time.time() * 100 + DELAY)
                     ghost_controller.update(
-                        game.copy(), time.time() * 100 + DELAY)
+                        game.snapshot(), time.time() * 100 + DELAY)
                     game.advance_game(
                         pacman_controller.get_move(), ghost_controller.get_move())
                     gv.render()
@@ -157,9 +185,9 @@ class Executor:
 
             while not game.game_over():
                 pacman_controller.update(
-                    game.copy(), time.time() * 100 + DELAY)
+                    game.snapshot(), time.time() * 100 + DELAY)
                 ghost_controller.update(
-                    game.copy(), time.time() * 100 + DELAY)
+                    game.snapshot(), time.time() * 100 + DELAY)
                 time.sleep(DELAY / 1000.0)
                 game.advance_game(pacman_controller.get_move(),
                                   ghost_controller.get_move())
@@ -188,9 +216,9 @@ class Executor:
             def update_game():
                 if not game.game_over():
                     pacman_controller.update(
-                        game.copy(), time.time() * 100 + DELAY)
+                        game.snapshot(), time.time() * 100 + DELAY)
                     ghost_controller.update(
-                        game.copy(), time.time() * 100 + DELAY)
+                        game.snapshot(), time.time() * 100 + DELAY)
                     waited = DELAY // INTERVAL_WAIT
                     for j in range(DELAY // INTERVAL_WAIT):
                         time.sleep(INTERVAL_WAIT / 1000.0)
@@ -222,9 +250,9 @@ class Executor:
 
             while not game.game_over():
                 pacman_controller.update(
-                    game.copy(), time.time() * 100 + DELAY)
+                    game.snapshot(), time.time() * 100 + DELAY)
                 ghost_controller.update(
-                    game.copy(), time.time() * 100 + DELAY)
+                    game.snapshot(), time.time() * 100 + DELAY)
                 waited = DELAY // INTERVAL_WAIT
                 for j in range(DELAY // INTERVAL_WAIT):
                     time.sleep(INTERVAL_WAIT / 1000.0)
@@ -247,9 +275,10 @@ class Executor:
         :param pacman_controller: The Pac-Man controller.
         :param ghost_controller: The Ghosts controller.
         :param visual: Whether to use visuals.
-        :param file_name: The file name to save the replay.
+        :param file_name: The file name to save the replay (binary if it ends with REPLAY_BINARY_SUFFIX).
         """
         replay = []
+        binary = file_name.endswith(REPLAY_BINARY_SUFFIX)
         game = Game(0)
         gv = None
 
@@ -261,14 +290,14 @@ class Executor:
             def update_game():
                 if not game.game_over():
                     pacman_controller.update(
-                        game.copy(), time.time() * 100 + DELAY)
+                        game.snapshot(), time.time() * 100 + DELAY)
                     ghost_controller.update(
-                        game.copy(), time.time() * 100 + DELAY)
+                        game.snapshot(), time.time() * 100 + DELAY)
                     time.sleep(DELAY / 1000.0)
                     game.advance_game(
                         pacman_controller.get_move(), ghost_controller.get_move())
                     gv.render()
-                    replay.append(game.get_game_state())
+                    replay.append(game.to_bytes() if binary else game.get_game_state())
                     gv.root.after(DELAY, update_game)
 
             pacman_thread = threading.Thread(target=pacman_controller.run)
@@ -279,7 +308,7 @@ class Executor:
             gv.root.mainloop()
             pacman_controller.terminate()
             ghost_controller.terminate()
-            self.save_to_file("\n".join(replay), file_name, False)
+            self.save_replay(replay, file_name)
 
         else:
             pacman_thread = threading.Thread(target=pacman_controller.run)
@@ -289,17 +318,17 @@ class Executor:
 
             while not game.game_over():
                 pacman_controller.update(
-                    game.copy(), time.time() * 100 + DELAY)
+                    game.snapshot(), time.time() * 100 + DELAY)
                 ghost_controller.update(
-                    game.copy(), time.time() * 100 + DELAY)
+                    game.snapshot(), time.time() * 100 + DELAY)
                 time.sleep(DELAY / 1000.0)
                 game.advance_game(pacman_controller.get_move(),
                                   ghost_controller.get_move())
-                replay.append(game.get_game_state())
+                replay.append(game.to_bytes() if binary else game.get_game_state())
 
             pacman_controller.terminate()
             ghost_controller.terminate()
-            self.save_to_file("\n".join(replay), file_name, False)
+            self.save_replay(replay, file_name)
 
     def replay_game(self, file_name: str, visual: bool):
         """
@@ -317,7 +346,7 @@ class Executor:
 
             def update_game(step=0):
                 if step < len(time_steps):
-                    game.set_game_state(time_steps[step])
+                    self.apply_time_step(game, time_steps[step])
                     gv.render()
                     gv.root.after(DELAY, update_game, step + 1)
 
@@ -326,7 +355,7 @@ class Executor:
 
         else:
             for time_step in time_steps:
-                game.set_game_state(time_step)
+                self.apply_time_step(game, time_step)
                 time.sleep(DELAY / 1000.0)
 
     @staticmethod
@@ -344,14 +373,50 @@ class Executor:
         except IOError:
             print("Could not save data!")
 
+    def save_replay(self, replay: list, file_name: str):
+        """
+        Saves a recorded game: binary states back to back, or one text state per line.
+
+        :param replay: The recorded time steps.
+        :param file_name: The file name.
+        """
+        if file_name.endswith(REPLAY_BINARY_SUFFIX):
+            try:
+                with open(file_name, 'wb') as f:
+                    f.write(b"".join(replay))
+            except IOError:
+                print("Could not save data!")
+        else:
+            self.save_to_file("\n".join(replay), file_name, False)
+
+    @staticmethod
+    def apply_time_step(game: Game, time_step):
+        """
+        Puts the game into a recorded state.
+
+        :param game: The game to update.
+        :param time_step: A binary or text state from load_replay.
+        """
+        if isinstance(time_step, bytes):
+            game.from_bytes(time_step)
+        else:
+            game.set_game_state(time_step)
+
     @staticmethod
-    def load_replay(file_name: str) -> List[str]:
+    def load_replay(file_name: str) -> list:
         """
         Loads a replay from a file.
 
         :param file_name: The file name of the replay.
-        :return: A list of time step strings.
+        :return: A list of time steps: bytes records for binary replays, strings otherwise.
         """
+        if file_name.endswith(REPLAY_BINARY_SUFFIX):
+            try:
+                with open(file_name, 'rb') as f:
+                    return state_codec.split_records(f.read())
+            except IOError as e:
+                print(f"Error loading replay: {e}")
+                return []
         replay = []
         try:
             with open(file_name, 'r') as f:
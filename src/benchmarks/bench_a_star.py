@@ -0,0 +1,93 @@
+"""
+Benchmark: AStar (PriorityQueue, shared AStarNode objects) against HeapAStar
+(heapq, flat per-search arrays) on random queries, checking that both return
+the same paths.
+
+Run from the src directory:  python -m benchmarks.bench_a_star [--queries N] [--maze I]
+"""
+
+import argparse
+import io
+import random
+import contextlib
+import threading
+import time
+
+from pacman.game.constants import MOVE
+from pacman.game.game import Game
+from pacman.game.internal.a_star import AStar, HeapAStar
+from pacman.game.internal.maze import MAZES
+
+
+def _queries(node_count: int, count: int, seed: int):
+    rnd = random.Random(seed)
+    moves = list(MOVE)
+    return [(rnd.randrange(node_count), rnd.randrange(node_count), rnd.choice(moves)) for _ in range(count)]
+
+
+def _time_old(graph, queries, game):
+    astar = AStar()
+    astar.create_graph(graph)
+    paths = []
+    start = time.perf_counter()
+    for s, t, move in queries:
+        paths.append(astar.compute_paths_a_star(s, t, move, game))
+        astar.reset_graph()
+    return time.perf_counter() - start, paths
+
+
+def _time_new(graph, queries, game):
+    astar = HeapAStar()
+    astar.create_graph(graph)
+    paths = []
+    start = time.perf_counter()
+    for s, t, move in queries:
+        paths.append(astar.compute_paths_a_star(s, t, move, game))
+    return time.perf_counter() - start, paths
+
+
+def _time_threads(graph, queries, game, threads: int):
+    astar = HeapAStar()
+    astar.create_graph(graph)
+    chunks = [queries[i::threads] for i in range(threads)]
+
+    def work(chunk):
+        for s, t, move in chunk:
+            astar.compute_paths_a_star(s, t, move, game)
+
+    workers = [threading.Thread(target=work, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--maze", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(0, args.maze)
+    graph = MAZES[args.maze].graph
+    queries = _queries(len(graph), args.queries, seed=args.maze)
+
+    for label, heuristic in (("no heuristic", None), ("path-distance heuristic", game)):
+        old_time, old_paths = _time_old(graph, queries, heuristic)
+        new_time, new_paths = _time_new(graph, queries, heuristic)
+        threaded_time = _time_threads(graph, queries, heuristic, args.threads)
+        same = sum(1 for a, b in zip(old_paths, new_paths) if a == b)
+        print(f"{label}: {len(queries)} queries on maze {args.maze}")
+        print(f"  AStar      {old_time * 1000:9.1f} ms  ({old_time / len(queries) * 1e6:8.1f} us/query)")
+        print(f"  HeapAStar  {new_time * 1000:9.1f} ms  ({new_time / len(queries) * 1e6:8.1f} us/query)"
+              f"  speed-up x{old_time / new_time:.1f}")
+        print(f"  HeapAStar  {threaded_time * 1000:9.1f} ms  on {args.threads} threads sharing one instance")
+        print(f"  identical paths: {same}/{len(queries)}")
+
+
+if __name__ == "__main__":
+    main()
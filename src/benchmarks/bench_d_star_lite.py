@@ -0,0 +1,99 @@
+"""
+Benchmark: chasing Ms Pac-Man with the incremental DStarLite planner against
+re-planning every tick with AStar.compute_paths_a_star (and HeapAStar).
+
+Ms Pac-Man's route is recorded from a StarterPacMan vs StarterGhosts game; a
+chaser starting at the ghosts' start node takes one step along its plan per
+tick. Every engine is asked for the same (chaser, Ms Pac-Man) pair each tick.
+
+Run from the src directory:  python -m benchmarks.bench_d_star_lite [--ticks N] [--seed S]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from pacman.controllers.examples.starter_ghosts import StarterGhosts
+from pacman.controllers.examples.starter_pacman import StarterPacMan
+from pacman.game.constants import MOVE
+from pacman.game.game import Game
+from pacman.game.internal.a_star import AStar, HeapAStar
+from pacman.game.internal.d_star_lite import DStarLite
+
+
+def _record_pacman(ticks: int, seed: int):
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game(seed)
+        pacman = StarterPacMan()
+        ghosts = StarterGhosts()
+        ghosts.rnd = random.Random(seed)
+        maze = game.get_current_maze()
+        route = []
+        while len(route) < ticks and not game.game_over() and game.get_current_maze() is maze:
+            route.append(game.get_pacman_current_node_index())
+            game.advance_game(pacman._get_move(game.copy(), -1), ghosts._get_move(game.copy(), -1))
+    return game, maze, route
+
+
+def _chase(maze, route):
+    planner = DStarLite(maze)
+    chaser = maze.initial_ghost_node_index
+    pairs = []
+    for target in route:
+        pairs.append((chaser, target))
+        path = planner.update(chaser, target)
+        if path:
+            chaser = path[0]
+    return pairs
+
+
+def _time_planner(maze, pairs, use_heuristic: bool):
+    planner = DStarLite(maze, use_heuristic)
+    lengths = []
+    start = time.perf_counter()
+    for chaser, target in pairs:
+        lengths.append(len(planner.update(chaser, target)))
+    return time.perf_counter() - start, lengths, planner.expansions
+
+
+def _time_a_star(engine, maze, pairs, game):
+    engine.create_graph(maze.graph)
+    lengths = []
+    start = time.perf_counter()
+    for chaser, target in pairs:
+        lengths.append(len(engine.compute_paths_a_star(chaser, target, MOVE.NEUTRAL, game)) - 1)
+        engine.reset_graph()
+    return time.perf_counter() - start, lengths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    game, maze, route = _record_pacman(args.ticks, args.seed)
+    pairs = _chase(maze, route)
+    optimal = [game.get_shortest_path_distance(a, b) for a, b in pairs]
+    print(f"{len(pairs)} ticks chasing Ms Pac-Man on maze {maze.name}")
+
+    def report(label, seconds, lengths, extra=""):
+        longer = sum(1 for length, best in zip(lengths, optimal) if length > best)
+        print(f"  {label:<34} {seconds * 1000:9.1f} ms  ({seconds / len(pairs) * 1e6:8.1f} us/tick)"
+              f"  non-optimal plans: {longer:4d}{extra}")
+
+    for use_heuristic in (True, False):
+        seconds, lengths, expansions = _time_planner(maze, pairs, use_heuristic)
+        report(f"DStarLite ({'distance table h' if use_heuristic else 'h = 0'})", seconds, lengths,
+               f"  expansions/tick: {expansions / len(pairs):.0f}")
+    for label, heuristic in (("distance table h", game), ("h = 0", None)):
+        seconds, lengths = _time_a_star(AStar(), maze, pairs, heuristic)
+        report(f"AStar every tick ({label})", seconds, lengths)
+        seconds, lengths = _time_a_star(HeapAStar(), maze, pairs, heuristic)
+        report(f"HeapAStar every tick ({label})", seconds, lengths)
+
+
+if __name__ == "__main__":
+    main()
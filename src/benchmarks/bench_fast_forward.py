@@ -0,0 +1,70 @@
+"""
+Benchmark: ticks per second of a tick-by-tick controller loop (both
+controllers asked every tick, on copies of the game) against
+Game.advance_until_decision (controllers asked only where a decision
+exists, on the game itself), with StarterPacMan against StarterGhosts.
+
+Run from the src directory:  python -m benchmarks.bench_fast_forward [--ticks N] [--seed S]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from pacman.controllers.examples.starter_ghosts import StarterGhosts
+from pacman.controllers.examples.starter_pacman import StarterPacMan
+from pacman.game.game import Game
+
+
+def _play_every_tick(seed: int, ticks: int):
+    pacman = StarterPacMan()
+    ghosts = StarterGhosts()
+    ghosts.rnd.seed(seed)
+    game = Game(seed)
+    played = calls = 0
+    start = time.perf_counter()
+    while played < ticks:
+        if game.game_over():
+            game.reset(seed)
+        game.advance_game(pacman._get_move(game.copy(), -1), ghosts._get_move(game.copy(), -1))
+        played += 1
+        calls += 2
+    return time.perf_counter() - start, played, calls
+
+
+def _play_until_decisions(seed: int, ticks: int):
+    pacman = StarterPacMan()
+    ghosts = StarterGhosts()
+    ghosts.rnd.seed(seed)
+    game = Game(seed)
+    played = calls = 0
+    start = time.perf_counter()
+    while played < ticks:
+        if game.game_over():
+            game.reset(seed)
+        summary = game.advance_until_decision(lambda g: pacman._get_move(g, -1),
+                                              lambda g: ghosts._get_move(g, -1), ticks - played)
+        played += summary.ticks
+        calls += summary.pacman_decisions + summary.ghost_decisions
+    return time.perf_counter() - start, played, calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        every_seconds, every_ticks, every_calls = _play_every_tick(args.seed, args.ticks)
+        skip_seconds, skip_ticks, skip_calls = _play_until_decisions(args.seed, args.ticks)
+    print(f"every tick              {every_ticks:6d} ticks, {every_calls:6d} controller calls,"
+          f" {every_seconds * 1000:8.1f} ms  ({every_ticks / every_seconds:8.0f} ticks/s)")
+    print(f"advance_until_decision  {skip_ticks:6d} ticks, {skip_calls:6d} controller calls,"
+          f" {skip_seconds * 1000:8.1f} ms  ({skip_ticks / skip_seconds:8.0f} ticks/s)")
+    print(f"speed-up: {every_seconds / every_ticks / (skip_seconds / skip_ticks):.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark: headless ticks per second of FastGame.advance and of the
+Game.advance_game facade over it, against the reference engine (the rules
+as Game ran them before it delegated to FastGame, kept in
+test/reference_game.py), playing the same random moves from the same seed
+and checking that all three end in the same state.
+
+Run from the src directory:  python -m benchmarks.bench_fast_game [--ticks N] [--seed S]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from pacman.game.fast_game import FastGame, GHOSTS, MOVES
+from pacman.game.game import Game
+from test.reference_game import ReferenceGame
+
+
+def _moves(ticks: int, seed: int):
+    rnd = random.Random(seed)
+    return [(rnd.randrange(len(MOVES)), [rnd.randrange(len(MOVES)) for _ in GHOSTS]) for _ in range(ticks)]
+
+
+def _time_engine(game, moves):
+    enum_moves = [(MOVES[pacman], dict(zip(GHOSTS, (MOVES[code] for code in ghosts)))) for pacman, ghosts in moves]
+    ticks = 0
+    start = time.perf_counter()
+    for pacman, ghosts in enum_moves:
+        if game.game_over():
+            break
+        game.advance_game(pacman, ghosts)
+        ticks += 1
+    return time.perf_counter() - start, ticks, game.get_game_state()
+
+
+def _time_fast_game(seed: int, moves):
+    game = FastGame(seed)
+    ticks = 0
+    start = time.perf_counter()
+    for pacman, ghosts in moves:
+        if game.game_over_flag:
+            break
+        game.advance(pacman, ghosts)
+        ticks += 1
+    return time.perf_counter() - start, ticks, game.get_game_state()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    moves = _moves(args.ticks, args.seed)
+    with contextlib.redirect_stdout(io.StringIO()):
+        reference_seconds, reference_ticks, reference_state = _time_engine(ReferenceGame(args.seed), moves)
+        game_seconds, game_ticks, game_state = _time_engine(Game(args.seed), moves)
+        fast_seconds, fast_ticks, fast_state = _time_fast_game(args.seed, moves)
+    reference_tick = reference_seconds / reference_ticks
+    for name, seconds, ticks in (("reference engine   ", reference_seconds, reference_ticks),
+                                 ("Game.advance_game  ", game_seconds, game_ticks),
+                                 ("FastGame.advance   ", fast_seconds, fast_ticks)):
+        print(f"{name} {ticks:6d} ticks in {seconds * 1000:8.1f} ms  ({ticks / seconds:9.0f} ticks/s)"
+              f"  {reference_tick / (seconds / ticks):5.1f}x the reference")
+    match = game_state == fast_state == reference_state
+    print(f"final states {'match' if match else 'DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark: PathsCache start-up from the old gzip pickle format against the
+flat memory-mapped format, for a bare load and for a load followed by a batch
+of path queries (which materialise the nodes and junctions they touch).
+
+Run from the src directory:  python -m benchmarks.bench_paths_cache [--repeats N] [--queries N]
+"""
+
+import argparse
+import contextlib
+import gzip
+import io
+import os
+import pickle
+import random
+import tempfile
+import time
+
+from pacman.game.constants import MOVE
+from pacman.game.internal.maze import MAZES
+from pacman.game.internal.paths_cache import PathsCache
+
+
+def _save_pickle(cache: PathsCache, path: str):
+    # The format load_or_build used before the flat layout.
+    with gzip.open(path, 'wb') as f:
+        pickle.dump({
+            'junction_index_converter': cache.junction_index_converter,
+            'nodes': cache.nodes,
+            'junctions': cache.junctions
+        }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_pickle(path: str) -> PathsCache:
+    with gzip.open(path, 'rb') as f:
+        cached_data = pickle.load(f)
+    instance = PathsCache.__new__(PathsCache)
+    instance.junction_index_converter = cached_data['junction_index_converter']
+    instance.nodes = cached_data['nodes']
+    instance.junctions = cached_data['junctions']
+    return instance
+
+
+def _queries(maze_index: int, count: int):
+    graph = MAZES[maze_index].graph
+    nodes = [i for i, node in enumerate(graph) if node.neighbourhood]
+    rnd = random.Random(maze_index)
+    moves = list(MOVE)
+    return [(rnd.choice(nodes), rnd.choice(nodes), rnd.choice(moves)) for _ in range(count)]
+
+
+def _time_load(load, path: str, queries, repeats: int):
+    load_time = 0.0
+    query_time = 0.0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        cache = load(path)
+        loaded = time.perf_counter()
+        for a, b, move in queries:
+            cache.get_path_distance_from_a2b(a, b, move)
+        load_time += loaded - start
+        query_time += time.perf_counter() - loaded
+    return load_time / repeats, query_time / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(len(MAZES)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                cache = PathsCache(MAZES[index])
+            pickle_path = os.path.join(directory, f"{index}.pkl.gz")
+            flat_path = os.path.join(directory, f"{index}.bin")
+            _save_pickle(cache, pickle_path)
+            cache.save(flat_path)
+            queries = _queries(index, args.queries)
+
+            old_load, old_queries = _time_load(_load_pickle, pickle_path, queries, args.repeats)
+            new_load, new_queries = _time_load(PathsCache.load, flat_path, queries, args.repeats)
+            print(f"maze {index}: gzip pickle {os.path.getsize(pickle_path) // 1024} KiB, "
+                  f"flat {os.path.getsize(flat_path) // 1024} KiB")
+            print(f"  gzip pickle  load {old_load * 1000:8.2f} ms   + {len(queries)} queries {old_queries * 1000:8.2f} ms")
+            print(f"  flat mmap    load {new_load * 1000:8.2f} ms   + {len(queries)} queries {new_queries * 1000:8.2f} ms"
+                  f"   load speed-up x{old_load / new_load:.0f}")
+
+
+if __name__ == "__main__":
+    main()
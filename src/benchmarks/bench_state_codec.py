@@ -0,0 +1,73 @@
+"""
+Benchmark: encode and decode throughput of the binary game state
+(Game.to_bytes / Game.from_bytes) against the text state
+(Game.get_game_state / Game.set_game_state), over the states of one
+random game.
+
+Run from the src directory:  python -m benchmarks.bench_state_codec [--ticks N] [--seed S]
+"""
+
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from pacman.game.constants import GHOST, MOVE
+from pacman.game.game import Game
+
+
+def _record(ticks: int, seed: int):
+    rnd = random.Random(seed)
+    moves = list(MOVE)
+    games = []
+    game = Game(seed)
+    for _ in range(ticks):
+        if game.game_over():
+            break
+        game.advance_game(rnd.choice(moves), {ghost: rnd.choice(moves) for ghost in GHOST})
+        games.append(game.copy())
+    return games
+
+
+def _time(label: str, count: int, function):
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    print(f"  {label:30s} {seconds * 1000:8.1f} ms  ({count / seconds:9.0f} states/s)")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        games = _record(args.ticks, args.seed)
+        target = Game(args.seed)
+    texts = [game.get_game_state() for game in games]
+    records = [game.to_bytes() for game in games]
+    count = len(games)
+
+    print(f"{count} states; text {sum(map(len, texts)) / count:.0f} chars,"
+          f" binary {sum(map(len, records)) / count:.0f} bytes per state")
+    text_encode = _time("get_game_state", count, lambda: [game.get_game_state() for game in games])
+    binary_encode = _time("to_bytes", count, lambda: [game.to_bytes() for game in games])
+
+    def decode_text():
+        for text in texts:
+            target.set_game_state(text)
+
+    def decode_binary():
+        for record in records:
+            target.from_bytes(record)
+
+    text_decode = _time("set_game_state", count, decode_text)
+    binary_decode = _time("from_bytes", count, decode_binary)
+    print(f"  speed-up: encode {text_encode / binary_encode:.1f}x, decode {text_decode / binary_decode:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Benchmark: game ticks per second of N Game instances stepped one by one
+against one VecGame stepping all N together, on the same random moves.
+
+Run from the src directory:  python -m benchmarks.bench_vec_game [--games N] [--ticks T]
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+import numpy as np
+
+from pacman.game.fast_game import GHOSTS, MOVES
+from pacman.game.game import Game
+from pacman.game.vec_game import VecGame
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--games", type=int, default=256)
+    parser.add_argument("--ticks", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    pacman_moves = rng.integers(0, len(MOVES), size=(args.ticks, args.games))
+    ghost_moves = rng.integers(0, len(MOVES), size=(args.ticks, args.games, len(GHOSTS)))
+    seeds = list(range(args.seed, args.seed + args.games))
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        games = [Game(seed) for seed in seeds]
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            for i, game in enumerate(games):
+                if game.game_over():
+                    game.reset(seeds[i])
+                game.advance_game(MOVES[pacman_moves[tick, i]],
+                                  {ghost: MOVES[code] for ghost, code in zip(GHOSTS, ghost_moves[tick, i])})
+        game_seconds = time.perf_counter() - start
+
+    vec = VecGame(seeds)
+    start = time.perf_counter()
+    for tick in range(args.ticks):
+        vec.step(pacman_moves[tick], ghost_moves[tick])
+    vec_seconds = time.perf_counter() - start
+
+    ticks = args.ticks * args.games
+    print(f"{args.games} games x {args.ticks} ticks")
+    print(f"  Game (one at a time)  {game_seconds * 1000:9.1f} ms  ({ticks / game_seconds:10.0f} ticks/s)")
+    print(f"  VecGame.step          {vec_seconds * 1000:9.1f} ms  ({ticks / vec_seconds:10.0f} ticks/s)")
+    print(f"  speed-up: {game_seconds / vec_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
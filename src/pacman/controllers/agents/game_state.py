@@ -48,11 +48,15 @@ class GameState:
         return list(MOVE)
 
     def get_transitions(self, game: Game, action: MOVE) -> List[Transition]:
-        sim = game.copy()
-        ghost_moves = NullGhosts()._get_move(sim, -1)
-        sim.advance_game(action, ghost_moves)
-        next_state = GameState.from_game(sim)
-        reward = sim.get_score() - game.get_score()
+        # Simulate on the game itself and take the move back, instead of copying it.
+        score = game.get_score()
+        ghost_moves = NullGhosts()._get_move(game, -1)
+        game.advance_game(action, ghost_moves, undoable=True)
+        try:
+            next_state = GameState.from_game(game)
+            reward = game.get_score() - score
+        finally:
+            game.undo()
         return [Transition(next_state, 1.0, reward)]
 
     def __eq__(self, other: object) -> bool:
@@ -4,7 +4,7 @@ from random import Random
 from typing import Dict
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
-from pacman.game.constants import GHOST, MOVE, DM
+from pacman.game.constants import GHOST, MOVE, MOVES
 
 
 class AggressiveGhosts(Controller):
@@ -21,12 +21,11 @@ class AggressiveGhosts(Controller):
         for ghost in GHOST:
             if game.does_ghost_require_action(ghost):
                 if self.rnd.random() < self.CONSISTENCY:
-                    self.my_moves[ghost] = game.get_approximate_next_move_towards_target(
+                    self.my_moves[ghost] = MOVES[game.get_approximate_next_move_towards_target_i(
                         game.get_ghost_current_node_index(ghost),
                         game.get_pacman_current_node_index(),
-                        game.get_ghost_last_move_made(ghost),
-                        DM.PATH
-                    )
+                        game.get_ghost_last_move_made_i(ghost)
+                    )]
                 else:
                     self.my_moves[ghost] = self.moves[self.rnd.randint(
                         0, len(self.moves) - 1)]
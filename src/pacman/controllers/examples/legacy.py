@@ -4,7 +4,7 @@ from random import Random
 from typing import Dict
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
-from pacman.game.constants import GHOST, MOVE, DM
+from pacman.game.constants import GHOST, MOVE, MOVES, DM
 
 
 class Legacy(Controller):
@@ -19,12 +19,11 @@ class Legacy(Controller):
         target_node = game.get_pacman_current_node_index()
 
         if game.does_ghost_require_action(GHOST.BLINKY):
-            self.my_moves[GHOST.BLINKY] = game.get_approximate_next_move_towards_target(
+            self.my_moves[GHOST.BLINKY] = MOVES[game.get_approximate_next_move_towards_target_i(
                 game.get_ghost_current_node_index(GHOST.BLINKY),
                 target_node,
-                game.get_ghost_last_move_made(GHOST.BLINKY),
-                DM.PATH
-            )
+                game.get_ghost_last_move_made_i(GHOST.BLINKY)
+            )]
         if game.does_ghost_require_action(GHOST.INKY):
             self.my_moves[GHOST.INKY] = game.get_approximate_next_move_towards_target(
                 game.get_ghost_current_node_index(GHOST.INKY),
@@ -3,7 +3,7 @@
 from typing import Dict
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
-from pacman.game.constants import GHOST, MOVE, DM
+from pacman.game.constants import GHOST, MOVE, MOVES
 
 
 class Legacy2TheReckoning(Controller):
@@ -32,19 +32,17 @@ class Legacy2TheReckoning(Controller):
                     self.my_moves[ghost] = self._get_retreat_actions(
                         game, ghost)
                 elif game.get_ghost_edible_time(ghost) > 0 or self._close_to_power(game):
-                    self.my_moves[ghost] = game.get_approximate_next_move_away_from_target(
+                    self.my_moves[ghost] = MOVES[game.get_approximate_next_move_away_from_target_i(
                         current_index,
                         pacman_index,
-                        game.get_ghost_last_move_made(ghost),
-                        DM.PATH
-                    )
+                        game.get_ghost_last_move_made_i(ghost)
+                    )]
                 else:
-                    self.my_moves[ghost] = game.get_approximate_next_move_towards_target(
+                    self.my_moves[ghost] = MOVES[game.get_approximate_next_move_towards_target_i(
                         current_index,
                         pacman_index,
-                        game.get_ghost_last_move_made(ghost),
-                        DM.PATH
-                    )
+                        game.get_ghost_last_move_made_i(ghost)
+                    )]
         return self.my_moves
 
     def _close_to_power(self, game: Game) -> bool:
@@ -73,16 +71,14 @@ class Legacy2TheReckoning(Controller):
         current_index = game.get_ghost_current_node_index(ghost)
         pacman_index = game.get_pacman_current_node_index()
         if game.get_ghost_edible_time(ghost) == 0 and game.get_shortest_path_distance(current_index, pacman_index) < self.PACMAN_DISTANCE:
-            return game.get_approximate_next_move_towards_target(
+            return MOVES[game.get_approximate_next_move_towards_target_i(
                 current_index,
                 pacman_index,
-                game.get_ghost_last_move_made(ghost),
-                DM.PATH
-            )
+                game.get_ghost_last_move_made_i(ghost)
+            )]
         else:
-            return game.get_approximate_next_move_towards_target(
+            return MOVES[game.get_approximate_next_move_towards_target_i(
                 current_index,
                 game.get_power_pill_indices()[self.corner_allocation[ghost]],
-                game.get_ghost_last_move_made(ghost),
-                DM.PATH
-            )
+                game.get_ghost_last_move_made_i(ghost)
+            )]
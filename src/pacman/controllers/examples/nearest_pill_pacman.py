@@ -2,7 +2,7 @@
 
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
-from pacman.game.constants import MOVE, DM
+from pacman.game.constants import MOVE
 
 
 class NearestPillPacMan(Controller):
@@ -11,9 +11,7 @@ class NearestPillPacMan(Controller):
         active_pills = game.get_active_pills_indices()
         active_power_pills = game.get_active_power_pills_indices()
         target_node_indices = active_pills + active_power_pills
-        return game.get_next_move_towards_target(
-            game.get_pacman_current_node_index(),
-            game.get_closest_node_index_from_node_index(
-                current_node_index, target_node_indices, DM.PATH),
-            DM.PATH
-        )
+        tree = game.get_shortest_paths(current_node_index, target_node_indices, k=1)
+        if not tree.nearest:
+            return MOVE.NEUTRAL
+        return tree.first_move(tree.nearest[0])
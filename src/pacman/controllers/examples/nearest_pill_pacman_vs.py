@@ -3,7 +3,7 @@
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
 from pacman.game.game_view import GameView
-from pacman.game.constants import MOVE, DM, GHOST
+from pacman.game.constants import MOVE, GHOST
 from tkinter import Canvas
 
 
@@ -13,8 +13,10 @@ class NearestPillPacManVS(Controller):
         active_pills = game.get_active_pills_indices()
         active_power_pills = game.get_active_power_pills_indices()
         target_node_indices = active_pills + active_power_pills
-        nearest = game.get_closest_node_index_from_node_index(
-            current_node_index, target_node_indices, DM.PATH)
+        tree = game.get_shortest_paths(current_node_index, target_node_indices, k=1)
+        if not tree.nearest:
+            return MOVE.NEUTRAL
+        nearest = tree.nearest[0]
 
         # Visuals (commented out as in original)
         # GameView.add_points(game, "green", game.get_shortest_path(game.get_pacman_current_node_index(), nearest))
@@ -42,4 +44,4 @@ class NearestPillPacManVS(Controller):
         #         GameView.add_points(game, colors[index], game.get_a_star_path(game.get_ghost_current_node_index(ghost_type), current_node_index, game.get_ghost_last_move_made(ghost_type)))
         #         index += 1
 
-        return game.get_next_move_towards_target(game.get_pacman_current_node_index(), nearest, DM.PATH)
+        return tree.first_move(nearest)
@@ -4,7 +4,7 @@
 from random import Random
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
-from pacman.game.constants import MOVE
+from pacman.game.constants import MOVE, MOVES
 
 
 class RandomNonRevPacMan(Controller):
@@ -13,6 +13,6 @@ class RandomNonRevPacMan(Controller):
         self.rnd = Random()
 
     def _get_move(self, game: Game, time_due: int) -> MOVE:
-        possible_moves = game.get_possible_moves(
-            game.get_pacman_current_node_index(), game.get_pacman_last_move_made())
-        return possible_moves[self.rnd.randint(0, len(possible_moves) - 1)]
+        possible_moves = game.get_possible_moves_i(
+            game.get_pacman_current_node_index(), game.get_pacman_last_move_made_i())
+        return MOVES[possible_moves[self.rnd.randint(0, len(possible_moves) - 1)]]
@@ -4,7 +4,7 @@ from random import Random
 from typing import Dict
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
-from pacman.game.constants import GHOST, MOVE, DM
+from pacman.game.constants import GHOST, MOVE, MOVES
 
 
 class StarterGhosts(Controller):
@@ -20,27 +20,25 @@ class StarterGhosts(Controller):
         for ghost in GHOST:
             if game.does_ghost_require_action(ghost):
                 if game.get_ghost_edible_time(ghost) > 0 or self._close_to_power(game):
-                    self.my_moves[ghost] = game.get_approximate_next_move_away_from_target(
+                    self.my_moves[ghost] = MOVES[game.get_approximate_next_move_away_from_target_i(
                         game.get_ghost_current_node_index(ghost),
                         game.get_pacman_current_node_index(),
-                        game.get_ghost_last_move_made(ghost),
-                        DM.PATH
-                    )
+                        game.get_ghost_last_move_made_i(ghost)
+                    )]
                 else:
                     if self.rnd.random() < self.CONSISTENCY:
-                        self.my_moves[ghost] = game.get_approximate_next_move_towards_target(
+                        self.my_moves[ghost] = MOVES[game.get_approximate_next_move_towards_target_i(
                             game.get_ghost_current_node_index(ghost),
                             game.get_pacman_current_node_index(),
-                            game.get_ghost_last_move_made(ghost),
-                            DM.PATH
-                        )
+                            game.get_ghost_last_move_made_i(ghost)
+                        )]
                     else:
-                        possible_moves = game.get_possible_moves_with_last_move(
+                        possible_moves = game.get_possible_moves_i(
                             game.get_ghost_current_node_index(ghost),
-                            game.get_ghost_last_move_made(ghost)
+                            game.get_ghost_last_move_made_i(ghost)
                         )
-                        self.my_moves[ghost] = possible_moves[self.rnd.randint(
-                            0, len(possible_moves) - 1)]
+                        self.my_moves[ghost] = MOVES[possible_moves[self.rnd.randint(
+                            0, len(possible_moves) - 1)]]
         return self.my_moves
 
     def _close_to_power(self, game: Game) -> bool:
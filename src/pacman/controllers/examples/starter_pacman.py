@@ -4,7 +4,7 @@
 from typing import List
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
-from pacman.game.constants import MOVE, GHOST, DM
+from pacman.game.constants import MOVE, GHOST, MOVES
 
 
 class StarterPacMan(Controller):
@@ -17,11 +17,10 @@ class StarterPacMan(Controller):
         for ghost in GHOST:
             if game.get_ghost_edible_time(ghost) == 0 and game.get_ghost_lair_time(ghost) == 0:
                 if game.get_shortest_path_distance(current, game.get_ghost_current_node_index(ghost)) < self.MIN_DISTANCE:
-                    return game.get_next_move_away_from_target(
+                    return MOVES[game.get_next_move_away_from_target_i(
                         game.get_pacman_current_node_index(),
-                        game.get_ghost_current_node_index(ghost),
-                        DM.PATH
-                    )
+                        game.get_ghost_current_node_index(ghost)
+                    )]
 
         # Strategy 2: find the nearest edible ghost and go after them
         min_distance = float('inf')
@@ -36,11 +35,10 @@ class StarterPacMan(Controller):
                     min_ghost = ghost
 
         if min_ghost is not None:
-            return game.get_next_move_towards_target(
+            return MOVES[game.get_next_move_towards_target_i(
                 game.get_pacman_current_node_index(),
-                game.get_ghost_current_node_index(min_ghost),
-                DM.PATH
-            )
+                game.get_ghost_current_node_index(min_ghost)
+            )]
 
         # Strategy 3: go after the pills and power pills
         pills = game.get_pill_indices()
@@ -55,9 +53,7 @@ class StarterPacMan(Controller):
             if game.is_power_pill_still_available(i):
                 targets.append(power_pills[i])
 
-        return game.get_next_move_towards_target(
-            current,
-            game.get_closest_node_index_from_node_index(
-                current, targets, DM.PATH),
-            DM.PATH
-        )
+        tree = game.get_shortest_paths(current, targets, k=1)
+        if not tree.nearest:
+            return MOVE.NEUTRAL
+        return tree.first_move(tree.nearest[0])
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 import os
 
 # --- Path Constants ---
@@ -17,14 +17,24 @@ class MOVE(Enum):
     NEUTRAL = "NEUTRAL"
 
     def opposite(self):
-        opposites = {
-            MOVE.UP: MOVE.DOWN,
-            MOVE.RIGHT: MOVE.LEFT,
-            MOVE.DOWN: MOVE.UP,
-            MOVE.LEFT: MOVE.RIGHT,
-            MOVE.NEUTRAL: MOVE.NEUTRAL
-        }
-        return opposites[self]
+        return _OPPOSITES[self]
+
+
+_OPPOSITES = {
+    MOVE.UP: MOVE.DOWN,
+    MOVE.RIGHT: MOVE.LEFT,
+    MOVE.DOWN: MOVE.UP,
+    MOVE.LEFT: MOVE.RIGHT,
+    MOVE.NEUTRAL: MOVE.NEUTRAL
+}
+
+# Integer move codes: a move's code is its position in MOVE (UP, RIGHT, DOWN,
+# LEFT, NEUTRAL). The *_i methods of Game and Node take and return these, for
+# hot paths that would rather index tuples than hash enums.
+MOVES = tuple(MOVE)
+MOVE_CODES = {move: code for code, move in enumerate(MOVES)}
+NEUTRAL_CODE = MOVE_CODES[MOVE.NEUTRAL]
+OPPOSITE_CODES = tuple(MOVE_CODES[move.opposite()] for move in MOVES)
 
 
 class GHOST(Enum):
@@ -43,6 +53,20 @@ class DM(Enum):
     MANHATTAN = "MANHATTAN"
 
 
+class EVENT(IntEnum):
+    """
+    Kinds of game events (see internal/events.py), with what their node and
+    value fields hold.
+    """
+    PILL_EATEN = 0  # Pac-Man's node, pill index
+    POWER_PILL_EATEN = 1  # Pac-Man's node, power pill index
+    GHOST_EATEN = 2  # the ghost's node, its index in GHOST order
+    PACMAN_EATEN = 3  # Pac-Man's node, lives remaining
+    EXTRA_LIFE = 4  # Pac-Man's node, lives remaining
+    LEVEL_COMPLETED = 5  # Pac-Man's node, the new level
+    GAME_OVER = 6  # Pac-Man's node, the final score
+
+
 # Game constants
 PILL = 10  # points for a normal pill
 POWER_PILL = 50  # points for a power pill
@@ -85,6 +109,9 @@ PATH_MAZES = "data\mazes"
 PATH_DISTANCES = "data/distances"
 NODE_NAMES = ["a", "b", "c", "d"]
 DIST_NAMES = ["da", "db", "dc", "dd"]
+# the next maze's path cache is prefetched once this few pills remain or the level is this close to LEVEL_LIMIT
+PATHS_PREFETCH_PILLS = 20
+PATHS_PREFETCH_TIME = 200
 
 # for GameView
 MAG = 2
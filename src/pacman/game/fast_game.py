@@ -0,0 +1,486 @@
+# pacman/game/fast_game.py
+
+from typing import Dict, List, Optional, Sequence
+
+from pacman.game.constants import MOVE, GHOST, EVENT, PILL, POWER_PILL, GHOST_EAT_SCORE, EDIBLE_TIME, \
+    EDIBLE_TIME_REDUCTION, LAIR_REDUCTION, LEVEL_RESET_REDUCTION, COMMON_LAIR_TIME, LEVEL_LIMIT, \
+    GHOST_REVERSAL, MAX_TIME, AWARD_LIFE_LEFT, EXTRA_LIFE_SCORE, NUM_MAZES, NUM_LIVES, \
+    GHOST_SPEED_REDUCTION, MOVES, MOVE_CODES, NEUTRAL_CODE, OPPOSITE_CODES
+from pacman.game.internal import bitset
+from pacman.game.internal.counter_random import CounterRandom
+from pacman.game.internal.events import EventBuffer
+from pacman.game.internal.maze import Maze, MAZES
+
+# Moves are coded by their position in MOVE: UP, RIGHT, DOWN, LEFT, NEUTRAL.
+UP, RIGHT, DOWN, LEFT = 0, 1, 2, 3
+NUM_MOVE_CODES = len(MOVES)
+GHOSTS = tuple(GHOST)
+GHOST_INDEX = {ghost: i for i, ghost in enumerate(GHOSTS)}
+_ALL_GHOSTS = range(len(GHOSTS))
+# The level-dependent timers, by level_count % LEVEL_RESET_REDUCTION.
+EDIBLE_TIMES = tuple(int(EDIBLE_TIME * (EDIBLE_TIME_REDUCTION ** level)) for level in range(LEVEL_RESET_REDUCTION))
+EATEN_LAIR_TIMES = tuple(int(COMMON_LAIR_TIME * (LAIR_REDUCTION ** level)) for level in range(LEVEL_RESET_REDUCTION))
+INITIAL_LAIR_TIMES = tuple(tuple(int(ghost.initial_lair_time * (LAIR_REDUCTION ** level)) for ghost in GHOSTS)
+                           for level in range(LEVEL_RESET_REDUCTION))
+
+
+class MazeTables:
+    """
+    A maze flattened into lists indexed by node (and move code), for the
+    FastGame engine. Built once per maze and shared by every FastGame.
+    """
+
+    __slots__ = ('maze', 'neighbours', 'possible_moves', 'pill_of_node', 'power_pill_of_node',
+                 'distances', 'eat_neighbourhoods', 'pill_count', 'power_pill_count', 'lair_node_index',
+                 'initial_pacman_node_index', 'initial_ghost_node_index')
+
+    def __init__(self, maze: Maze):
+        """
+        :param maze: The maze to flatten.
+        """
+        self.maze = maze
+        # neighbours[node * NUM_MOVE_CODES + move] is the neighbour in that direction, or -1.
+        self.neighbours: List[int] = [-1] * (len(maze.graph) * NUM_MOVE_CODES)
+        # possible_moves[node * NUM_MOVE_CODES + last_move] is Node.all_possible_moves[last_move] as codes.
+        self.possible_moves: List[tuple] = [()] * (len(maze.graph) * NUM_MOVE_CODES)
+        for node in maze.graph:
+            base = node.node_index * NUM_MOVE_CODES
+            for move, neighbour in node.neighbourhood.items():
+                self.neighbours[base + MOVE_CODES[move]] = neighbour
+            for move, moves in node.all_possible_moves.items():
+                self.possible_moves[base + MOVE_CODES[move]] = tuple(MOVE_CODES[m] for m in moves)
+        self.pill_of_node = [node.pill_index for node in maze.graph]
+        self.power_pill_of_node = [node.power_pill_index for node in maze.graph]
+        self.distances = maze.shortest_path_distances
+        self.eat_neighbourhoods = maze.eat_neighbourhoods
+        self.pill_count = len(maze.pill_indices)
+        self.power_pill_count = len(maze.power_pill_indices)
+        self.lair_node_index = maze.lair_node_index
+        self.initial_pacman_node_index = maze.initial_pacman_node_index
+        self.initial_ghost_node_index = maze.initial_ghost_node_index
+
+
+_MAZE_TABLES: List[Optional[MazeTables]] = [None] * NUM_MAZES
+
+
+def maze_tables(maze_index: int) -> MazeTables:
+    """
+    :param maze_index: The maze index.
+    :return: The flattened tables of the maze (built on first use).
+    """
+    tables = _MAZE_TABLES[maze_index]
+    if tables is None:
+        tables = MazeTables(MAZES[maze_index])
+        _MAZE_TABLES[maze_index] = tables
+    return tables
+
+
+def ghost_move_codes(ghost_moves: Optional[Dict[GHOST, MOVE]]) -> Optional[List[int]]:
+    """
+    :param ghost_moves: Ghost moves as a controller returns them (missing ghosts stay NEUTRAL).
+    :return: The move codes in GHOST order, or None when no moves were given.
+    """
+    if ghost_moves is None:
+        return None
+    return [MOVE_CODES[ghost_moves.get(ghost, MOVE.NEUTRAL)] for ghost in GHOSTS]
+
+
+class FastGame:
+    """
+    The game rules, over flat state: moves are codes into MOVES, the ghosts
+    are indexed in GHOST order and the pills are bitsets (see
+    internal/bitset.py). Game is this engine plus the MOVE/GHOST-keyed API,
+    copy-on-write snapshots, undo and the path caches; a FastGame on its own
+    is the bare engine for headless simulations, and does not print or touch
+    the path caches.
+
+    Convert with FastGame.from_game(game) and write the result back with
+    write_to(game).
+    """
+
+    __slots__ = ('rnd', 'seed', 'maze_index', 'tables', 'current_maze', 'level_count', 'current_level_time',
+                 'total_time', 'score', 'ghost_eat_multiplier', 'game_over_flag', 'time_of_last_global_reversal',
+                 'pacman_was_eaten', 'pill_was_eaten', 'power_pill_was_eaten',
+                 'pacman_node', 'pacman_move', 'lives', 'has_received_extra_life',
+                 'ghost_nodes', 'ghost_edible_times', 'ghost_lair_times', 'ghost_moves', 'ghosts_eaten',
+                 'pills', 'power_pills', 'events')
+
+    def __init__(self, seed: int, initial_maze: int = 0):
+        """
+        Starts a new game, like Game(seed, initial_maze).
+
+        :param seed: The seed for the pseudo-random number generator.
+        :param initial_maze: The maze to start the game with (default is 0).
+        """
+        self.events: Optional[EventBuffer] = None
+        self.reset(seed, initial_maze)
+
+    def reset(self, seed: int, initial_maze: int = 0):
+        """
+        Starts a new game on this instance. Events keep going to the same buffer.
+
+        :param seed: The seed for the pseudo-random number generator.
+        :param initial_maze: The maze to start the game with (default is 0).
+        """
+        self.seed = seed
+        self.rnd = CounterRandom(seed)
+        self._set_maze(initial_maze)
+        self.level_count = 0
+        self.current_level_time = 0
+        self.total_time = 0
+        self.score = 0
+        self.ghost_eat_multiplier = 1
+        self.game_over_flag = False
+        self.time_of_last_global_reversal = -1
+        self.pacman_was_eaten = False
+        self.pill_was_eaten = False
+        self.power_pill_was_eaten = False
+        self.pacman_node = self.tables.initial_pacman_node_index
+        self.pacman_move = LEFT
+        self.lives = NUM_LIVES
+        self.has_received_extra_life = False
+        self.ghosts_eaten = [False] * len(GHOSTS)
+        self._set_pills()
+        self._init_ghosts()
+
+    @classmethod
+    def from_game(cls, game: 'FastGame') -> 'FastGame':
+        """
+        :param game: The game to convert.
+        :return: A FastGame in the same state, with a copy of the game's random number generator.
+        """
+        fast = cls.__new__(cls)
+        game._copy_state_into(fast)
+        fast.events = None
+        return fast
+
+    def write_to(self, game: 'FastGame'):
+        """
+        Puts the game into this engine's state, including the random number generator.
+
+        :param game: The game to update.
+        """
+        self._copy_state_into(game)
+
+    def copy(self) -> 'FastGame':
+        """
+        :return: An independent copy of the state, with a copy of the random number generator.
+        """
+        copy = FastGame.__new__(FastGame)
+        self._copy_state_into(copy)
+        copy.events = None
+        return copy
+
+    def _copy_state_into(self, target: 'FastGame'):
+        """
+        Copies the whole game state (but not the event buffer) into another
+        game, which gets its own lists and a copy of the random number generator.
+
+        :param target: The game to write to.
+        """
+        target.seed = self.seed
+        target.rnd = self.rnd.copy()
+        target.maze_index = self.maze_index
+        target.tables = self.tables
+        target.current_maze = self.current_maze
+        target.level_count = self.level_count
+        target.current_level_time = self.current_level_time
+        target.total_time = self.total_time
+        target.score = self.score
+        target.ghost_eat_multiplier = self.ghost_eat_multiplier
+        target.game_over_flag = self.game_over_flag
+        target.time_of_last_global_reversal = self.time_of_last_global_reversal
+        target.pacman_was_eaten = self.pacman_was_eaten
+        target.pill_was_eaten = self.pill_was_eaten
+        target.power_pill_was_eaten = self.power_pill_was_eaten
+        target.pacman_node = self.pacman_node
+        target.pacman_move = self.pacman_move
+        target.lives = self.lives
+        target.has_received_extra_life = self.has_received_extra_life
+        target.ghost_nodes = self.ghost_nodes[:]
+        target.ghost_edible_times = self.ghost_edible_times[:]
+        target.ghost_lair_times = self.ghost_lair_times[:]
+        target.ghost_moves = self.ghost_moves[:]
+        target.ghosts_eaten = self.ghosts_eaten[:]
+        target.pills = self.pills
+        target.power_pills = self.power_pills
+
+    def game_over(self) -> bool:
+        return self.game_over_flag
+
+    def get_game_state(self) -> str:
+        """
+        Returns the game state as a string for replay or communication.
+
+        :return: A string representing the game state.
+        """
+        sb = [f"{self.maze_index},{self.total_time},{self.score},{self.current_level_time},{self.level_count},"
+              f"{self.pacman_node},{MOVES[self.pacman_move].value},{self.lives},{self.has_received_extra_life},"]
+        for i in _ALL_GHOSTS:
+            sb.append(f"{self.ghost_nodes[i]},{self.ghost_edible_times[i]},{self.ghost_lair_times[i]},"
+                      f"{MOVES[self.ghost_moves[i]].value},")
+        sb.append(bitset.to_bit_string(self.pills, self.tables.pill_count) + ",")
+        sb.append(bitset.to_bit_string(self.power_pills, self.tables.power_pill_count) + ",")
+        sb.append(f"{self.time_of_last_global_reversal},{self.pacman_was_eaten},")
+        for eaten in self.ghosts_eaten:
+            sb.append(f"{eaten},")
+        sb.append(f"{self.pill_was_eaten},{self.power_pill_was_eaten}")
+        return "".join(sb)
+
+    # Game-engine methods
+
+    def advance(self, pacman_move: int, ghost_moves: Optional[Sequence[int]] = None):
+        """
+        Advances the game by one tick, like Game.advance_game.
+
+        :param pacman_move: The move code for Pac-Man.
+        :param ghost_moves: The move codes of the ghosts in GHOST order (None repeats their last moves).
+        """
+        self._update_pacman(pacman_move)
+        self._eat_pill()
+        self._eat_power_pill()
+        if not self._reverse_ghosts(False):
+            self._update_ghosts(self.ghost_moves if ghost_moves is None else list(ghost_moves))
+        self.update_game()
+
+    def update_game(self, feast: bool = True, update_lair_times: bool = True, update_extra_life: bool = True,
+                    update_total_time: bool = True, update_level_time: bool = True):
+        """
+        Updates the game state after character updates.
+
+        :param feast: Whether to enable feasting (eating events).
+        :param update_lair_times: Whether to update ghost lair times.
+        :param update_extra_life: Whether to check for extra life awards.
+        :param update_total_time: Whether to increment total time.
+        :param update_level_time: Whether to increment level time.
+        """
+        if feast:
+            self._feast()
+        if update_lair_times:
+            self._update_lair_times()
+        if update_extra_life:
+            self._update_pacman_extra_life()
+        if update_total_time:
+            self.total_time += 1
+        if update_level_time:
+            self.current_level_time += 1
+        self._check_level_state()
+
+    def _update_pacman(self, move: int):
+        """
+        Moves Pac-Man, keeping its last move if the new one is blocked and
+        standing still if that is blocked too.
+
+        :param move: The move code.
+        """
+        neighbours = self.tables.neighbours
+        base = self.pacman_node * NUM_MOVE_CODES
+        if move == NEUTRAL_CODE or neighbours[base + move] == -1:
+            move = self.pacman_move
+            if move == NEUTRAL_CODE or neighbours[base + move] == -1:
+                move = NEUTRAL_CODE
+        self.pacman_move = move
+        if move != NEUTRAL_CODE:
+            self.pacman_node = neighbours[base + move]
+
+    def _eat_pill(self):
+        """
+        Handles Pac-Man eating a regular pill if present at the current node.
+        """
+        self.pill_was_eaten = False
+        pill = self.tables.pill_of_node[self.pacman_node]
+        if pill >= 0 and self.pills >> pill & 1:
+            self.score += PILL
+            self.pills &= ~(1 << pill)
+            self.pill_was_eaten = True
+            if self.events is not None:
+                self.events.append(self.total_time, EVENT.PILL_EATEN, self.pacman_node, pill)
+
+    def _eat_power_pill(self):
+        """
+        Handles Pac-Man eating a power pill, making ghosts edible.
+        """
+        self.power_pill_was_eaten = False
+        power_pill = self.tables.power_pill_of_node[self.pacman_node]
+        if power_pill >= 0 and self.power_pills >> power_pill & 1:
+            self.score += POWER_PILL
+            self.ghost_eat_multiplier = 1
+            self.power_pills &= ~(1 << power_pill)
+            if self.events is not None:
+                self.events.append(self.total_time, EVENT.POWER_PILL_EATEN, self.pacman_node, power_pill)
+            edible_time = EDIBLE_TIMES[self.level_count % LEVEL_RESET_REDUCTION]
+            lair_times = self.ghost_lair_times
+            self.ghost_edible_times = [edible_time if lair_times[i] == 0 else 0 for i in _ALL_GHOSTS]
+            self.power_pill_was_eaten = True
+
+    def _update_ghosts(self, moves: List[int], order: Sequence[int] = _ALL_GHOSTS):
+        """
+        Moves the ghosts that are out of the lair (edible ghosts skip every
+        GHOST_SPEED_REDUCTION-th tick). A ghost may not reverse; a blocked
+        or reversing move keeps its last move, or picks a random one where
+        that is blocked too. The move each ghost takes is written back into
+        moves.
+
+        :param moves: The move codes in GHOST order.
+        :param order: The ghost indices in the order they move (and draw random numbers).
+        """
+        neighbours = self.tables.neighbours
+        nodes = self.ghost_nodes
+        last_moves = self.ghost_moves
+        lair_times = self.ghost_lair_times
+        edible_times = self.ghost_edible_times
+        for i in order:
+            if lair_times[i] == 0 and (edible_times[i] == 0 or edible_times[i] % GHOST_SPEED_REDUCTION != 0):
+                base = nodes[i] * NUM_MOVE_CODES
+                move = moves[i]
+                last = last_moves[i]
+                if move == NEUTRAL_CODE or neighbours[base + move] == -1 or move == OPPOSITE_CODES[last]:
+                    if last != NEUTRAL_CODE and neighbours[base + last] != -1:
+                        move = last
+                    else:
+                        options = self.tables.possible_moves[base + last]
+                        move = options[self.rnd.randint(0, len(options) - 1)]
+                moves[i] = last_moves[i] = move
+                nodes[i] = neighbours[base + move]
+
+    def _reverse_ghosts(self, force: bool) -> bool:
+        """
+        Reverses the ghosts out of the lair if forced, if a power pill was
+        just eaten or at random (a global reversal).
+
+        :param force: Whether to force reversal.
+        :return: Whether any ghosts were reversed.
+        """
+        reversed = False
+        global_reverse = self.rnd.random() < GHOST_REVERSAL
+        if self.current_level_time > 1 and (force or self.power_pill_was_eaten or global_reverse):
+            neighbours = self.tables.neighbours
+            nodes = self.ghost_nodes
+            last_moves = self.ghost_moves
+            for i in _ALL_GHOSTS:
+                if self.ghost_lair_times[i] == 0 and last_moves[i] != NEUTRAL_CODE:
+                    move = OPPOSITE_CODES[last_moves[i]]
+                    last_moves[i] = move
+                    nodes[i] = neighbours[nodes[i] * NUM_MOVE_CODES + move]
+                    reversed = True
+                    self.time_of_last_global_reversal = self.total_time
+        return reversed
+
+    def _feast(self):
+        """
+        Handles eating events (Pac-Man eating ghosts or ghosts eating Pac-Man).
+        """
+        self.pacman_was_eaten = False
+        self.ghosts_eaten = [False] * len(GHOSTS)
+        near = self.tables.eat_neighbourhoods[self.pacman_node]
+        nodes = self.ghost_nodes
+        edible_times = self.ghost_edible_times
+        events = self.events
+        for i in _ALL_GHOSTS:
+            if nodes[i] in near:
+                if edible_times[i] > 0:  # Pac-Man eats ghost
+                    if events is not None:
+                        events.append(self.total_time, EVENT.GHOST_EATEN, nodes[i], i)
+                    self.score += GHOST_EAT_SCORE * self.ghost_eat_multiplier
+                    self.ghost_eat_multiplier *= 2
+                    edible_times[i] = 0
+                    self.ghost_lair_times[i] = EATEN_LAIR_TIMES[self.level_count % LEVEL_RESET_REDUCTION]
+                    nodes[i] = self.tables.lair_node_index
+                    self.ghost_moves[i] = NEUTRAL_CODE
+                    self.ghosts_eaten[i] = True
+                else:  # Ghost eats Pac-Man
+                    self.lives -= 1
+                    self.pacman_was_eaten = True
+                    if events is not None:
+                        events.append(self.total_time, EVENT.PACMAN_EATEN, self.pacman_node, self.lives)
+                    if self.lives <= 0:
+                        self.game_over_flag = True
+                        if events is not None:
+                            events.append(self.total_time, EVENT.GAME_OVER, self.pacman_node, self.score)
+                    else:
+                        self._level_reset()
+                    return
+        for i in _ALL_GHOSTS:
+            if edible_times[i] > 0:
+                edible_times[i] -= 1
+
+    def _update_lair_times(self):
+        """
+        Updates the lair times for ghosts, moving them out of the lair when time reaches zero.
+        """
+        lair_times = self.ghost_lair_times
+        for i in _ALL_GHOSTS:
+            if lair_times[i] > 0:
+                lair_times[i] -= 1
+                if lair_times[i] == 0:
+                    self.ghost_nodes[i] = self.tables.initial_ghost_node_index
+
+    def _update_pacman_extra_life(self):
+        """
+        Awards an extra life to Pac-Man if the score reaches EXTRA_LIFE_SCORE.
+        """
+        if not self.has_received_extra_life and self.score >= EXTRA_LIFE_SCORE:
+            self.has_received_extra_life = True
+            self.lives += 1
+            if self.events is not None:
+                self.events.append(self.total_time, EVENT.EXTRA_LIFE, self.pacman_node, self.lives)
+
+    def _check_level_state(self):
+        """
+        Checks if the level or game is over based on time, pills, or lives.
+        """
+        # Events from here belong to the tick that just ended, and total time has already moved on.
+        if self.total_time + 1 > MAX_TIME:
+            self.game_over_flag = True
+            self.score += self.lives * AWARD_LIFE_LEFT
+            if self.events is not None:
+                self.events.append(self.total_time - 1, EVENT.GAME_OVER, self.pacman_node, self.score)
+        elif not self.pills and not self.power_pills or self.current_level_time >= LEVEL_LIMIT:
+            if self.events is not None:
+                self.events.append(self.total_time - 1, EVENT.LEVEL_COMPLETED, self.pacman_node,
+                                   self.level_count + 1)
+            self._new_level_reset()
+
+    def _new_level_reset(self):
+        """
+        Resets the game state for a new level, advancing to the next maze.
+        """
+        self._set_maze((self.maze_index + 1) % NUM_MAZES)
+        self.level_count += 1
+        self.current_level_time = 0
+        self.ghost_eat_multiplier = 1
+        self._set_pills()
+        self._level_reset()
+
+    def _level_reset(self):
+        """
+        Resets the level-specific state, including ghost and Pac-Man positions.
+        """
+        self.ghost_eat_multiplier = 1
+        self._init_ghosts()
+        self.pacman_node = self.tables.initial_pacman_node_index
+        self.pacman_move = LEFT
+
+    def _set_maze(self, maze_index: int):
+        """
+        :param maze_index: The maze to play in from now on.
+        """
+        self.maze_index = maze_index
+        self.tables = maze_tables(maze_index)
+        self.current_maze = self.tables.maze
+
+    def _set_pills(self):
+        """
+        Makes every pill and power pill of the current maze available.
+        """
+        self.pills = bitset.full(self.tables.pill_count)
+        self.power_pills = bitset.full(self.tables.power_pill_count)
+
+    def _init_ghosts(self):
+        """
+        Puts the ghosts in the lair with their level's lair times.
+        """
+        self.ghost_nodes = [self.tables.lair_node_index] * len(GHOSTS)
+        self.ghost_edible_times = [0] * len(GHOSTS)
+        self.ghost_lair_times = list(INITIAL_LAIR_TIMES[self.level_count % LEVEL_RESET_REDUCTION])
+        self.ghost_moves = [NEUTRAL_CODE] * len(GHOSTS)
@@ -1,20 +1,61 @@
 # from game.internal import , , ,
-from pacman.game.internal.maze import Maze
-from pacman.game.internal.ghost import Ghost
-from pacman.game.internal.pacman import PacMan
+from pacman.game.internal.maze import Maze, MAZES
+from pacman.game.internal.ghost import GhostView
+from pacman.game.internal.pacman import PacManView
 from pacman.game.internal.node import Node
-from pacman.game.internal.paths_cache import PathsCache
+from pacman.game.internal.paths_cache import PathsCache, PATHS_CACHES
 from pacman.game.internal.a_star import AStar
-from pacman.game.constants import MOVE, GHOST, DM, PILL, POWER_PILL, GHOST_EAT_SCORE, EDIBLE_TIME, \
-    EDIBLE_TIME_REDUCTION, LAIR_REDUCTION, LEVEL_RESET_REDUCTION, COMMON_LAIR_TIME, LEVEL_LIMIT, \
-    GHOST_REVERSAL, MAX_TIME, AWARD_LIFE_LEFT, EXTRA_LIFE_SCORE, EAT_DISTANCE, NUM_GHOSTS, NUM_MAZES, MAZE_NAMES, PATH_MAZES, PATH_DISTANCES, NUM_LIVES, GHOST_SPEED_REDUCTION
+from pacman.game.internal.path_tree import ShortestPathTree
+from pacman.game.internal.d_star_lite import DStarLite
+from pacman.game.internal import bitset, state_codec, zobrist
+from pacman.game.fast_game import FastGame, GHOSTS, GHOST_INDEX, NUM_MOVE_CODES
+from pacman.game.internal.events import EventBuffer
+from pacman.game.constants import MOVE, MOVES, GHOST, DM, MOVE_CODES, NEUTRAL_CODE, GHOST_EAT_SCORE, LEVEL_LIMIT, \
+    MAX_TIME, NUM_GHOSTS, NUM_MAZES, MAZE_NAMES, PATH_MAZES, PATH_DISTANCES, NUM_LIVES, GHOST_SPEED_REDUCTION, \
+    PATHS_PREFETCH_PILLS, PATHS_PREFETCH_TIME
 import math
-from random import Random
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
 from enum import Enum
 
 
-class Game:
+class CopyStats:
+    """
+    Counts the snapshots handed out by a game (and everything copied from
+    it), and how many real copies of the mutable state were made.
+    """
+
+    def __init__(self):
+        self.snapshots = 0
+        self.copies = 0
+
+    def __repr__(self) -> str:
+        return f"CopyStats(snapshots={self.snapshots}, copies={self.copies})"
+
+
+class TickSummary:
+    """
+    What happened during one Game.advance_until_decision() call.
+    """
+
+    def __init__(self):
+        self.ticks = 0
+        self.score = 0  # points gained
+        self.pills_eaten = 0
+        self.power_pills_eaten = 0
+        self.ghosts_eaten = 0
+        self.lives_lost = 0
+        self.levels_completed = 0
+        self.pacman_decisions = 0  # calls to the Pac-Man policy
+        self.ghost_decisions = 0  # calls to the ghost policy
+
+    def __repr__(self) -> str:
+        return (f"TickSummary(ticks={self.ticks}, score={self.score}, pills_eaten={self.pills_eaten}, "
+                f"power_pills_eaten={self.power_pills_eaten}, ghosts_eaten={self.ghosts_eaten}, "
+                f"lives_lost={self.lives_lost}, levels_completed={self.levels_completed}, "
+                f"pacman_decisions={self.pacman_decisions}, ghost_decisions={self.ghost_decisions})")
+
+
+class Game(FastGame):
     # Static mazes and caches, initialized once as they are immutable
     # mazes = [Maze(i) for i in range(NUM_MAZES)]
     # from game.internal.paths_cache import PathsCache
@@ -25,7 +66,7 @@ class Game:
     # @classmethod
     # def delayed_init(cls):
     #         from pacman.game.internal.paths_cache import PathsCache
-    #         from pacman.game.internal.maze import Maze
+    #         from pacman.game.internal.maze import Maze, MAZES
     #         cls.mazes = [Maze(i) for i in range(NUM_MAZES)]
     #         cls.caches = [PathsCache(i) for i in range(NUM_MAZES)]
 
@@ -78,174 +119,85 @@ class Game:
     #     print("  [DEBUG] All mazes loaded.")
     #     print("  [DEBUG] --- Game() object initialization complete. ---")
 
-    def _init(self, initial_maze: int):
-        """
-        Initializes game variables and sets up the initial state.
-
-        :param initial_maze: The initial maze index.
-        """
-        self.maze_index = initial_maze
-        self.score = 0
-        self.current_level_time = 0
-        self.level_count = 0
-        self.total_time = 0
-        self.ghost_eat_multiplier = 1
-        self.game_over_flag = False
-        self.time_of_last_global_reversal = -1
-        self.pacman_was_eaten = False
-        self.pill_was_eaten = False
-        self.power_pill_was_eaten = False
-
-        self.ghosts_eaten = {ghost: False for ghost in GHOST}
-        self.current_maze = self.mazes[self.maze_index]
-        self._set_pills(self.current_maze)
-        self._init_ghosts()
-        # self.pacman = PacMan(
-            # self.current_maze.initial_pacman_node_index, MOVE.RIGHT, NUM_LIVES, False)
-
     # class Game:
     """
     The main game logic class, containing all game-related information.
     """
 
-    def __init__(self, seed: int):
+    def __init__(self, seed: int, initial_maze: int = 0):
         print("  [DEBUG] --- Initializing Game() object ---")
 
-        # --- 1. Load Maze Data First ---
-        # The game objects depend on this data, so it must come first.
-        self.mazes: List[Maze] = []
-        print("  [DEBUG] Loading maze data...")
-        for i in range(len(MAZE_NAMES)):
-            self.mazes.append(Maze(i))
-
-        print("  [DEBUG] All mazes loaded successfully.")
-
-        # --- 2. Initialize Game State ---
-        self.seed = seed
-        self.rnd = Random(seed)
-        # Path cache needs access to game mazes
-        self.current_maze_index: int = 0
-        print("  [DEBUG] Init current maze.")
-        self.current_maze = self.mazes[self.current_maze_index]
+        # --- 1. Maze Data ---
+        # Mazes are shared process-wide and loaded on first use.
+        self.mazes = MAZES
+
+        # --- 2. Pathfinding ---
+        # Path data only depends on the mazes, so it survives reset().
+        # Per-maze path caches are shared process-wide and loaded on first entry.
         print("  [DEBUG] Init path finder.")
         self.path_finder = AStar()
-        print("  [DEBUG] Init path cache.")
-        self.path_cache = PathsCache.load_or_build(
-            self, cache_dir=".cache/paths")
-        # print("  [DEBUG] Init path cache.")
-        self.score: int = 0
-        self.level_time: int = 0
-        self.total_time: int = 0
-        self.game_over_flag: bool = False
-        print("  [DEBUG] Game states initialized.")
-        # self.game_over = False
-
-        # --- 3. Initialize Pac-Man and Ghosts ---
-        # Now that mazes are loaded, we can safely create them.
-        print("  [DEBUG] Init pacMans.")
-        self.pacman: PacMan = PacMan(
-            current_node_index=self.get_current_maze().initial_pacman_node_index,
-            last_move_made=MOVE.LEFT,
-            number_of_lives_remaining=NUM_LIVES,
-            has_received_extra_life=False
-        )
-        print("  [DEBUG] All PacMan objects initialized.")
-
-        self.ghosts: Dict[GHOST, Ghost] = {
-            ghost_type: Ghost(
-                type=ghost_type,
-                current_node_index=self.current_maze.lair_node_index,
-                edible_time=0,
-                lair_time=int(ghost_type.initial_lair_time),
-                last_move_made=MOVE.NEUTRAL
-            )
-            for ghost_type in GHOST
-        }
+        self.path_caches = PATHS_CACHES
+        self.copy_stats = CopyStats()
+        # Where events are recorded (see attach_events); kept across reset().
+        self.events: Optional[EventBuffer] = None
 
+        # --- 3. Initialize Game State, Pac-Man and Ghosts ---
         print("  [DEBUG] initing game states.")
-        self._init(0)
+        self.reset(seed, initial_maze)
         print("  [DEBUG] All game objects initialized.")
         print("  [DEBUG] --- Game() object initialization complete. ---")
 
+    def reset(self, seed: int, initial_maze: int = 0):
+        """
+        Starts a new game on this instance, reinitialising only the mutable state
+        (pills, Pac-Man, ghosts, timers and the random number generator). Mazes,
+        the path finder and the path cache are kept, so this is much cheaper than
+        constructing a new Game for every trial.
+
+        :param seed: The seed for the pseudo-random number generator.
+        :param initial_maze: The maze to start the game with (default is 0).
+        """
+        self._shared = False
+        self._undo_records: List[tuple] = []
+        # (pills, power pills, their Zobrist hash) as of the last state_hash().
+        self._pills_hash = None
+        self._active_pills = None
+        self._active_power_pills = None
+        self.level_time: int = 0
+        super().reset(seed, initial_maze)
+        self.path_caches.prefetch(self.maze_index)
+
     def _new_level_reset(self):
         """
         Resets the game state for a new level, advancing to the next maze.
         """
-        self.maze_index = (self.maze_index + 1) % NUM_MAZES
-        self.level_count += 1
-        self.current_maze = self.mazes[self.maze_index]
-        self.current_level_time = 0
-        self.ghost_eat_multiplier = 1
-        self._set_pills(self.current_maze)
-        self._level_reset()
+        super()._new_level_reset()
+        self.path_caches.prefetch(self.maze_index)
 
     def _level_reset(self):
         """
         Resets the level-specific state, including ghost and Pac-Man positions.
         """
         print('level reset')
-        self.ghost_eat_multiplier = 1
-        self._init_ghosts()
-        self.pacman.current_node_index = self.current_maze.initial_pacman_node_index
-        self.pacman.last_move_made = MOVE.LEFT
-
-    def _set_pills(self, maze: Maze):
-        """
-        Initializes the pill and power pill sets for the given maze.
+        super()._level_reset()
 
-        :param maze: The maze to initialize pills for.
-        """
-        self.pills = set(range(len(maze.pill_indices)))
-        self.power_pills = set(range(len(maze.power_pill_indices)))
+    @property
+    def current_maze_index(self) -> int:
+        return self.maze_index
 
-    def _init_ghosts(self):
+    @property
+    def pacman(self) -> PacManView:
         """
-        Initializes the ghosts with their respective lair times and positions.
+        :return: Pac-Man's state as a PacMan-like view: reads and writes go to this game.
         """
-        self.ghosts = {
-            ghost_type: Ghost(
-                ghost_type,
-                self.current_maze.lair_node_index,
-                0,
-                int(ghost_type.initial_lair_time * (LAIR_REDUCTION **
-                    (self.level_count % LEVEL_RESET_REDUCTION))),
-                MOVE.NEUTRAL
-            ) for ghost_type in GHOST
-        }
+        return PacManView(self)
 
-    def get_game_state(self) -> str:
+    @property
+    def ghosts(self) -> Dict[GHOST, GhostView]:
         """
-        Returns the game state as a string for replay or communication.
-
-        :return: A string representing the game state.
+        :return: The ghosts' states as Ghost-like views, in GHOST order: reads and writes go to this game.
         """
-        sb = []
-        sb.append(f"{self.maze_index},{self.total_time},{self.score},{self.current_level_time},{self.level_count},"
-                  f"{self.pacman.current_node_index},{self.pacman.last_move_made.value},"
-                  f"{self.pacman.number_of_lives_remaining},{self.pacman.has_received_extra_life},")
-
-        for ghost in self.ghosts.values():
-            sb.append(
-                f"{ghost.current_node_index},{ghost.edible_time},{ghost.lair_time},{ghost.last_move_made.value},")
-
-        pill_str = "".join("1" if i in self.pills else "0" for i in range(
-            len(self.current_maze.pill_indices)))
-        sb.append(pill_str + ",")
-
-        power_pill_str = "".join("1" if i in self.power_pills else "0" for i in range(
-            len(self.current_maze.power_pill_indices)))
-        sb.append(power_pill_str + ",")
-
-        sb.append(f"{self.time_of_last_global_reversal},")
-        sb.append(f"{self.pacman_was_eaten},")
-
-        for ghost in GHOST:
-            sb.append(f"{self.ghosts_eaten[ghost]},")
-
-        sb.append(f"{self.pill_was_eaten},")
-        sb.append(f"{self.power_pill_was_eaten}")
-
-        return "".join(sb)
+        return {ghost: GhostView(self, i) for i, ghost in enumerate(GHOSTS)}
 
     def set_game_state(self, game_state: str):
         """
@@ -253,10 +205,12 @@ class Game:
 
         :param game_state: The game state string.
         """
+        self._own_state()
+        self._undo_records = []
         values = game_state.split(",")
         index = 0
 
-        self.maze_index = int(values[index])
+        maze_index = int(values[index])
         index += 1
         self.total_time = int(values[index])
         index += 1
@@ -267,40 +221,30 @@ class Game:
         self.level_count = int(values[index])
         index += 1
 
-        self.pacman = PacMan(
-            int(values[index]),
-            MOVE(values[index + 1]),
-            int(values[index + 2]),
-            values[index + 3].lower() == "true"
-        )
+        self.pacman_node = int(values[index])
+        self.pacman_move = MOVE_CODES[MOVE(values[index + 1])]
+        self.lives = int(values[index + 2])
+        self.has_received_extra_life = values[index + 3].lower() == "true"
         index += 4
 
-        self.ghosts = {}
-        for ghost_type in GHOST:
-            self.ghosts[ghost_type] = Ghost(
-                ghost_type,
-                int(values[index]),
-                int(values[index + 1]),
-                int(values[index + 2]),
-                MOVE(values[index + 3])
-            )
+        self.ghost_nodes = []
+        self.ghost_edible_times = []
+        self.ghost_lair_times = []
+        self.ghost_moves = []
+        for _ in GHOST:
+            self.ghost_nodes.append(int(values[index]))
+            self.ghost_edible_times.append(int(values[index + 1]))
+            self.ghost_lair_times.append(int(values[index + 2]))
+            self.ghost_moves.append(MOVE_CODES[MOVE(values[index + 3])])
             index += 4
 
-        self.current_maze = self.mazes[self.maze_index]
-        self._set_pills(self.current_maze)
+        self._set_maze(maze_index)
+        self._set_pills()
 
-        for i, char in enumerate(values[index]):
-            if char == "1":
-                self.pills.add(i)
-            else:
-                self.pills.discard(i)
+        # Pills missing from the string stay available.
+        self.pills = self.pills & ~bitset.full(len(values[index])) | bitset.from_bit_string(values[index])
         index += 1
-
-        for i, char in enumerate(values[index]):
-            if char == "1":
-                self.power_pills.add(i)
-            else:
-                self.power_pills.discard(i)
+        self.power_pills = self.power_pills & ~bitset.full(len(values[index])) | bitset.from_bit_string(values[index])
         index += 1
 
         self.time_of_last_global_reversal = int(values[index])
@@ -308,15 +252,38 @@ class Game:
         self.pacman_was_eaten = values[index].lower() == "true"
         index += 1
 
-        self.ghosts_eaten = {}
-        for ghost in GHOST:
-            self.ghosts_eaten[ghost] = values[index].lower() == "true"
+        self.ghosts_eaten = []
+        for _ in GHOST:
+            self.ghosts_eaten.append(values[index].lower() == "true")
             index += 1
 
         self.pill_was_eaten = values[index].lower() == "true"
         index += 1
         self.power_pill_was_eaten = values[index].lower() == "true"
 
+    def to_bytes(self) -> bytes:
+        """
+        Returns the game state as a compact binary record (see
+        internal/state_codec.py), for recording and replays. Much cheaper to
+        produce and restore than get_game_state(), and it also keeps the
+        ghost eat multiplier and the game-over flag.
+
+        :return: The binary game state.
+        """
+        return state_codec.encode(self)
+
+    def from_bytes(self, data: bytes, offset: int = 0) -> int:
+        """
+        Sets the game state from a record made by to_bytes(), in place.
+
+        :param data: A buffer holding the record.
+        :param offset: Where the record starts in the buffer.
+        :return: The offset just past the record, so records can be read back to back.
+        """
+        self._own_state()
+        self._undo_records = []
+        return state_codec.decode_into(self, data, offset)
+
     # def copy(self) -> 'Game':
     #     """
     #     Creates a deep copy of the game state.
@@ -354,83 +321,180 @@ class Game:
         :return: A new Game instance with copied state.
         """
         copy = Game.__new__(Game)
-        copy.seed = self.seed
-        copy.rnd = Random(self.seed)
+        self._copy_state_into(copy)  # the random number generator continues the stream where this game is
 
         # --- Maze state ---
         # reference to static mazes (safe, since mazes are immutable)
         copy.mazes = self.mazes
-        copy.current_maze_index = self.current_maze_index
-        copy.current_maze = self.current_maze
-
-        # --- Gameplay state ---
-        copy.pills = self.pills.copy()
-        copy.power_pills = self.power_pills.copy()
-        copy.level_count = self.level_count
-        copy.current_level_time = self.current_level_time
-        copy.total_time = self.total_time
-        copy.score = self.score
-        copy.ghost_eat_multiplier = self.ghost_eat_multiplier
-        copy.game_over_flag = self.game_over_flag
-        copy.time_of_last_global_reversal = self.time_of_last_global_reversal
-        copy.pacman_was_eaten = self.pacman_was_eaten
-        copy.pill_was_eaten = self.pill_was_eaten
-        copy.power_pill_was_eaten = self.power_pill_was_eaten
-
-        # --- Characters ---
-        copy.pacman = self.pacman.copy()
-        copy.ghosts_eaten = self.ghosts_eaten.copy()
-        copy.ghosts = {ghost_type: ghost.copy()
-                    for ghost_type, ghost in self.ghosts.items()}
+
+        # --- Gameplay caches ---
+        copy._active_pills = self._active_pills
+        copy._active_power_pills = self._active_power_pills
+        copy._pills_hash = self._pills_hash
+        copy.level_time = self.level_time
 
         # --- Pathfinding (re-use, not deepcopy for performance) ---
         copy.path_finder = self.path_finder
-        copy.path_cache = self.path_cache
+        copy.path_caches = self.path_caches
 
+        copy._shared = False
+        copy._undo_records = []
+        copy.events = None
+        copy.copy_stats = self.copy_stats
+        self.copy_stats.copies += 1
         return copy
 
+    def snapshot(self) -> 'Game':
+        """
+        Creates a copy-on-write copy of the game for a controller. The
+        ghost state and eaten flags are shared with this game
+        until either side is advanced (or its state is set), at which point
+        that side makes its own copy first. Reading a snapshot therefore
+        costs no copying at all, while advancing one for lookahead behaves
+        exactly like advancing a copy().
+
+        :return: The snapshot.
+        """
+        snapshot = Game.__new__(Game)
+        snapshot.__dict__.update(self.__dict__)
+        for name in FastGame.__slots__:
+            setattr(snapshot, name, getattr(self, name))
+        snapshot.rnd = self.rnd.copy()
+        snapshot._undo_records = []
+        snapshot.events = None
+        self._shared = True
+        snapshot._shared = True
+        self.copy_stats.snapshots += 1
+        return snapshot
+
+    def fork(self) -> 'Game':
+        """
+        Creates a copy of the game that draws from a child random stream
+        (see CounterRandom.fork). Rollouts run on forks are independent of
+        each other and of this game, yet reproducible: forking k times from
+        the same state always gives the same k streams.
+
+        :return: The forked game.
+        """
+        fork = self.copy()
+        fork.rnd = self.rnd.fork()
+        return fork
+
+    def _own_state(self):
+        """
+        Gives this game private copies of the state it shares with snapshots.
+        Called before anything mutates the ghosts or the eaten flags.
+        """
+        if self._shared:
+            self.ghost_nodes = self.ghost_nodes[:]
+            self.ghost_edible_times = self.ghost_edible_times[:]
+            self.ghost_lair_times = self.ghost_lair_times[:]
+            self.ghost_moves = self.ghost_moves[:]
+            self.ghosts_eaten = self.ghosts_eaten[:]
+            self._shared = False
+            self.copy_stats.copies += 1
+
+    def attach_events(self, capacity: int = 4096) -> EventBuffer:
+        """
+        Starts recording game events (pills, power pills, ghosts and Pac-Man
+        eaten, extra lives, levels completed, game over) into a ring buffer
+        that consumers drain in bulk, instead of polling the was_*_eaten
+        flags every tick. Without a buffer nothing is recorded. Copies and
+        snapshots never record into this game's buffer, and undo() takes
+        the events of the moves it takes back out of it again.
+
+        :param capacity: The most events held before the oldest are overwritten.
+        :return: The buffer.
+        """
+        self.events = EventBuffer(capacity)
+        return self.events
+
+    def detach_events(self):
+        """
+        Stops recording game events.
+        """
+        self.events = None
+
+    def state_hash(self) -> int:
+        """
+        A 64-bit Zobrist hash of the game state (see internal/zobrist.py),
+        for transposition tables and caches keyed by state. The pill part is
+        updated from the pills eaten since the last call rather than
+        recomputed, so a call costs a few XORs. Equal states hash equally,
+        whichever way they were reached; the score and clocks are not hashed.
+        So states that differ only in current_level_time share a hash even
+        though the level ends after LEVEL_LIMIT ticks; key on the level time
+        as well where that limit matters.
+
+        :return: The hash.
+        """
+        pills = self.pills
+        power_pills = self.power_pills
+        cached = self._pills_hash
+        if cached is None:
+            value = zobrist.pills_hash(pills, power_pills)
+            self._pills_hash = (pills, power_pills, value)
+        elif cached[0] != pills or cached[1] != power_pills:
+            value = cached[2] ^ zobrist.pills_hash(cached[0] ^ pills, cached[1] ^ power_pills)
+            self._pills_hash = (pills, power_pills, value)
+        else:
+            value = cached[2]
+        return value ^ zobrist.agents_hash(self)
+
     # Game-engine methods
 
-    def advance_game(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE]):
+    def advance_game(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE], undoable: bool = False):
         """
         Advances the game state using the provided moves for Pac-Man and ghosts.
 
         :param pacman_move: The move for Pac-Man.
         :param ghost_moves: The moves for each ghost.
+        :param undoable: Record the state first, so that undo() can take the move back.
         """
+        if undoable:
+            self._push_undo_record()
         self.update_pacman(pacman_move)
         self.update_ghosts(ghost_moves)
         self.update_game()
 
-    def advance_game_without_reverse(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE]):
+    def advance_game_without_reverse(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE], undoable: bool = False):
         """
         Advances the game without allowing ghost reversals.
 
         :param pacman_move: The move for Pac-Man.
         :param ghost_moves: The moves for each ghost.
+        :param undoable: Record the state first, so that undo() can take the move back.
         """
+        if undoable:
+            self._push_undo_record()
         self.update_pacman(pacman_move)
         self.update_ghosts_without_reverse(ghost_moves)
         self.update_game()
 
-    def advance_game_with_forced_reverse(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE]):
+    def advance_game_with_forced_reverse(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE], undoable: bool = False):
         """
         Advances the game with forced ghost reversals.
 
         :param pacman_move: The move for Pac-Man.
         :param ghost_moves: The moves for each ghost.
+        :param undoable: Record the state first, so that undo() can take the move back.
         """
+        if undoable:
+            self._push_undo_record()
         self.update_pacman(pacman_move)
         self.update_ghosts_with_forced_reverse(ghost_moves)
         self.update_game()
 
-    def advance_game_with_power_pill_reverse_only(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE]):
+    def advance_game_with_power_pill_reverse_only(self, pacman_move: MOVE, ghost_moves: Dict[GHOST, MOVE], undoable: bool = False):
         """
         Advances the game, forcing ghost reversals only if a power pill was eaten.
 
         :param pacman_move: The move for Pac-Man.
         :param ghost_moves: The moves for each ghost.
+        :param undoable: Record the state first, so that undo() can take the move back.
         """
+        if undoable:
+            self._push_undo_record()
         self.update_pacman(pacman_move)
         if self.power_pill_was_eaten:
             self.update_ghosts_with_forced_reverse(ghost_moves)
@@ -438,13 +502,99 @@ class Game:
             self.update_ghosts_without_reverse(ghost_moves)
         self.update_game()
 
+    def undo(self):
+        """
+        Takes back the last move made with undoable=True, restoring the exact
+        state before it, random number generator included. Undoable moves
+        nest, so a depth-k lookahead advances k times and undoes k times
+        instead of copying the game at every node.
+        """
+        if not self._undo_records:
+            raise ValueError("No undoable move to take back")
+        record, events, events_mark = self._undo_records.pop()
+        record._copy_state_into(self)
+        if events is not None:
+            events.rewind(events_mark)
+
+    def _push_undo_record(self):
+        """
+        Records everything a move can change, as a FastGame.
+        """
+        record = FastGame.__new__(FastGame)
+        self._copy_state_into(record)
+        events = self.events
+        self._undo_records.append((record, events, events.mark() if events is not None else None))
+
+    def advance_until_decision(self, pacman_policy: Callable[['Game'], MOVE],
+                               ghost_policy: Optional[Callable[['Game'], Dict[GHOST, MOVE]]] = None,
+                               max_ticks: int = 100) -> TickSummary:
+        """
+        Advances the game from one Pac-Man decision to the next. pacman_policy
+        picks the move now; after that Pac-Man follows its corridor (round
+        corners too) and the call returns once Pac-Man reaches a node where it
+        has a choice, loses a life, the level ends, the game is over or
+        max_ticks have passed. ghost_policy is only asked on ticks where some
+        ghost requires an action; otherwise the ghosts keep going, which is
+        all they can do between junctions. Without one, ghosts keep their
+        last moves throughout.
+
+        Both policies are given this game itself, not a copy, and must not
+        change it.
+
+        :param pacman_policy: Picks Pac-Man's move.
+        :param ghost_policy: Picks the ghosts' moves.
+        :param max_ticks: The most ticks to advance.
+        :return: What happened on the way.
+        """
+        summary = TickSummary()
+        start_score = self.score
+        start_level = self.level_count
+        pacman_move = pacman_policy(self)
+        summary.pacman_decisions = 1
+        while summary.ticks < max_ticks and not self.game_over_flag:
+            ghost_moves = None
+            if ghost_policy is not None:
+                for ghost in GHOST:
+                    if self.does_ghost_require_action(ghost):
+                        ghost_moves = ghost_policy(self)
+                        summary.ghost_decisions += 1
+                        break
+            self.advance_game(pacman_move, ghost_moves)
+            summary.ticks += 1
+            summary.pills_eaten += self.pill_was_eaten
+            summary.power_pills_eaten += self.power_pill_was_eaten
+            summary.ghosts_eaten += self.get_num_ghosts_eaten()
+            if self.pacman_was_eaten:
+                summary.lives_lost += 1
+                break
+            if self.level_count != start_level:
+                break
+            options = self.tables.possible_moves[self.pacman_node * NUM_MOVE_CODES + self.pacman_move]
+            if len(options) != 1:
+                break
+            pacman_move = MOVES[options[0]]
+        summary.score = self.score - start_score
+        summary.levels_completed = self.level_count - start_level
+        return summary
+
+    def advance(self, pacman_move: int, ghost_moves: Optional[Sequence[int]] = None):
+        """
+        Advances the game by one tick with move codes, like advance_game.
+
+        :param pacman_move: The move code for Pac-Man.
+        :param ghost_moves: The move codes of the ghosts in GHOST order (None repeats their last moves).
+        """
+        self._own_state()
+        super().advance(pacman_move, ghost_moves)
+
     def update_pacman(self, pacman_move: MOVE):
         """
         Updates Pac-Man's state based on the provided move.
 
         :param pacman_move: The move for Pac-Man.
         """
-        self._update_pacman(pacman_move)
+        self._own_state()
+        self._update_pacman(MOVE_CODES[pacman_move])
         self._eat_pill()
         self._eat_power_pill()
 
@@ -454,9 +604,10 @@ class Game:
 
         :param ghost_moves: The moves for each ghost.
         """
+        self._own_state()
         ghost_moves = self._complete_ghost_moves(ghost_moves)
-        if not self._reverse_ghosts(ghost_moves, False):
-            self._update_ghosts(ghost_moves)
+        if not self._reverse_ghosts(False):
+            self._move_ghosts(ghost_moves)
 
     def update_ghosts_without_reverse(self, ghost_moves: Dict[GHOST, MOVE]):
         """
@@ -464,8 +615,8 @@ class Game:
 
         :param ghost_moves: The moves for each ghost.
         """
-        ghost_moves = self._complete_ghost_moves(ghost_moves)
-        self._update_ghosts(ghost_moves)
+        self._own_state()
+        self._move_ghosts(self._complete_ghost_moves(ghost_moves))
 
     def update_ghosts_with_forced_reverse(self, ghost_moves: Dict[GHOST, MOVE]):
         """
@@ -473,8 +624,9 @@ class Game:
 
         :param ghost_moves: The moves for each ghost.
         """
-        ghost_moves = self._complete_ghost_moves(ghost_moves)
-        self._reverse_ghosts(ghost_moves, True)
+        self._own_state()
+        self._complete_ghost_moves(ghost_moves)
+        self._reverse_ghosts(True)
 
     def update_game(self, feast: bool = True, update_lair_times: bool = True, update_extra_life: bool = True,
                     update_total_time: bool = True, update_level_time: bool = True):
@@ -487,79 +639,8 @@ class Game:
         :param update_total_time: Whether to increment total time.
         :param update_level_time: Whether to increment level time.
         """
-        if feast:
-            self._feast()
-        if update_lair_times:
-            self._update_lair_times()
-        if update_extra_life:
-            self._update_pacman_extra_life()
-        if update_total_time:
-            self.total_time += 1
-        if update_level_time:
-            self.current_level_time += 1
-        self._check_level_state()
-
-    def _update_lair_times(self):
-        """
-        Updates the lair times for ghosts, moving them out of the lair when time reaches zero.
-        """
-        for ghost in self.ghosts.values():
-            if ghost.lair_time > 0:
-                ghost.lair_time -= 1
-                if ghost.lair_time == 0:
-                    ghost.current_node_index = self.current_maze.initial_ghost_node_index
-
-    def _update_pacman_extra_life(self):
-        """
-        Awards an extra life to Pac-Man if the score reaches EXTRA_LIFE_SCORE.
-        """
-        if not self.pacman.has_received_extra_life and self.score >= EXTRA_LIFE_SCORE:
-            self.pacman.has_received_extra_life = True
-            self.pacman.number_of_lives_remaining += 1
-
-    def _update_pacman(self, move: MOVE = MOVE.DOWN):
-        """
-        Updates Pac-Man's position based on the provided move.
-
-        :param move: The move to apply.
-        """
-        self.pacman.last_move_made = self._correct_pacman_dir(move)
-        if self.pacman.last_move_made != MOVE.NEUTRAL:
-            # print('inside the if')
-            self.pacman.current_node_index = self.current_maze.graph[
-                self.pacman.current_node_index].neighbourhood[self.pacman.last_move_made]
-
-    def _correct_pacman_dir(self, direction: MOVE) -> MOVE:
-        """
-        Corrects Pac-Man's move to ensure it's valid.
-
-        :param direction: The intended move.
-        :return: The corrected move.
-        """
-        node = self.current_maze.graph[self.pacman.current_node_index]
-        if direction in node.neighbourhood:
-            # print('return direction', direction)
-            return direction
-        if self.pacman.last_move_made in node.neighbourhood:
-            # print('return last move', self.pacman.last_move_made)
-            return self.pacman.last_move_made
-        # print('return neutral')
-        return MOVE.NEUTRAL
-
-    def _update_ghosts(self, moves: Dict[GHOST, MOVE]):
-        """
-        Updates ghost positions based on provided moves.
-
-        :param moves: The moves for each ghost.
-        """
-        for ghost_type, move in moves.items():
-            ghost = self.ghosts[ghost_type]
-            if ghost.lair_time == 0:
-                if ghost.edible_time == 0 or ghost.edible_time % GHOST_SPEED_REDUCTION != 0:
-                    ghost.last_move_made = self._check_ghost_dir(ghost, move)
-                    moves[ghost_type] = ghost.last_move_made
-                    ghost.current_node_index = self.current_maze.graph[
-                        ghost.current_node_index].neighbourhood[ghost.last_move_made]
+        self._own_state()
+        super().update_game(feast, update_lair_times, update_extra_life, update_total_time, update_level_time)
 
     def _complete_ghost_moves(self, moves: Optional[Dict[GHOST, MOVE]]) -> Dict[GHOST, MOVE]:
         """
@@ -569,119 +650,43 @@ class Game:
         :return: A complete dictionary of ghost moves.
         """
         if moves is None:
-            moves = {
-                ghost_type: self.ghosts[ghost_type].last_move_made for ghost_type in GHOST}
-        for ghost_type in GHOST:
+            moves = {ghost_type: MOVES[move] for ghost_type, move in zip(GHOSTS, self.ghost_moves)}
+        for ghost_type in GHOSTS:
             if ghost_type not in moves:
                 moves[ghost_type] = MOVE.NEUTRAL
         return moves
 
-    def _check_ghost_dir(self, ghost: Ghost, direction: MOVE) -> MOVE:
-        """
-        Validates a ghost's move, preventing reversals unless valid.
-
-        :param ghost: The ghost to move.
-        :param direction: The intended move.
-        :return: The validated move.
-        """
-        node = self.current_maze.graph[ghost.current_node_index]
-        if direction in node.neighbourhood and direction != ghost.last_move_made.opposite():
-            return direction
-        if ghost.last_move_made in node.neighbourhood:
-            return ghost.last_move_made
-        moves = node.all_possible_moves[ghost.last_move_made]
-        return moves[self.rnd.randint(0, len(moves) - 1)]
-
-    def _eat_pill(self):
-        """
-        Handles Pac-Man eating a regular pill if present at the current node.
-        """
-        self.pill_was_eaten = False
-        pill_index = self.current_maze.graph[self.pacman.current_node_index].pill_index
-        if pill_index >= 0 and pill_index in self.pills:
-            self.score += PILL
-            self.pills.discard(pill_index)
-            self.pill_was_eaten = True
-
-    def _eat_power_pill(self):
-        """
-        Handles Pac-Man eating a power pill, making ghosts edible.
-        """
-        self.power_pill_was_eaten = False
-        power_pill_index = self.current_maze.graph[self.pacman.current_node_index].power_pill_index
-        if power_pill_index >= 0 and power_pill_index in self.power_pills:
-            self.score += POWER_PILL
-            self.ghost_eat_multiplier = 1
-            self.power_pills.discard(power_pill_index)
-            new_edible_time = int(
-                EDIBLE_TIME * (EDIBLE_TIME_REDUCTION ** (self.level_count % LEVEL_RESET_REDUCTION)))
-            for ghost in self.ghosts.values():
-                ghost.edible_time = new_edible_time if ghost.lair_time == 0 else 0
-            self.power_pill_was_eaten = True
-
-    def _reverse_ghosts(self, moves: Dict[GHOST, MOVE], force: bool) -> bool:
-        """
-        Reverses ghost directions if conditions are met.
-
-        :param moves: The ghost moves.
-        :param force: Whether to force reversal.
-        :return: Whether any ghosts were reversed.
-        """
-        reversed = False
-        global_reverse = self.rnd.random() < GHOST_REVERSAL
-        for ghost_type, move in moves.items():
-            ghost = self.ghosts[ghost_type]
-            if self.current_level_time > 1 and ghost.lair_time == 0 and ghost.last_move_made != MOVE.NEUTRAL:
-                if force or self.power_pill_was_eaten or global_reverse:
-                    ghost.last_move_made = ghost.last_move_made.opposite()
-                    ghost.current_node_index = self.current_maze.graph[
-                        ghost.current_node_index].neighbourhood[ghost.last_move_made]
-                    reversed = True
-                    self.time_of_last_global_reversal = self.total_time
-        return reversed
-
-    def _feast(self):
-        """
-        Handles eating events (Pac-Man eating ghosts or ghosts eating Pac-Man).
-        """
-        self.pacman_was_eaten = False
-        for ghost in GHOST:
-            self.ghosts_eaten[ghost] = False
-
-        for ghost in self.ghosts.values():
-            distance = self.get_shortest_path_distance(
-                self.pacman.current_node_index, ghost.current_node_index)
-            if distance != -1 and distance <= EAT_DISTANCE:
-                if ghost.edible_time > 0:  # Pac-Man eats ghost
-                    self.score += GHOST_EAT_SCORE * self.ghost_eat_multiplier
-                    self.ghost_eat_multiplier *= 2
-                    ghost.edible_time = 0
-                    ghost.lair_time = int(
-                        COMMON_LAIR_TIME * (LAIR_REDUCTION ** (self.level_count % LEVEL_RESET_REDUCTION)))
-                    ghost.current_node_index = self.current_maze.lair_node_index
-                    ghost.last_move_made = MOVE.NEUTRAL
-                    self.ghosts_eaten[ghost.type] = True
-                else:  # Ghost eats Pac-Man
-                    self.pacman.number_of_lives_remaining -= 1
-                    self.pacman_was_eaten = True
-                    if self.pacman.number_of_lives_remaining <= 0:
-                        self.game_over_flag = True
-                    else:
-                        self._level_reset()
-                    return
-        for ghost in self.ghosts.values():
-            if ghost.edible_time > 0:
-                ghost.edible_time -= 1
+    def _move_ghosts(self, moves: Dict[GHOST, MOVE]):
+        """
+        Moves the ghosts in the order of the dictionary, and writes the move
+        each ghost takes back into it.
+
+        :param moves: The moves for each ghost.
+        """
+        codes = [MOVE_CODES[moves[ghost_type]] for ghost_type in GHOSTS]
+        self._update_ghosts(codes, [GHOST_INDEX[ghost_type] for ghost_type in moves])
+        for ghost_type in moves:
+            moves[ghost_type] = MOVES[codes[GHOST_INDEX[ghost_type]]]
 
     def _check_level_state(self):
         """
-        Checks if the level or game is over based on time, pills, or lives.
+        Checks if the level or game is over based on time, pills, or lives,
+        and warms the next maze's path cache when the level is about to end.
+        """
+        level_count = self.level_count
+        super()._check_level_state()
+        if self.total_time + 1 <= MAX_TIME and self.level_count == level_count and (
+                bitset.popcount(self.pills) + bitset.popcount(self.power_pills) <= PATHS_PREFETCH_PILLS or
+                self.current_level_time >= LEVEL_LIMIT - PATHS_PREFETCH_TIME):
+            # The level is about to end: warm the next maze's path cache in the background.
+            self.path_caches.prefetch((self.maze_index + 1) % NUM_MAZES)
+
+    @property
+    def path_cache(self) -> PathsCache:
+        """
+        :return: The path cache of the current maze (loaded on demand).
         """
-        if self.total_time + 1 > MAX_TIME:
-            self.game_over_flag = True
-            self.score += self.pacman.number_of_lives_remaining * AWARD_LIFE_LEFT
-        elif not self.pills and not self.power_pills or self.current_level_time >= LEVEL_LIMIT:
-            self._new_level_reset()
+        return self.path_caches[self.maze_index]
 
     # Query methods
 
@@ -696,13 +701,13 @@ class Game:
         :param ghost: The ghost to check.
         :return: Whether the specified ghost was eaten.
         """
-        return self.ghosts_eaten[ghost]
+        return self.ghosts_eaten[GHOST_INDEX[ghost]]
 
     def get_num_ghosts_eaten(self) -> int:
         """
         :return: The number of ghosts eaten in the last time step.
         """
-        return sum(1 for ghost in GHOST if self.ghosts_eaten[ghost])
+        return sum(self.ghosts_eaten)
 
     def was_pill_eaten(self) -> bool:
         """
@@ -732,8 +737,7 @@ class Game:
         """
         :return: The current maze.
         """
-        # return self.current_maze
-        return self.mazes[self.current_maze_index]
+        return self.current_maze
 
     def get_node_x_coord(self, node_index: int) -> int:
         """
@@ -785,14 +789,14 @@ class Game:
         :param pill_index: The pill index.
         :return: Whether the specified pill is still available.
         """
-        return pill_index in self.pills
+        return pill_index >= 0 and bool(self.pills >> pill_index & 1)
 
     def is_power_pill_still_available(self, power_pill_index: int) -> bool:
         """
         :param power_pill_index: The power pill index.
         :return: Whether the specified power pill is still available.
         """
-        return power_pill_index in self.power_pills
+        return power_pill_index >= 0 and bool(self.power_pills >> power_pill_index & 1)
 
     def get_pill_index(self, node_index: int) -> int:
         """
@@ -830,47 +834,47 @@ class Game:
         """
         :return: The current node index of Pac-Man.
         """
-        return self.pacman.current_node_index
+        return self.pacman_node
 
     def get_pacman_last_move_made(self) -> MOVE:
         """
         :return: The last move made by Pac-Man.
         """
-        return self.pacman.last_move_made
+        return MOVES[self.pacman_move]
 
     def get_pacman_number_of_lives_remaining(self) -> int:
         """
         :return: The number of lives remaining for Pac-Man.
         """
-        return self.pacman.number_of_lives_remaining
+        return self.lives
 
     def get_ghost_current_node_index(self, ghost_type: GHOST) -> int:
         """
         :param ghost_type: The ghost type.
         :return: The current node index of the specified ghost.
         """
-        return self.ghosts[ghost_type].current_node_index
+        return self.ghost_nodes[GHOST_INDEX[ghost_type]]
 
     def get_ghost_last_move_made(self, ghost_type: GHOST) -> MOVE:
         """
         :param ghost_type: The ghost type.
         :return: The last move made by the specified ghost.
         """
-        return self.ghosts[ghost_type].last_move_made
+        return MOVES[self.ghost_moves[GHOST_INDEX[ghost_type]]]
 
     def get_ghost_edible_time(self, ghost_type: GHOST) -> int:
         """
         :param ghost_type: The ghost type.
         :return: The edible time remaining for the specified ghost.
         """
-        return self.ghosts[ghost_type].edible_time
+        return self.ghost_edible_times[GHOST_INDEX[ghost_type]]
 
     def is_ghost_edible(self, ghost_type: GHOST) -> bool:
         """
         :param ghost_type: The ghost type.
         :return: Whether the specified ghost is edible.
         """
-        return self.ghosts[ghost_type].edible_time > 0
+        return self.ghost_edible_times[GHOST_INDEX[ghost_type]] > 0
 
     def get_score(self) -> int:
         """
@@ -906,42 +910,58 @@ class Game:
         """
         :return: The number of active (uneaten) pills in the current maze.
         """
-        return len(self.pills)
+        return bitset.popcount(self.pills)
 
     def get_number_of_active_power_pills(self) -> int:
         """
         :return: The number of active (uneaten) power pills in the current maze.
         """
-        return len(self.power_pills)
+        return bitset.popcount(self.power_pills)
 
     def get_ghost_lair_time(self, ghost_type: GHOST) -> int:
         """
         :param ghost_type: The ghost type.
         :return: The time the specified ghost will spend in the lair.
         """
-        return self.ghosts[ghost_type].lair_time
+        return self.ghost_lair_times[GHOST_INDEX[ghost_type]]
 
-    def get_active_pills_indices(self) -> List[int]:
+    def get_active_pills_indices(self) -> Tuple[int, ...]:
         """
-        :return: The indices of all active pills.
+        :return: The node indices of all active pills, in pill order. The
+            tuple is cached until a pill is eaten and shared between calls;
+            use list(...) for a list of your own.
         """
-        return [self.current_maze.pill_indices[i] for i in self.pills]
+        active = self._active_pills
+        if active is None or active[0] != self.pills or active[1] is not self.current_maze:
+            pill_indices = self.current_maze.pill_indices
+            active = (self.pills, self.current_maze, tuple(pill_indices[i] for i in bitset.indices(self.pills)))
+            self._active_pills = active
+        return active[2]
 
-    def get_active_power_pills_indices(self) -> List[int]:
+    def get_active_power_pills_indices(self) -> Tuple[int, ...]:
         """
-        :return: The indices of all active power pills.
+        :return: The node indices of all active power pills, in power pill
+            order. Cached and shared like get_active_pills_indices().
         """
-        return [self.current_maze.power_pill_indices[i] for i in self.power_pills]
+        active = self._active_power_pills
+        if active is None or active[0] != self.power_pills or active[1] is not self.current_maze:
+            power_pill_indices = self.current_maze.power_pill_indices
+            active = (self.power_pills, self.current_maze,
+                      tuple(power_pill_indices[i] for i in bitset.indices(self.power_pills)))
+            self._active_power_pills = active
+        return active[2]
 
     def does_ghost_require_action(self, ghost_type: GHOST) -> bool:
         """
         :param ghost_type: The ghost type.
         :return: Whether the ghost requires an action (at junction or just left lair).
         """
-        ghost = self.ghosts[ghost_type]
-        return ((self.is_junction(ghost.current_node_index) or
-                 (ghost.last_move_made == MOVE.NEUTRAL and ghost.current_node_index == self.current_maze.initial_ghost_node_index)) and
-                (ghost.edible_time == 0 or ghost.edible_time % GHOST_SPEED_REDUCTION != 0))
+        i = GHOST_INDEX[ghost_type]
+        node = self.ghost_nodes[i]
+        edible_time = self.ghost_edible_times[i]
+        return ((self.is_junction(node) or
+                 (self.ghost_moves[i] == NEUTRAL_CODE and node == self.current_maze.initial_ghost_node_index)) and
+                (edible_time == 0 or edible_time % GHOST_SPEED_REDUCTION != 0))
 
     def is_junction(self, node_index: int) -> bool:
         """
@@ -1003,6 +1023,73 @@ class Game:
                 return move
         return None
 
+    # Move-code variants: moves as ints (see MOVE_CODES in constants.py)
+
+    def get_neighbour_i(self, node_index: int, move_code: int) -> int:
+        """
+        :param node_index: The current node index.
+        :param move_code: The code of the move to make.
+        :return: The node index reached by the move, or -1 if invalid.
+        """
+        return self.current_maze.graph[node_index].neighbours_i[move_code]
+
+    def get_possible_moves_i(self, node_index: int, last_move_code: int = NEUTRAL_CODE) -> Sequence[int]:
+        """
+        :param node_index: The node index.
+        :param last_move_code: The code of the last move made; its reverse is excluded.
+        :return: The codes of the possible moves.
+        """
+        return self.current_maze.graph[node_index].possible_moves_i[last_move_code]
+
+    def get_pacman_last_move_made_i(self) -> int:
+        """
+        :return: The code of Pac-Man's last move.
+        """
+        return self.pacman_move
+
+    def get_ghost_last_move_made_i(self, ghost_type: GHOST) -> int:
+        """
+        :param ghost_type: The ghost type.
+        :return: The code of the ghost's last move.
+        """
+        return self.ghost_moves[GHOST_INDEX[ghost_type]]
+
+    def get_next_move_towards_target_i(self, from_node_index: int, to_node_index: int) -> int:
+        """
+        :param from_node_index: The starting node index.
+        :param to_node_index: The target node index.
+        :return: The code of get_next_move_towards_target(..., DM.PATH).
+        """
+        return self.current_maze.next_moves.towards_i(from_node_index, to_node_index)
+
+    def get_next_move_away_from_target_i(self, from_node_index: int, to_node_index: int) -> int:
+        """
+        :param from_node_index: The starting node index.
+        :param to_node_index: The target node index.
+        :return: The code of get_next_move_away_from_target(..., DM.PATH).
+        """
+        return self.current_maze.next_moves.away_i(from_node_index, to_node_index)
+
+    def get_approximate_next_move_towards_target_i(self, from_node_index: int, to_node_index: int,
+                                                   last_move_code: int) -> int:
+        """
+        :param from_node_index: The starting node index.
+        :param to_node_index: The target node index.
+        :param last_move_code: The code of the last move made.
+        :return: The code of get_approximate_next_move_towards_target(..., DM.PATH).
+        """
+        return self.current_maze.next_moves.approximate_towards_i(from_node_index, to_node_index, last_move_code)
+
+    def get_approximate_next_move_away_from_target_i(self, from_node_index: int, to_node_index: int,
+                                                     last_move_code: int) -> int:
+        """
+        :param from_node_index: The starting node index.
+        :param to_node_index: The target node index.
+        :param last_move_code: The code of the last move made.
+        :return: The code of get_approximate_next_move_away_from_target(..., DM.PATH).
+        """
+        return self.current_maze.next_moves.approximate_away_i(from_node_index, to_node_index, last_move_code)
+
     # Helper methods (computational)
 
     def get_shortest_path_distance(self, from_node_index: int, to_node_index: int) -> int:
@@ -1108,6 +1195,8 @@ class Game:
         :param distance_measure: The distance measure to use.
         :return: The next move to get closer to the target.
         """
+        if distance_measure is DM.PATH:
+            return self.current_maze.next_moves.towards(from_node_index, to_node_index)
         min_distance = float('inf')
         move: MOVE = MOVE.NEUTRAL
         for move_key, node in self.current_maze.graph[from_node_index].neighbourhood.items():
@@ -1124,6 +1213,8 @@ class Game:
         :param distance_measure: The distance measure to use.
         :return: The next move to get farther from the target.
         """
+        if distance_measure is DM.PATH:
+            return self.current_maze.next_moves.away(from_node_index, to_node_index)
         max_distance = float('-inf')
         move: MOVE = MOVE.NEUTRAL
         for move_key, node in self.current_maze.graph[from_node_index].neighbourhood.items():
@@ -1141,6 +1232,8 @@ class Game:
         :param distance_measure: The distance measure to use.
         :return: The approximate next move towards the target, excluding reversals.
         """
+        if distance_measure is DM.PATH:
+            return self.current_maze.next_moves.approximate_towards(from_node_index, to_node_index, last_move_made)
         min_distance = float('inf')
         move: MOVE = MOVE.NEUTRAL
         for move_key, node in self.current_maze.graph[from_node_index].all_neighbourhoods[last_move_made].items():
@@ -1158,6 +1251,8 @@ class Game:
         :param distance_measure: The distance measure to use.
         :return: The approximate next move away from the target, excluding reversals.
         """
+        if distance_measure is DM.PATH:
+            return self.current_maze.next_moves.approximate_away(from_node_index, to_node_index, last_move_made)
         max_distance = float('-inf')
         move: MOVE = MOVE.NEUTRAL
         for move_key, node in self.current_maze.graph[from_node_index].all_neighbourhoods[last_move_made].items():
@@ -1222,26 +1317,44 @@ class Game:
     #     else:
     #         return self.path_cache.get_path_from_a2b_ghost(from_node_index, to_node_index, last_move_made)
 
-    def get_shortest_path(self, from_node_index: int, to_node_index: int, last_move_made: Optional[MOVE] = None) -> List[int]:
-        # If cache isn't constructed yet (we're in __init__), use A* directly with no-heuristic
-        cache_ready = hasattr(
-            self, "path_cache") and self.path_cache is not None
-        if not cache_ready:
-            astar = AStar()
-            # Adjust to your actual access to the node list:
-            # e.g., self.current_maze.graph or self.graph, depending on your codebase
-            astar.create_graph(self.current_maze.graph)
-            move = last_move_made if last_move_made is not None else MOVE.NEUTRAL
-            return astar.compute_paths_a_star(
-                from_node_index, to_node_index, move, game=None  # no heuristic; safe during init
-            )
-
-        # Normal fast path via cache (your existing code)
+    def get_shortest_path(self, from_node_index: int, to_node_index: int, last_move_made: Optional[MOVE] = None) -> Sequence[int]:
+        """
+        :param from_node_index: The starting node index.
+        :param to_node_index: The target node index.
+        :param last_move_made: The last move made (optional; excludes reversals when given).
+        :return: The shortest path from start to target, excluding the start node, as a
+            read-only view into the path cache (use list() for a mutable copy).
+        """
         if last_move_made is None:
             return self.path_cache.get_path_from_a2b(from_node_index, to_node_index)
         else:
             return self.path_cache.get_path_from_a2b_ghost(from_node_index, to_node_index, last_move_made)
 
+    def get_shortest_paths(self, from_node_index: int, target_node_indices: List[int], k: Optional[int] = None) -> ShortestPathTree:
+        """
+        Finds the shortest paths from one node to many targets with a single
+        breadth-first search, instead of one query per target.
+
+        :param from_node_index: The starting node index.
+        :param target_node_indices: The target node indices.
+        :param k: Stop once the k nearest targets are found (None finds all of them).
+        :return: The search tree: tree.nearest lists the targets found, nearest first (ties in the
+            order given), and tree.path(t), tree.distance(t) and tree.first_move(t) answer for each.
+        """
+        return self.current_maze.path_trees.search(from_node_index, target_node_indices, k)
+
+    def create_path_planner(self, use_heuristic: bool = True) -> DStarLite:
+        """
+        Creates an incremental planner for chasing a moving target on the
+        current maze. Keep it between ticks and call planner.update(start, goal)
+        or planner.next_move(start, goal); only the part of the search affected
+        by the moves is repaired. The planner is only valid until the level changes.
+
+        :param use_heuristic: Focus the search with the maze's distance table.
+        :return: The planner.
+        """
+        return DStarLite(self.current_maze, use_heuristic)
+
     def get_approximate_shortest_path_distance(self, from_node_index: int, to_node_index: int, last_move_made: MOVE) -> int:
         """
         :param from_node_index: The starting node index.
@@ -1251,7 +1364,7 @@ class Game:
         """
         if not self.current_maze.graph[from_node_index].neighbourhood:
             return 0
-        return self.caches[self.maze_index].get_path_distance_from_a2b(from_node_index, to_node_index, last_move_made)
+        return self.path_cache.get_path_distance_from_a2b(from_node_index, to_node_index, last_move_made)
 
     def get_number_of_junctions(self) -> int:
         """
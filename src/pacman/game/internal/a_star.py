@@ -1,11 +1,13 @@
 # pacman/game/internal/a_star.py
 
-from typing import List, Optional, TYPE_CHECKING
+import heapq
+from typing import List, Optional, Tuple, TYPE_CHECKING
 from queue import PriorityQueue
 from pacman.game.constants import MOVE
 
 if TYPE_CHECKING:
     from pacman.game.game import Game  # only for type hints, no runtime import
+    from pacman.game.internal.node import Node
 
 
 class AStarNode:
@@ -122,3 +124,188 @@ class AStar:
             node.h = 0.0
             node.parent = None
             node.reached = None
+
+
+_OPPOSITES = {move: move.opposite() for move in MOVE}
+
+
+class _OpenEntry:
+    """
+    Open-list entry ordered by f only, exactly like AStarNode, so that ties
+    leave the heap in the same order as AStar's PriorityQueue.
+    """
+    __slots__ = ("f", "index")
+
+    def __init__(self, f: float, index: int):
+        self.f = f
+        self.index = index
+
+    def __lt__(self, other: '_OpenEntry') -> bool:
+        return self.f < other.f
+
+
+class _SearchState:
+    """
+    Per-search scratch arrays. An entry is only valid when its stamp equals
+    the current generation, so nothing has to be cleared between searches.
+    """
+    __slots__ = ("generation", "stamp", "g", "parent", "reached", "entry")
+
+    def __init__(self, size: int):
+        self.generation = 0
+        self.stamp = [0] * size
+        self.g = [0.0] * size
+        self.parent = [-1] * size
+        self.reached: List[Optional[MOVE]] = [None] * size
+        self.entry: List[Optional[_OpenEntry]] = [None] * size
+
+
+class HeapAStar:
+    """
+    Drop-in replacement for AStar built on heapq and flat per-search arrays.
+    The graph is read-only after create_graph() and every search takes its own
+    scratch state from a pool, so one instance can be shared by threads.
+    """
+
+    def __init__(self):
+        self.adjacency: List[Tuple[Tuple[int, MOVE], ...]] = []
+        self._states: List[_SearchState] = []
+
+    def create_graph(self, nodes: List['Node']):
+        self.adjacency = [
+            tuple((neighbour, move) for move, neighbour in node.neighbourhood.items() if neighbour is not None)
+            for node in nodes
+        ]
+        self._states = []
+
+    def compute_paths_a_star(
+        self,
+        s: int,
+        t: int,
+        last_move_made: MOVE,
+        game: Optional['Game'] = None,
+    ) -> List[int]:
+        """
+        :param s: The starting node index.
+        :param t: The target node index.
+        :param last_move_made: The move that reached s (its reverse is not taken).
+        :param game: Supplies the distance heuristic; None searches without one.
+        :return: The path from s to t, both included, as AStar would return it.
+        """
+        try:
+            state = self._states.pop()
+        except IndexError:
+            state = _SearchState(len(self.adjacency))
+        try:
+            return self._search(state, s, t, last_move_made, game)
+        finally:
+            self._states.append(state)
+
+    def compute_paths_a_star_neutral(self, s: int, t: int, game: Optional['Game'] = None) -> List[int]:
+        return self.compute_paths_a_star(s, t, MOVE.NEUTRAL, game)
+
+    def reset_graph(self):
+        # Searches leave no state on the graph; kept for compatibility with AStar.
+        pass
+
+    def compute_path_tree(self, s: int, last_move_made: MOVE) -> List[int]:
+        """
+        Runs a single search from s without a target until every reachable
+        node has been expanded. Nodes are expanded in the same order as in
+        compute_paths_a_star without a heuristic, and a node's parent never
+        changes once it is expanded, so following the tree from any node t
+        gives exactly the route compute_paths_a_star(s, t, last_move_made)
+        returns.
+
+        :param s: The starting node index.
+        :param last_move_made: The move that reached s (its reverse is not taken).
+        :return: The parent of every node in the search tree (-1 for s and for unreached nodes).
+        """
+        try:
+            state = self._states.pop()
+        except IndexError:
+            state = _SearchState(len(self.adjacency))
+        try:
+            self._expand(state, s, -1, last_move_made, None)
+            generation = state.generation
+            stamp = state.stamp
+            return [parent if stamp[i] == generation else -1 for i, parent in enumerate(state.parent)]
+        finally:
+            self._states.append(state)
+
+    @staticmethod
+    def route_from_tree(tree: List[int], t: int) -> List[int]:
+        """
+        :param tree: A search tree from compute_path_tree().
+        :param t: The target node index.
+        :return: The path from the root of the tree to t, both included.
+        """
+        route = [t]
+        current_index = tree[t]
+        while current_index != -1:
+            route.append(current_index)
+            current_index = tree[current_index]
+        route.reverse()
+        return route
+
+    def _search(self, state: _SearchState, s: int, t: int, last_move_made: MOVE,
+                game: Optional['Game']) -> List[int]:
+        self._expand(state, s, t, last_move_made, game)
+        parent = state.parent
+        route = [t]
+        if state.stamp[t] == state.generation:
+            current_index = parent[t]
+            while current_index != -1:
+                route.append(current_index)
+                current_index = parent[current_index]
+        route.reverse()
+        return route
+
+    def _expand(self, state: _SearchState, s: int, t: int, last_move_made: MOVE,
+                game: Optional['Game']):
+        # Expands nodes until t is expanded; t = -1 expands the whole graph.
+        state.generation += 1
+        generation = state.generation
+        stamp = state.stamp
+        g = state.g
+        parent = state.parent
+        reached = state.reached
+        entry = state.entry
+        adjacency = self.adjacency
+        distance = game.get_shortest_path_distance if game is not None else None
+
+        stamp[s] = generation
+        g[s] = 0.0
+        parent[s] = -1
+        reached[s] = last_move_made
+        entry[s] = _OpenEntry(distance(s, t) if distance else 0.0, s)
+        open_heap = [entry[s]]
+
+        while open_heap:
+            current = heapq.heappop(open_heap)
+            u = current.index
+            if entry[u] is not current:
+                continue  # superseded by a cheaper entry
+            entry[u] = None
+            if u == t:
+                break
+
+            blocked = _OPPOSITES.get(reached[u])
+            g_u = g[u]
+            for v, move in adjacency[u]:
+                if move is blocked:
+                    continue
+                cand_g = g_u + 1
+                if stamp[v] != generation:
+                    stamp[v] = generation
+                    g[v] = cand_g
+                    parent[v] = u
+                    reached[v] = move
+                    entry[v] = _OpenEntry(cand_g + (distance(v, t) if distance else 0.0), v)
+                    heapq.heappush(open_heap, entry[v])
+                elif cand_g < g[v]:
+                    g[v] = cand_g
+                    parent[v] = u
+                    reached[v] = move
+                    entry[v] = _OpenEntry(cand_g + (distance(v, t) if distance else 0.0), v)
+                    heapq.heappush(open_heap, entry[v])
@@ -0,0 +1,58 @@
+# pacman/game/internal/bitset.py
+
+from typing import List
+
+# Sets of small indices (pills, power pills) are kept as Python ints with bit
+# i set when index i is in the set. Ints are immutable, so copying a set is
+# free, and counting and listing members run in C over the int's bytes.
+
+# The set bits of every byte value, so members are listed a byte at a time.
+_BYTE_BITS = tuple(tuple(bit for bit in range(8) if value >> bit & 1) for value in range(256))
+
+if hasattr(int, "bit_count"):
+    popcount = int.bit_count
+else:  # Python < 3.10
+    def popcount(mask: int) -> int:
+        return bin(mask).count("1")
+
+
+def full(size: int) -> int:
+    """
+    :param size: The number of indices.
+    :return: The set holding 0..size-1.
+    """
+    return (1 << size) - 1
+
+
+def indices(mask: int) -> List[int]:
+    """
+    :param mask: The set.
+    :return: Its members in ascending order.
+    """
+    members = []
+    byte_bits = _BYTE_BITS
+    for offset, value in enumerate(mask.to_bytes((mask.bit_length() + 7) // 8, "little")):
+        if value:
+            base = offset * 8
+            for bit in byte_bits[value]:
+                members.append(base + bit)
+    return members
+
+
+def to_bit_string(mask: int, size: int) -> str:
+    """
+    :param mask: The set.
+    :param size: The number of indices.
+    :return: "1"/"0" for indices 0..size-1, in that order.
+    """
+    if size == 0:
+        return ""
+    return format(mask, f"0{size}b")[::-1]
+
+
+def from_bit_string(bits: str) -> int:
+    """
+    :param bits: A string from to_bit_string.
+    :return: The set.
+    """
+    return int(bits[::-1], 2) if bits else 0
@@ -0,0 +1,101 @@
+# pacman/game/internal/build_lock.py
+
+import os
+import time
+from typing import Optional
+
+# Seconds a process waits for another one building the same cache file
+# before building it itself.
+BUILD_LOCK_TIMEOUT = 300.0
+
+
+class BuildLock:
+    """
+    A cross-process lock on a cache file, so that when many processes start
+    against a cold cache only one of them builds it while the rest wait and
+    then load the result.
+
+    The lock is a file created with O_CREAT | O_EXCL, holding the owner's pid.
+    A lock file older than stale_after seconds, or (on POSIX) one whose owner
+    is no longer running, is treated as abandoned and removed. The lock only
+    saves duplicate work: cache files are still written to a temporary name
+    and renamed, so two builders racing after a stale lock is broken write
+    the same file twice but never expose a partial one.
+    """
+
+    def __init__(self, path: str, stale_after: float = 120.0, poll_interval: float = 0.05):
+        """
+        :param path: The lock file, usually the cache file name plus ".lock".
+        :param stale_after: Age in seconds after which a lock file is considered abandoned.
+        :param poll_interval: Seconds to sleep between attempts while waiting.
+        """
+        self.path = path
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self.held = False
+
+    def acquire(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until the lock is free and takes it.
+
+        :param timeout: Maximum seconds to wait, or None to wait until the lock is free or abandoned.
+        :return: Whether the lock was taken.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if self._is_stale():
+                    self._break()
+                    continue
+                if deadline is not None and time.monotonic() >= deadline:
+                    return False
+                time.sleep(self.poll_interval)
+                continue
+            with os.fdopen(fd, 'w') as f:
+                f.write(str(os.getpid()))
+            self.held = True
+            return True
+
+    def release(self):
+        if self.held:
+            self.held = False
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def __enter__(self) -> 'BuildLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+    def _is_stale(self) -> bool:
+        try:
+            age = time.time() - os.path.getmtime(self.path)
+            with open(self.path, 'r') as f:
+                content = f.read().strip()
+        except OSError:
+            return False  # released (or replaced) in the meantime; just retry
+        if age > self.stale_after:
+            return True
+        if os.name != "posix" or not content:
+            # An empty file is a lock whose owner has not written its pid yet.
+            return False
+        try:
+            os.kill(int(content), 0)
+        except ProcessLookupError:
+            return True
+        except (PermissionError, ValueError):
+            return False
+        return False
+
+    def _break(self):
+        print(f"  [WARNING] Removing abandoned lock {self.path}")
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,126 @@
+# pacman/game/internal/counter_random.py
+
+from typing import Tuple
+
+# A counter-based generator: draw n of the stream with key k is a fixed
+# mixing function of (k, n), here the SplitMix64 finaliser applied to
+# k + n * golden ratio. The whole state is two ints, so copying a generator,
+# saving its state and restoring it are O(1), and a copy continues exactly
+# where the original was. fork() derives a child key from the next draw,
+# giving streams that are reproducible from the parent but independent of
+# it and of each other.
+
+_MASK = (1 << 64) - 1
+GAMMA = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+FLOAT_SCALE = 2.0 ** -53  # a draw >> 11 times this is a float in [0, 1)
+
+
+def mix(value: int) -> int:
+    """
+    :param value: Any int.
+    :return: A well-scrambled 64-bit value (the SplitMix64 finaliser).
+    """
+    z = value & _MASK
+    z = ((z ^ (z >> 30)) * MIX1) & _MASK
+    z = ((z ^ (z >> 27)) * MIX2) & _MASK
+    return z ^ (z >> 31)
+
+
+def draw(key: int, counter: int) -> int:
+    """
+    :param key: The stream key.
+    :param counter: The position in the stream.
+    :return: The 64-bit draw at that position.
+    """
+    return mix(key + counter * GAMMA)
+
+
+class CounterRandom:
+    """
+    The subset of random.Random the game engines use (random, randint,
+    randrange, getrandbits, getstate, setstate), plus O(1) copy() and fork().
+    """
+
+    __slots__ = ('key', 'counter')
+
+    def __init__(self, seed: int = 0):
+        """
+        :param seed: The seed; equal seeds give equal streams.
+        """
+        self.key = mix(seed)
+        self.counter = 0
+
+    def _next(self) -> int:
+        """
+        :return: The next 64-bit draw.
+        """
+        value = mix(self.key + self.counter * GAMMA)
+        self.counter += 1
+        return value
+
+    def random(self) -> float:
+        """
+        :return: A float in [0, 1).
+        """
+        return (self._next() >> 11) * FLOAT_SCALE
+
+    def getrandbits(self, k: int) -> int:
+        """
+        :param k: The number of bits, at most 64.
+        :return: A k-bit random int.
+        """
+        return self._next() >> (64 - k) if k else 0
+
+    def randrange(self, start: int, stop: int = None) -> int:
+        """
+        :return: A random int in [start, stop), or in [0, start) without stop.
+        """
+        if stop is None:
+            start, stop = 0, start
+        width = stop - start
+        if width <= 0:
+            raise ValueError(f"empty range for randrange({start}, {stop})")
+        # Multiply-shift: the bias is width / 2**64, far below anything a game can observe.
+        return start + ((self._next() * width) >> 64)
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        :return: A random int in [a, b].
+        """
+        return self.randrange(a, b + 1)
+
+    def getstate(self) -> Tuple[int, int]:
+        """
+        :return: The generator state, for setstate().
+        """
+        return self.key, self.counter
+
+    def setstate(self, state: Tuple[int, int]):
+        """
+        :param state: A state from getstate().
+        """
+        self.key, self.counter = state
+
+    def copy(self) -> 'CounterRandom':
+        """
+        :return: A generator that continues this stream from the current draw.
+        """
+        copy = CounterRandom.__new__(CounterRandom)
+        copy.key = self.key
+        copy.counter = self.counter
+        return copy
+
+    def fork(self) -> 'CounterRandom':
+        """
+        Starts an independent child stream, advancing this one by one draw,
+        so forking k times from the same state always gives the same k
+        children.
+
+        :return: The child generator.
+        """
+        child = CounterRandom.__new__(CounterRandom)
+        child.key = mix(self._next() ^ GAMMA)
+        child.counter = 0
+        return child
@@ -0,0 +1,193 @@
+# pacman/game/internal/d_star_lite.py
+
+import heapq
+from typing import List, Tuple, TYPE_CHECKING
+from pacman.game.constants import MOVE
+
+if TYPE_CHECKING:
+    from pacman.game.internal.maze import Maze
+
+INF = float('inf')
+# Keys are (k1, k2) pairs packed as k1 * _KEY_SCALE + k2.
+_KEY_SCALE = 1 << 20
+
+
+class DStarLite:
+    """
+    Incremental shortest-path planner for chasing a moving target (D* Lite,
+    Koenig & Likhachev 2002). The search runs backwards from the goal and
+    keeps its g/rhs values between calls, so when the start or the goal moves
+    only the part of the search affected by the change is repaired instead of
+    searching again from scratch.
+
+    Goal moves are handled as edge cost changes: every goal hangs off one
+    virtual node (index len(graph)) by a zero-cost edge, and moving the goal
+    removes that edge from the old goal node and adds it to the new one.
+
+    A planner belongs to one maze; create a new one when the level changes.
+    """
+
+    def __init__(self, maze: 'Maze', use_heuristic: bool = True):
+        """
+        :param maze: The maze to plan on.
+        :param use_heuristic: Focus the search with the maze's distance table (otherwise h = 0).
+        """
+        self.maze = maze
+        self.adjacency: List[Tuple[Tuple[int, MOVE], ...]] = [
+            tuple((neighbour, move) for move, neighbour in node.neighbourhood.items())
+            for node in maze.graph
+        ]
+        self.use_heuristic = use_heuristic
+        self.virtual_goal = len(maze.graph)
+        self.start = -1
+        self.goal = -1
+        # Number of vertices expanded since the planner was created.
+        self.expansions = 0
+
+    def update(self, start: int, goal: int) -> List[int]:
+        """
+        Moves the start and/or goal and repairs the plan.
+
+        :param start: The node the chaser is at.
+        :param goal: The node being chased.
+        :return: The shortest path from start to goal, excluding start (empty if unreachable).
+        """
+        if self.start == -1:
+            self._initialise(start, goal)
+        else:
+            if start != self.start:
+                self.km += self._h(self.start, start)
+                self.start = start
+            if goal != self.goal:
+                old_goal = self.goal
+                self.goal = goal
+                self._update_vertex(old_goal)
+                self._update_vertex(goal)
+        self._compute_shortest_path()
+        return self.path()
+
+    def next_move(self, start: int, goal: int) -> MOVE:
+        """
+        :param start: The node the chaser is at.
+        :param goal: The node being chased.
+        :return: The first move along the shortest path (MOVE.NEUTRAL if there is none).
+        """
+        path = self.update(start, goal)
+        if not path:
+            return MOVE.NEUTRAL
+        for neighbour, move in self.adjacency[start]:
+            if neighbour == path[0]:
+                return move
+        return MOVE.NEUTRAL
+
+    def distance(self) -> float:
+        """
+        :return: The length of the current plan (inf if the goal is unreachable).
+        """
+        return self.g[self.start]
+
+    def path(self) -> List[int]:
+        """
+        :return: The current plan from start to goal, excluding start. Ties
+            between equally short continuations go to the first in MOVE order.
+        """
+        g = self.g
+        current = self.start
+        if g[current] == INF:
+            return []
+        path = []
+        while current != self.goal:
+            best = INF
+            best_node = -1
+            for neighbour, _ in self.adjacency[current]:
+                if g[neighbour] < best:
+                    best = g[neighbour]
+                    best_node = neighbour
+            if best_node == -1 or best >= g[current]:
+                break  # cannot happen once the plan is consistent; guards against looping
+            current = best_node
+            path.append(current)
+        return path
+
+    def _initialise(self, start: int, goal: int):
+        size = len(self.adjacency) + 1
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.queued: List[int] = [-1] * size
+        self.open: List[Tuple[int, int]] = []
+        self.km = 0
+        self.start = start
+        self.goal = goal
+        self.rhs[self.virtual_goal] = 0
+        self._push(self.virtual_goal)
+
+    def _h(self, a: int, b: int) -> int:
+        if not self.use_heuristic or b == self.virtual_goal or a == b:
+            return 0
+        if a < b:
+            a, b = b, a
+        distance = self.maze.shortest_path_distances[((a * (a + 1)) // 2) + b]
+        return distance if distance > 0 else 0
+
+    def _key(self, node: int) -> int:
+        # (k1, k2) packed into one int: k2 = min(g, rhs) is at most the number
+        # of nodes, and keys are only taken for nodes where it is finite.
+        best = min(self.g[node], self.rhs[node])
+        return (best + self._h(self.start, node) + self.km) * _KEY_SCALE + best
+
+    def _push(self, node: int):
+        key = self._key(node)
+        self.queued[node] = key
+        heapq.heappush(self.open, (key, node))
+
+    def _update_vertex(self, node: int):
+        if node != self.virtual_goal:
+            g = self.g
+            best = 0 if node == self.goal else INF  # the zero-cost edge to the virtual goal
+            for neighbour, _ in self.adjacency[node]:
+                cost = 1 + g[neighbour]
+                if cost < best:
+                    best = cost
+            self.rhs[node] = best
+        self.queued[node] = -1  # lazily removes any entry still in the heap
+        if self.g[node] != self.rhs[node]:
+            self._push(node)
+
+    def _compute_shortest_path(self):
+        g = self.g
+        rhs = self.rhs
+        queued = self.queued
+        open_heap = self.open
+        heappop = heapq.heappop
+        key = self._key
+        update_vertex = self._update_vertex
+        adjacency = self.adjacency
+        start = self.start
+        virtual_goal = self.virtual_goal
+        expansions = 0
+        while open_heap:
+            top_key, node = open_heap[0]
+            if queued[node] != top_key:
+                heappop(open_heap)  # superseded entry
+                continue
+            if top_key >= key(start) and rhs[start] == g[start]:
+                break
+            heappop(open_heap)
+            queued[node] = -1
+            expansions += 1
+            new_key = key(node)
+            if top_key < new_key:
+                queued[node] = new_key
+                heapq.heappush(open_heap, (new_key, node))
+                continue
+            if g[node] > rhs[node]:
+                g[node] = rhs[node]
+            else:
+                g[node] = INF
+                update_vertex(node)
+            if node == virtual_goal:
+                update_vertex(self.goal)
+            else:
+                for predecessor, _ in adjacency[node]:
+                    update_vertex(predecessor)
+        self.expansions += expansions
@@ -0,0 +1,170 @@
+# pacman/game/internal/distances.py
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import List, Optional, Sequence
+
+from pacman.game.constants import PATH_DISTANCES, DIST_NAMES
+
+# Binary layout: a 16 byte header followed by the triangular distance table as
+# little-endian int16 values, in exactly the order of the shipped text files
+# (index = to * (to + 1) // 2 + from, with from <= to). int16 rather than
+# uint16 because the tables contain -1 for unreachable pairs.
+DISTANCE_MAGIC = b"PMDIST\x00\x00"
+DISTANCE_VERSION = 1
+DISTANCE_HEADER = struct.Struct("<8sII")  # magic, version, number of entries
+DISTANCE_TYPECODE = "h"
+DISTANCE_SUFFIX = ".bin"
+DEFAULT_CACHE_DIR = ".cache/distances"
+
+
+def table_size(graph_size: int) -> int:
+    """
+    :param graph_size: The number of nodes in the maze.
+    :return: The number of entries in the triangular distance table.
+    """
+    return (graph_size * (graph_size - 1)) // 2 + graph_size
+
+
+def load_text_distances(path: str, count: int) -> List[int]:
+    """
+    Parses a one-int-per-line distance file into a list.
+
+    :param path: The text file to read.
+    :param count: The number of entries expected in the table.
+    :return: The distance table (missing entries are left at 0).
+    """
+    distances = [0] * count
+    with open(path, 'r') as br:
+        index = 0
+        for line in br:
+            distances[index] = int(line.strip())
+            index += 1
+    return distances
+
+
+def write_binary_distances(distances: Sequence[int], path: str):
+    """
+    Writes a distance table in the binary format. The file is written to a
+    temporary name first and renamed, so readers never see a partial table.
+
+    :param distances: The triangular distance table.
+    :param path: The destination file.
+    """
+    data = array(DISTANCE_TYPECODE, distances)
+    if sys.byteorder != "little":
+        data.byteswap()
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(DISTANCE_HEADER.pack(DISTANCE_MAGIC, DISTANCE_VERSION, len(data)))
+        f.write(data.tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_binary_distances(path: str, count: int) -> Sequence[int]:
+    """
+    Memory-maps a binary distance table. On little-endian machines the result
+    is a zero-copy view over the mapping; elsewhere the values are byte-swapped
+    into an array.
+
+    :param path: The binary file to map.
+    :param count: The number of entries expected in the table.
+    :return: An indexable int16 view of the distance table.
+    :raises ValueError: If the file is not a distance table of the expected size.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, entries = DISTANCE_HEADER.unpack_from(mapped, 0)
+    if magic != DISTANCE_MAGIC or version != DISTANCE_VERSION or entries != count:
+        mapped.close()
+        raise ValueError(f"{path} is not a version {DISTANCE_VERSION} distance table with {count} entries")
+    if len(mapped) != DISTANCE_HEADER.size + count * 2:
+        mapped.close()
+        raise ValueError(f"{path} is truncated")
+    if sys.byteorder != "little":
+        data = array(DISTANCE_TYPECODE, mapped[DISTANCE_HEADER.size:])
+        data.byteswap()
+        mapped.close()
+        return data
+    return memoryview(mapped)[DISTANCE_HEADER.size:].cast(DISTANCE_TYPECODE)
+
+
+def binary_path(file_name: str, directory: str) -> str:
+    """
+    :param file_name: The name of the distance file (without path), e.g. "da".
+    :param directory: The directory holding binary tables.
+    :return: The path of the binary table for that file.
+    """
+    return os.path.join(directory, f"{file_name}{DISTANCE_SUFFIX}")
+
+
+def load_distances(file_name: str, graph_size: int, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> Sequence[int]:
+    """
+    Loads the shortest path distances for a maze, preferring a memory-mapped
+    binary table. Binary tables are looked up next to the shipped text files
+    first and then in the cache directory. If neither exists, the text file is
+    parsed and converted into the cache directory for the next process; if the
+    conversion cannot be written, the parsed list is returned as is.
+
+    :param file_name: The name of the distance file (without path), e.g. "da".
+    :param graph_size: The number of nodes in the maze.
+    :param cache_dir: Directory for converted tables, or None to skip conversion.
+    :return: An indexable sequence of distances.
+    """
+    count = table_size(graph_size)
+    candidates = [binary_path(file_name, PATH_DISTANCES)]
+    if cache_dir is not None:
+        candidates.append(binary_path(file_name, cache_dir))
+
+    for path in candidates:
+        if os.path.exists(path):
+            try:
+                return load_binary_distances(path, count)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"  [WARNING] Ignoring binary distances {path}: {e}")
+
+    distances = load_text_distances(os.path.join(PATH_DISTANCES, file_name), count)
+    if cache_dir is None:
+        return distances
+    try:
+        path = binary_path(file_name, cache_dir)
+        write_binary_distances(distances, path)
+        return load_binary_distances(path, count)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"  [WARNING] Failed to convert distances {file_name}: {e}")
+        return distances
+
+
+def convert_all(directory: str = PATH_DISTANCES):
+    """
+    Converts the shipped text distance files of every maze into binary tables.
+
+    :param directory: The directory to write the binary tables into.
+    """
+    for file_name in DIST_NAMES:
+        text_path = os.path.join(PATH_DISTANCES, file_name)
+        with open(text_path, 'r') as br:
+            count = sum(1 for _ in br)
+        out_path = binary_path(file_name, directory)
+        write_binary_distances(load_text_distances(text_path, count), out_path)
+        print(f"{text_path} -> {out_path} ({count} entries)")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Convert the shipped shortest-path distance files into memory-mappable binary tables.")
+    parser.add_argument("--out", default=PATH_DISTANCES,
+                        help="directory to write the binary tables to (default: next to the text files)")
+    args = parser.parse_args(argv)
+    convert_all(args.out)
+
+
+if __name__ == "__main__":
+    main()
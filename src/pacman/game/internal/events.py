@@ -0,0 +1,104 @@
+# pacman/game/internal/events.py
+
+from array import array
+from typing import List, NamedTuple, Tuple
+
+from pacman.game.constants import EVENT
+
+# Events are kept as four ints (tick, kind, node, value) in one preallocated
+# array used as a ring buffer: appending never allocates, and when the
+# consumer falls behind the oldest events are overwritten (and counted in
+# `dropped`) rather than the buffer growing.
+
+FIELDS = 4
+
+
+class Event(NamedTuple):
+    tick: int  # the game's total time when it happened
+    kind: EVENT
+    node: int
+    value: int
+
+
+class EventBuffer:
+    """
+    A fixed-capacity ring buffer of game events, filled by a Game it is
+    attached to (Game.attach_events) and emptied in bulk by drain().
+    """
+
+    __slots__ = ('capacity', 'dropped', '_data', '_next', '_size')
+
+    def __init__(self, capacity: int = 4096):
+        """
+        :param capacity: The most events held before the oldest are overwritten.
+        """
+        if capacity <= 0:
+            raise ValueError("An event buffer needs a positive capacity")
+        self.capacity = capacity
+        self.dropped = 0
+        self._data = array('q', bytes(8 * FIELDS * capacity))
+        self._next = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, tick: int, kind: EVENT, node: int, value: int):
+        """
+        Records an event, overwriting the oldest one when the buffer is full.
+        """
+        index = self._next
+        base = index * FIELDS
+        data = self._data
+        data[base] = tick
+        data[base + 1] = kind
+        data[base + 2] = node
+        data[base + 3] = value
+        index += 1
+        self._next = 0 if index == self.capacity else index
+        if self._size == self.capacity:
+            self.dropped += 1
+        else:
+            self._size += 1
+
+    def drain(self) -> List[Event]:
+        """
+        Takes every buffered event out of the buffer.
+
+        :return: The events, oldest first.
+        """
+        data = self._data
+        start = (self._next - self._size) % self.capacity
+        events = []
+        for i in range(self._size):
+            base = ((start + i) % self.capacity) * FIELDS
+            events.append(Event(data[base], EVENT(data[base + 1]), data[base + 2], data[base + 3]))
+        self.clear()
+        return events
+
+    def mark(self) -> Tuple[int, int, int]:
+        """
+        :return: The buffer position, for rewind().
+        """
+        return self._next, self._size, self.dropped
+
+    def rewind(self, mark: Tuple[int, int, int]):
+        """
+        Takes out every event appended since mark() was called. Events that
+        were overwritten in the meantime stay lost and are counted as dropped.
+        The buffer must not have been drained or cleared since.
+
+        :param mark: A position from mark().
+        """
+        next_index, size, dropped = mark
+        lost = min(self.dropped - dropped, size)
+        self._next = next_index
+        self._size = size - lost
+        self.dropped = dropped + lost
+
+    def clear(self):
+        """
+        Discards the buffered events.
+        """
+        self._next = 0
+        self._size = 0
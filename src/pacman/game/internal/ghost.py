@@ -1,6 +1,8 @@
 # pacman/game/internal/ghost.py
 
-from pacman.game.constants import GHOST, MOVE
+from pacman.game.constants import GHOST, MOVE, MOVES, MOVE_CODES
+
+GHOSTS = tuple(GHOST)
 
 
 class Ghost:
@@ -17,3 +19,61 @@ class Ghost:
 
     def copy(self) -> 'Ghost':
         return Ghost(self.type, self.current_node_index, self.edible_time, self.lair_time, self.last_move_made)
+
+
+class GhostView:
+    """
+    A ghost as a Ghost-like object over a game's flat state (see FastGame):
+    reads and writes go straight to the game. Writes first give the game
+    its own copy of state it shares with snapshots.
+    """
+
+    __slots__ = ('_game', '_index', 'type')
+
+    def __init__(self, game, index: int):
+        """
+        :param game: The game.
+        :param index: The ghost's index in GHOST order.
+        """
+        self._game = game
+        self._index = index
+        self.type = GHOSTS[index]
+
+    @property
+    def current_node_index(self) -> int:
+        return self._game.ghost_nodes[self._index]
+
+    @current_node_index.setter
+    def current_node_index(self, value: int):
+        self._game._own_state()
+        self._game.ghost_nodes[self._index] = value
+
+    @property
+    def edible_time(self) -> int:
+        return self._game.ghost_edible_times[self._index]
+
+    @edible_time.setter
+    def edible_time(self, value: int):
+        self._game._own_state()
+        self._game.ghost_edible_times[self._index] = value
+
+    @property
+    def lair_time(self) -> int:
+        return self._game.ghost_lair_times[self._index]
+
+    @lair_time.setter
+    def lair_time(self, value: int):
+        self._game._own_state()
+        self._game.ghost_lair_times[self._index] = value
+
+    @property
+    def last_move_made(self) -> MOVE:
+        return MOVES[self._game.ghost_moves[self._index]]
+
+    @last_move_made.setter
+    def last_move_made(self, value: MOVE):
+        self._game._own_state()
+        self._game.ghost_moves[self._index] = MOVE_CODES[value]
+
+    def copy(self) -> Ghost:
+        return Ghost(self.type, self.current_node_index, self.edible_time, self.lair_time, self.last_move_made)
@@ -1,8 +1,12 @@
 import os
-from typing import List
-from ..constants import PATH_MAZES, PATH_DISTANCES, NODE_NAMES, DIST_NAMES
+import threading
+from typing import FrozenSet, Iterator, List, Optional, Sequence
+from ..constants import PATH_MAZES, NODE_NAMES, DIST_NAMES, NUM_MAZES, EAT_DISTANCE
 from .node import Node
-from .a_star import AStarNode, AStar
+from .a_star import AStarNode, HeapAStar
+from .path_tree import PathTreeSearch
+from . import distances
+from . import next_moves
 
 
 class Maze:
@@ -12,9 +16,9 @@ class Maze:
 
         :param index: The index of the maze (used to select node and distance files).
         """
-        self.astar = AStar()
-        # Pre-computed shortest path distances
-        self.shortest_path_distances: List[int] = []
+        self.astar = HeapAStar()
+        # Pre-computed shortest path distances (memory-mapped when a binary table is available)
+        self.shortest_path_distances: Sequence[int] = []
         self.pill_indices: List[int] = []  # Indices of nodes with pills
         # Indices of nodes with power pills
         self.power_pill_indices: List[int] = []
@@ -24,10 +28,74 @@ class Maze:
         self.initial_ghost_node_index: int = 0  # Starting node for ghosts
         self.graph: List[Node] = []  # The maze graph as a list of nodes
         self.name: str = ""  # Name of the maze
+        self.distances_name: str = DIST_NAMES[index]
+        self._next_moves: Optional[next_moves.NextMoveTable] = None
+        self._next_moves_lock = threading.Lock()
+        self._eat_neighbourhoods: Optional[List[FrozenSet[int]]] = None
 
         self.load_nodes(NODE_NAMES[index])
         self.load_distances(DIST_NAMES[index])
         self.astar.create_graph(self.graph)
+        self.path_trees = PathTreeSearch(self.graph)
+
+    @property
+    def next_moves(self) -> next_moves.NextMoveTable:
+        """
+        The precomputed next-move tables for DM.PATH queries, memory-mapped
+        from the cache on first use (and built there if missing).
+        """
+        table = self._next_moves
+        if table is None:
+            with self._next_moves_lock:
+                table = self._next_moves
+                if table is None:
+                    table = next_moves.load_or_build(self, self.distances_name)
+                    self._next_moves = table
+        return table
+
+    @property
+    def eat_neighbourhoods(self) -> List[FrozenSet[int]]:
+        """
+        eat_neighbourhoods[node] is the set of nodes within EAT_DISTANCE of
+        node (itself included), built on first use, so collision checks are
+        membership tests instead of distance lookups.
+        """
+        neighbourhoods = self._eat_neighbourhoods
+        if neighbourhoods is None:
+            neighbourhoods = self._build_eat_neighbourhoods()
+            self._eat_neighbourhoods = neighbourhoods
+        return neighbourhoods
+
+    def _build_eat_neighbourhoods(self) -> List[FrozenSet[int]]:
+        """
+        Collects the nodes up to EAT_DISTANCE edges away and keeps those the
+        distance table puts within EAT_DISTANCE, so the sets agree with
+        Game.get_shortest_path_distance exactly.
+
+        :return: The neighbourhood of every node.
+        """
+        adjacent = [set() for _ in self.graph]
+        for node in self.graph:
+            for neighbour in node.neighbourhood.values():
+                adjacent[node.node_index].add(neighbour)
+                adjacent[neighbour].add(node.node_index)
+        distances = self.shortest_path_distances
+        neighbourhoods = []
+        for node in self.graph:
+            index = node.node_index
+            reached = {index}
+            frontier = {index}
+            for _ in range(EAT_DISTANCE):
+                frontier = {n for f in frontier for n in adjacent[f]} - reached
+                reached |= frontier
+            near = set()
+            for other in reached:
+                hi, lo = (index, other) if index > other else (other, index)
+                distance = 0 if hi == lo else distances[(hi * (hi + 1)) // 2 + lo]
+                if distance != -1 and distance <= EAT_DISTANCE:
+                    near.add(other)
+            neighbourhoods.append(frozenset(near))
+        return neighbourhoods
 
     def load_nodes(self, file_name: str):
         """
@@ -89,19 +157,53 @@ class Maze:
 
     def load_distances(self, file_name: str):
         """
-        Loads pre-computed shortest path distances from a file.
+        Loads pre-computed shortest path distances, memory-mapping the binary
+        table when one exists and falling back to the text file otherwise.
 
         :param file_name: The name of the distance file (without path).
         """
         graph_size = len(self.graph)
-        self.shortest_path_distances = [
-            0] * ((graph_size * (graph_size - 1)) // 2 + graph_size)
-
         try:
-            with open(os.path.join(PATH_DISTANCES, file_name), 'r') as br:
-                index = 0
-                for line in br:
-                    self.shortest_path_distances[index] = int(line.strip())
-                    index += 1
+            self.shortest_path_distances = distances.load_distances(file_name, graph_size)
         except IOError as e:
             print(f"Error loading distances from {file_name}: {e}")
+            self.shortest_path_distances = [0] * distances.table_size(graph_size)
+
+
+class MazeRegistry:
+    """
+    Process-wide collection of the mazes. Each maze is loaded on first access
+    and then shared by every Game, so mazes must be treated as read-only.
+    """
+
+    def __init__(self, count: int = NUM_MAZES):
+        self._mazes: List[Optional[Maze]] = [None] * count
+        self._lock = threading.Lock()
+
+    def __getitem__(self, index: int) -> Maze:
+        maze = self._mazes[index]
+        if maze is None:
+            with self._lock:
+                maze = self._mazes[index]
+                if maze is None:
+                    maze = Maze(index % len(self._mazes))
+                    self._mazes[index] = maze
+        return maze
+
+    def __len__(self) -> int:
+        return len(self._mazes)
+
+    def __iter__(self) -> Iterator[Maze]:
+        for index in range(len(self._mazes)):
+            yield self[index]
+
+    def is_loaded(self, index: int) -> bool:
+        """
+        :param index: The maze index.
+        :return: Whether the maze has already been loaded in this process.
+        """
+        return self._mazes[index] is not None
+
+
+# The shared registry used by all games in this process.
+MAZES = MazeRegistry()
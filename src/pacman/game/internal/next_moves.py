@@ -0,0 +1,302 @@
+# pacman/game/internal/next_moves.py
+
+import argparse
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, TYPE_CHECKING
+
+from pacman.game.constants import MOVE, DIST_NAMES, MOVES, MOVE_CODES, NEUTRAL_CODE, OPPOSITE_CODES
+from pacman.game.internal.build_lock import BuildLock, BUILD_LOCK_TIMEOUT
+
+if TYPE_CHECKING:
+    from pacman.game.internal.maze import Maze
+
+# Binary layout: a 16 byte header followed by four tables of graph_size *
+# graph_size uint8 move codes (the index of the move in MOVE), each indexed by
+# from_node * graph_size + to_node:
+#   towards       - the move Game.get_next_move_towards_target(..., DM.PATH) returns
+#   towards_other - the same choice with that move excluded
+#   away          - the move Game.get_next_move_away_from_target(..., DM.PATH) returns
+#   away_other    - the same choice with that move excluded
+# The no-reversal variants only differ from the plain ones when the plain
+# choice is the reversal, in which case the *_other table holds the answer, so
+# (node, last_move, target) queries need no table of their own.
+NEXT_MOVES_MAGIC = b"PMNEXT\x00\x00"
+NEXT_MOVES_VERSION = 1
+NEXT_MOVES_HEADER = struct.Struct("<8sII")  # magic, version, graph size
+NEXT_MOVES_SUFFIX = ".next.bin"
+NEXT_MOVES_TABLES = 4
+DEFAULT_CACHE_DIR = ".cache/next_moves"
+
+_OPPOSITE_CODES = {move: MOVE_CODES[move.opposite()] for move in MOVE}
+
+
+class NextMoveTable:
+    """
+    Read-only view over the next-move tables of one maze. Every query is one
+    or two byte reads.
+    """
+
+    def __init__(self, data: Sequence[int], graph_size: int):
+        """
+        :param data: The four tables back to back (a memoryview over the mapped file, or a bytearray).
+        :param graph_size: The number of nodes in the maze.
+        """
+        size = graph_size * graph_size
+        view = memoryview(data)
+        self.graph_size = graph_size
+        self._towards = view[0:size]
+        self._towards_other = view[size:2 * size]
+        self._away = view[2 * size:3 * size]
+        self._away_other = view[3 * size:4 * size]
+
+    def towards(self, from_node_index: int, to_node_index: int) -> MOVE:
+        return MOVES[self._towards[from_node_index * self.graph_size + to_node_index]]
+
+    def away(self, from_node_index: int, to_node_index: int) -> MOVE:
+        return MOVES[self._away[from_node_index * self.graph_size + to_node_index]]
+
+    def approximate_towards(self, from_node_index: int, to_node_index: int, last_move_made: MOVE) -> MOVE:
+        key = from_node_index * self.graph_size + to_node_index
+        code = self._towards[key]
+        if code == _OPPOSITE_CODES[last_move_made]:
+            code = self._towards_other[key]
+        return MOVES[code]
+
+    def approximate_away(self, from_node_index: int, to_node_index: int, last_move_made: MOVE) -> MOVE:
+        key = from_node_index * self.graph_size + to_node_index
+        code = self._away[key]
+        if code == _OPPOSITE_CODES[last_move_made]:
+            code = self._away_other[key]
+        return MOVES[code]
+
+    # The same queries on move codes.
+
+    def towards_i(self, from_node_index: int, to_node_index: int) -> int:
+        return self._towards[from_node_index * self.graph_size + to_node_index]
+
+    def away_i(self, from_node_index: int, to_node_index: int) -> int:
+        return self._away[from_node_index * self.graph_size + to_node_index]
+
+    def approximate_towards_i(self, from_node_index: int, to_node_index: int, last_move_code: int) -> int:
+        key = from_node_index * self.graph_size + to_node_index
+        code = self._towards[key]
+        if code == OPPOSITE_CODES[last_move_code]:
+            code = self._towards_other[key]
+        return code
+
+    def approximate_away_i(self, from_node_index: int, to_node_index: int, last_move_code: int) -> int:
+        key = from_node_index * self.graph_size + to_node_index
+        code = self._away[key]
+        if code == OPPOSITE_CODES[last_move_code]:
+            code = self._away_other[key]
+        return code
+
+
+def build_tables(maze: 'Maze') -> bytearray:
+    """
+    Computes the next-move tables of a maze from its shortest path distances,
+    choosing moves with the same tie-breaking as the Game methods (the first
+    neighbour, in MOVE order, with the strictly best distance).
+
+    :param maze: The maze to build the tables for.
+    :return: The four tables back to back.
+    """
+    graph = maze.graph
+    distances = maze.shortest_path_distances
+    n = len(graph)
+    size = n * n
+    data = bytearray([NEUTRAL_CODE]) * (NEXT_MOVES_TABLES * size)
+    rows = [i * (i + 1) // 2 for i in range(n)]
+
+    def distance_row(v: int) -> List[int]:
+        # Distance from v to every node, as get_shortest_path_distance returns it.
+        base = rows[v]
+        row = [distances[base + to] for to in range(v + 1)] + [distances[rows[to] + v] for to in range(v + 1, n)]
+        row[v] = 0
+        return row
+
+    distance_rows = [distance_row(v) if graph[v].neighbourhood else None for v in range(n)]
+    # Nodes with one or two neighbours are filled a whole row at a time;
+    # junctions go through the general case.
+    for frm, node in enumerate(graph):
+        moves = [(MOVE_CODES[move], distance_rows[neighbour]) for move, neighbour in node.neighbourhood.items()]
+        if not moves:
+            continue
+        key = frm * n
+        if len(moves) == 1:
+            code = moves[0][0]
+            data[key:key + n] = bytes([code]) * n
+            data[2 * size + key:2 * size + key + n] = bytes([code]) * n
+            continue
+        if len(moves) == 2:
+            (c0, r0), (c1, r1) = moves
+            data[key:key + n] = bytes([c0 if a <= b else c1 for a, b in zip(r0, r1)])
+            data[size + key:size + key + n] = bytes([c1 if a <= b else c0 for a, b in zip(r0, r1)])
+            data[2 * size + key:2 * size + key + n] = bytes([c0 if a >= b else c1 for a, b in zip(r0, r1)])
+            data[3 * size + key:3 * size + key + n] = bytes([c1 if a >= b else c0 for a, b in zip(r0, r1)])
+            continue
+        codes = [code for code, _ in moves]
+        for to, dists in enumerate(zip(*[row for _, row in moves])):
+            best = dists.index(min(dists))
+            worst = dists.index(max(dists))
+            data[key + to] = codes[best]
+            data[size + key + to] = codes[_first_best(dists, best, min)]
+            data[2 * size + key + to] = codes[worst]
+            data[3 * size + key + to] = codes[_first_best(dists, worst, max)]
+    return data
+
+
+def _first_best(dists: Sequence[int], excluded: int, pick) -> int:
+    rest = dists[:excluded] + dists[excluded + 1:]
+    index = rest.index(pick(rest))
+    return index if index < excluded else index + 1
+
+
+def write_next_moves(data: bytes, graph_size: int, path: str):
+    """
+    Writes next-move tables to a file via a temporary name and a rename.
+
+    :param data: The four tables back to back.
+    :param graph_size: The number of nodes in the maze.
+    :param path: The destination file.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(NEXT_MOVES_HEADER.pack(NEXT_MOVES_MAGIC, NEXT_MOVES_VERSION, graph_size))
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def load_next_moves(path: str, graph_size: int) -> NextMoveTable:
+    """
+    Memory-maps next-move tables.
+
+    :param path: The file to map.
+    :param graph_size: The number of nodes in the maze.
+    :return: The tables.
+    :raises ValueError: If the file does not hold tables for a maze of that size.
+    """
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, size = NEXT_MOVES_HEADER.unpack_from(mapped, 0)
+    if magic != NEXT_MOVES_MAGIC or version != NEXT_MOVES_VERSION or size != graph_size:
+        mapped.close()
+        raise ValueError(f"{path} is not a version {NEXT_MOVES_VERSION} next-move table for {graph_size} nodes")
+    if len(mapped) != NEXT_MOVES_HEADER.size + NEXT_MOVES_TABLES * graph_size * graph_size:
+        mapped.close()
+        raise ValueError(f"{path} is truncated")
+    return NextMoveTable(memoryview(mapped)[NEXT_MOVES_HEADER.size:], graph_size)
+
+
+def next_moves_path(file_name: str, directory: str) -> str:
+    """
+    :param file_name: The name of the maze's distance file (without path), e.g. "da".
+    :param directory: The directory holding the tables.
+    :return: The path of the next-move tables for that maze.
+    """
+    return os.path.join(directory, f"{file_name}{NEXT_MOVES_SUFFIX}")
+
+
+def load_or_build(maze: 'Maze', file_name: str, cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> NextMoveTable:
+    """
+    Loads the next-move tables of a maze from the cache directory, building
+    and saving them first if they do not exist yet.
+
+    :param maze: The maze.
+    :param file_name: The name of the maze's distance file (without path), e.g. "da".
+    :param cache_dir: Directory for the tables, or None to build in memory only.
+    :return: The tables.
+    """
+    graph_size = len(maze.graph)
+    if cache_dir is None:
+        print(f"  [DEBUG] Building next-move tables for {file_name}...")
+        return NextMoveTable(build_tables(maze), graph_size)
+
+    path = next_moves_path(file_name, cache_dir)
+    table = _load_if_present(path, graph_size)
+    if table is not None:
+        return table
+
+    # Only one process builds; the others wait on the lock and then load its file
+    os.makedirs(cache_dir, exist_ok=True)
+    lock = BuildLock(f"{path}.lock")
+    try:
+        locked = lock.acquire(timeout=BUILD_LOCK_TIMEOUT)
+    except OSError as e:
+        print(f"  [WARNING] Cannot lock {path}: {e}")
+        locked = False
+    try:
+        if locked:
+            table = _load_if_present(path, graph_size)
+            if table is not None:
+                return table
+        print(f"  [DEBUG] Building next-move tables for {file_name}...")
+        data = build_tables(maze)
+        try:
+            write_next_moves(data, graph_size, path)
+            return load_next_moves(path, graph_size)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"  [WARNING] Failed to save next-move tables {file_name}: {e}")
+            return NextMoveTable(data, graph_size)
+    finally:
+        lock.release()
+
+
+def _load_if_present(path: str, graph_size: int) -> Optional[NextMoveTable]:
+    if not os.path.exists(path):
+        return None
+    try:
+        return load_next_moves(path, graph_size)
+    except (OSError, ValueError, struct.error) as e:
+        print(f"  [WARNING] Ignoring next-move tables {path}: {e}")
+        return None
+
+
+def _build_one(index: int, cache_dir: str) -> str:
+    from pacman.game.internal.maze import MAZES
+
+    load_or_build(MAZES[index], DIST_NAMES[index], cache_dir)
+    return DIST_NAMES[index]
+
+
+def build_all(indices: Optional[List[int]] = None, cache_dir: str = DEFAULT_CACHE_DIR,
+              processes: Optional[int] = None):
+    """
+    Builds the next-move tables of several mazes, one maze per worker process.
+
+    :param indices: The maze indices to build; None builds every maze.
+    :param cache_dir: Directory to store the tables.
+    :param processes: The number of worker processes; None uses one per maze (up to the CPU count).
+    """
+    if indices is None:
+        indices = list(range(len(DIST_NAMES)))
+    if processes is None:
+        processes = min(len(indices), os.cpu_count() or 1)
+    if processes <= 1:
+        for index in indices:
+            _build_one(index, cache_dir)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for name in pool.map(_build_one, indices, [cache_dir] * len(indices)):
+            print(f"  [DEBUG] Next-move tables ready for {name}")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        description="Precompute the next-move tables used by the DM.PATH next-move queries.")
+    parser.add_argument("--out", default=DEFAULT_CACHE_DIR,
+                        help=f"directory to write the tables to (default: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="number of worker processes (default: one per maze)")
+    args = parser.parse_args(argv)
+    build_all(cache_dir=args.out, processes=args.processes)
+
+
+if __name__ == "__main__":
+    main()
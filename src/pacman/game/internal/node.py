@@ -1,7 +1,7 @@
 # pacman/game/internal/node.py
 
-from typing import Dict
-from pacman.game.constants import MOVE
+from typing import Dict, List, Tuple
+from pacman.game.constants import MOVE, MOVES, MOVE_CODES
 
 
 class Node:
@@ -59,3 +59,10 @@ class Node:
 
         self.all_neighbouring_nodes[MOVE.NEUTRAL] = neighbouring_nodes
         self.all_possible_moves[MOVE.NEUTRAL] = possible_moves
+
+        # The same adjacency on move codes: neighbours_i[code] is the neighbour
+        # in that direction or -1, and possible_moves_i[last_move_code] holds the
+        # codes of all_possible_moves[last_move] (empty where that has no entry).
+        self.neighbours_i: Tuple[int, ...] = tuple(neighbours) + (-1,)
+        self.possible_moves_i: Tuple[Tuple[int, ...], ...] = tuple(
+            tuple(MOVE_CODES[m] for m in self.all_possible_moves.get(move, ())) for move in MOVES)
@@ -1,6 +1,6 @@
 # pacman/game/internal/pac_man.py
 
-from pacman.game.constants import MOVE
+from pacman.game.constants import MOVE, MOVES, MOVE_CODES
 
 
 class PacMan:
@@ -12,3 +12,50 @@ class PacMan:
 
     def copy(self) -> 'PacMan':
         return PacMan(self.current_node_index, self.last_move_made, self.number_of_lives_remaining, self.has_received_extra_life)
+
+
+class PacManView:
+    """
+    Pac-Man as a PacMan-like object over a game's flat state (see FastGame):
+    reads and writes go straight to the game.
+    """
+
+    __slots__ = ('_game',)
+
+    def __init__(self, game):
+        self._game = game
+
+    @property
+    def current_node_index(self) -> int:
+        return self._game.pacman_node
+
+    @current_node_index.setter
+    def current_node_index(self, value: int):
+        self._game.pacman_node = value
+
+    @property
+    def last_move_made(self) -> MOVE:
+        return MOVES[self._game.pacman_move]
+
+    @last_move_made.setter
+    def last_move_made(self, value: MOVE):
+        self._game.pacman_move = MOVE_CODES[value]
+
+    @property
+    def number_of_lives_remaining(self) -> int:
+        return self._game.lives
+
+    @number_of_lives_remaining.setter
+    def number_of_lives_remaining(self, value: int):
+        self._game.lives = value
+
+    @property
+    def has_received_extra_life(self) -> bool:
+        return self._game.has_received_extra_life
+
+    @has_received_extra_life.setter
+    def has_received_extra_life(self, value: bool):
+        self._game.has_received_extra_life = value
+
+    def copy(self) -> PacMan:
+        return PacMan(self.current_node_index, self.last_move_made, self.number_of_lives_remaining, self.has_received_extra_life)
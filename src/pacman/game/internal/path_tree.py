@@ -0,0 +1,120 @@
+# pacman/game/internal/path_tree.py
+
+from typing import Dict, Iterable, List, Optional, Tuple, TYPE_CHECKING
+from pacman.game.constants import MOVE
+
+if TYPE_CHECKING:
+    from pacman.game.internal.node import Node
+
+
+class ShortestPathTree:
+    """
+    The result of one breadth-first search from a source node: the distance,
+    parent and first move of every node it reached. Paths to any reached node
+    are read back from the tree, so one search answers a whole batch of
+    targets.
+    """
+
+    def __init__(self, source: int, distance: Dict[int, int], parent: Dict[int, int],
+                 first_move: Dict[int, MOVE], nearest: List[int]):
+        self.source = source
+        self._distance = distance
+        self._parent = parent
+        self._first_move = first_move
+        # The requested targets that were reached, nearest first (ties in request order).
+        self.nearest = nearest
+
+    def reached(self, node_index: int) -> bool:
+        return node_index in self._distance
+
+    def distance(self, node_index: int) -> int:
+        """
+        :param node_index: The node index.
+        :return: The shortest path distance from the source, or -1 if the search did not reach the node.
+        """
+        return self._distance.get(node_index, -1)
+
+    def first_move(self, node_index: int) -> MOVE:
+        """
+        :param node_index: The node index.
+        :return: The first move on the shortest path to the node (the first such move in MOVE order when
+            there are several), or MOVE.NEUTRAL for the source and nodes that were not reached.
+        """
+        return self._first_move.get(node_index, MOVE.NEUTRAL)
+
+    def path(self, node_index: int) -> List[int]:
+        """
+        :param node_index: The node index.
+        :return: The path from the source to the node, excluding the source (empty if not reached).
+        """
+        if node_index not in self._parent:
+            return []
+        path = []
+        parent = self._parent
+        while node_index != self.source:
+            path.append(node_index)
+            node_index = parent[node_index]
+        path.reverse()
+        return path
+
+    def paths(self) -> Dict[int, List[int]]:
+        """
+        :return: The path to every target in nearest.
+        """
+        return {target: self.path(target) for target in self.nearest}
+
+
+class PathTreeSearch:
+    """
+    Breadth-first search over a maze graph. The graph is read-only after
+    construction, so one instance can be shared by every game on the maze.
+    """
+
+    def __init__(self, nodes: List['Node']):
+        self.adjacency: List[Tuple[Tuple[int, MOVE], ...]] = [
+            tuple((neighbour, move) for move, neighbour in node.neighbourhood.items())
+            for node in nodes
+        ]
+
+    def search(self, source: int, targets: Iterable[int], k: Optional[int] = None) -> ShortestPathTree:
+        """
+        Expands the graph from the source one distance level at a time until
+        every target is reached, or until k of them are and their level is
+        complete, so that ties with the k-th target are seen too.
+
+        :param source: The source node index.
+        :param targets: The target node indices.
+        :param k: Stop once this many targets are reached; None reaches all of them.
+        :return: The search tree.
+        """
+        order: Dict[int, int] = {}
+        for position, target in enumerate(targets):
+            order.setdefault(target, position)
+        adjacency = self.adjacency
+        distance = {source: 0}
+        parent = {source: -1}
+        first_move = {source: MOVE.NEUTRAL}
+        found = [source] if source in order else []
+        remaining = len(order) - len(found)
+        wanted = k if k is not None else len(order)
+
+        frontier = [source]
+        level = 0
+        while frontier and remaining > 0 and len(found) < wanted:
+            level += 1
+            next_frontier = []
+            for u in frontier:
+                move_u = first_move[u]
+                for v, move in adjacency[u]:
+                    if v not in distance:
+                        distance[v] = level
+                        parent[v] = u
+                        first_move[v] = move if u == source else move_u
+                        next_frontier.append(v)
+                        if v in order:
+                            found.append(v)
+                            remaining -= 1
+            frontier = next_frontier
+
+        found.sort(key=lambda target: (distance[target], order[target]))
+        return ShortestPathTree(source, distance, parent, first_move, found[:wanted])
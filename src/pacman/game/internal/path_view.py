@@ -0,0 +1,83 @@
+# pacman/game/internal/path_view.py
+
+from collections.abc import Sequence
+from typing import Iterator, List, Tuple, Union
+
+Segment = Tuple[List[int], int, int]  # (path, start, stop)
+
+
+class PathView(Sequence):
+    """
+    A read-only path made of slices of existing paths. Building one only
+    stores the slice bounds, so it costs the same however long the path is.
+    Behaves like a list of node indices for len(), indexing, iteration and
+    comparison; use list(view) when a real list is needed.
+    """
+    __slots__ = ("_segments", "_length")
+
+    def __init__(self, *segments: Segment):
+        self._segments = segments
+        length = 0
+        for _, start, stop in segments:
+            length += stop - start
+        self._length = length
+
+    @classmethod
+    def of(cls, *paths: List[int]) -> 'PathView':
+        """
+        :param paths: Whole paths to join, in order.
+        :return: A view of the paths joined end to end.
+        """
+        view = cls.__new__(cls)
+        view._segments = [(path, 0, len(path)) for path in paths]
+        view._length = sum(map(len, paths))
+        return view
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._length)
+            if step != 1:
+                return list(self)[index]
+            return self._slice(start, stop)
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("path index out of range")
+        for path, start, stop in self._segments:
+            size = stop - start
+            if index < size:
+                return path[start + index]
+            index -= size
+
+    def __iter__(self) -> Iterator[int]:
+        for path, start, stop in self._segments:
+            for i in range(start, stop):
+                yield path[i]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (PathView, list, tuple, memoryview)):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"PathView({list(self)})"
+
+    def _slice(self, start: int, stop: int) -> 'PathView':
+        segments = []
+        offset = 0
+        for path, seg_start, seg_stop in self._segments:
+            size = seg_stop - seg_start
+            lo = max(start - offset, 0)
+            hi = min(stop - offset, size)
+            if lo < hi:
+                segments.append((path, seg_start + lo, seg_start + hi))
+            offset += size
+        return PathView(*segments)
+
+
+EMPTY_PATH = PathView()
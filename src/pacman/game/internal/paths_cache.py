@@ -1,13 +1,46 @@
 # pacman/game/internal/paths_cache.py
 
 import os
-import pickle
-import gzip
+import mmap
+import struct
+import sys
 import hashlib
-from typing import List, Dict, Optional
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Generic, List, Dict, Optional, Sequence, TypeVar, TYPE_CHECKING
 from collections import defaultdict
 from pacman.game.constants import MOVE
 from pacman.game.internal.node import Node
+from pacman.game.internal.a_star import HeapAStar
+from pacman.game.internal.maze import MAZES, MazeRegistry
+from pacman.game.internal.path_view import PathView, EMPTY_PATH
+from pacman.game.internal.next_moves import MOVES, MOVE_CODES
+from pacman.game.internal.build_lock import BuildLock, BUILD_LOCK_TIMEOUT
+
+if TYPE_CHECKING:
+    from pacman.game.internal.maze import Maze
+
+# Bumped whenever the layout or contents of the cached path tables change.
+CACHE_VERSION = 4
+
+# On-disk layout: a header followed by little-endian int32 sections, in order:
+#   junction_nodes  [junctions]                     node index of every junction
+#   node_flags      [nodes]                         1 for junction nodes
+#   node_corridors  [nodes + 1]                     corridor range of every node
+#   corridors       [corridors * CORRIDOR_FIELDS]   see CORRIDOR_FIELDS
+#   junction_paths  [junctions^2 * len(MOVE) * 2]   (offset, length) of paths[i][j][move], length -1 if unset
+#   pool            [pool size]                     all paths back to back
+# Paths are stored once however many tables share them, and are read straight
+# from the mapping.
+PATHS_MAGIC = b"PMPATHS\x00"
+PATHS_HEADER = struct.Struct("<8sIIIII")  # magic, version, nodes, junctions, corridors, pool size
+PATHS_SUFFIX = ".bin"
+# junction node, first move, node started from, last move, path offset, reverse path offset, length
+CORRIDOR_FIELDS = 7
+_UNSET = -1
+
+_OPPOSITES = {move: move.opposite() for move in MOVE}
 
 
 class JunctionData:
@@ -18,6 +51,17 @@ class JunctionData:
         self.last_move = last_move
         self.path = path
         self.reverse_path = self._get_reverse_path(path) if path else []
+        self._offsets: Optional[Dict[int, int]] = None
+
+    @property
+    def offsets(self) -> Dict[int, int]:
+        """
+        Position of every node on the corridor, for O(1) on-path lookups
+        (built on first use).
+        """
+        if self._offsets is None:
+            self._offsets = {node: i for i, node in enumerate(self.path)}
+        return self._offsets
 
     def _get_reverse_path(self, path: List[int]) -> List[int]:
         reverse_path = [0] * len(path)
@@ -42,8 +86,9 @@ class DNode:
     def get_path_to_junction(self, last_move_made: MOVE) -> List[int]:
         if self.is_junction:
             return []
+        blocked = _OPPOSITES[last_move_made]
         for jd in self.closest_junctions:
-            if jd.first_move != last_move_made.opposite():
+            if jd.first_move is not blocked:
                 return jd.path
         return None
 
@@ -52,8 +97,9 @@ class DNode:
             return self.closest_junctions[0]
         min_dist = float('inf')
         best_jd = None
+        blocked = _OPPOSITES[last_move_made]
         for jd in self.closest_junctions:
-            if jd.first_move != last_move_made.opposite():
+            if jd.first_move is not blocked:
                 new_dist = len(jd.path)
                 if new_dist < min_dist:
                     min_dist = new_dist
@@ -115,41 +161,32 @@ class PathsCache:
     #     for junction in self.junctions:
     #         junction.compute_shortest_paths()
 
-    def __init__(self, game: 'Game'):
+    def __init__(self, maze: 'Maze'):
         """
-        Initializes the PathsCache with a reference to the main game object.
+        Builds the path cache for a single maze.
 
-        :param game: The active game instance.
+        :param maze: The maze to compute paths for.
         """
-        # It's better to import at the top, but we use a forward reference 'Game'
-        # to avoid circular import errors at the module level.
-
-        # Use the provided game instance, DON'T create a new one.
-        self.game = game
-
-        # --- End of Changes ---
-
         self.junction_index_converter: Dict[int, int] = {}
         self.nodes: List[DNode] = []
         self.junctions: List[Junction] = []
 
-        m = self.game.get_current_maze()
-        jct_indices = m.junction_indices
+        jct_indices = maze.junction_indices
         for i, idx in enumerate(jct_indices):
             self.junction_index_converter[idx] = i
 
-        self.nodes = self._assign_junctions_to_nodes(self.game)
-        self.junctions = self._junction_distances(self.game)
+        self.nodes = self._assign_junctions_to_nodes(maze)
+        self.junctions = self._junction_distances(maze)
 
         for junction in self.junctions:
             junction.compute_shortest_paths()
 
     @classmethod
-    def load_or_build(cls, game: 'Game', cache_dir: str = ".cache/paths") -> 'PathsCache':
+    def load_or_build(cls, maze: 'Maze', cache_dir: str = ".cache/paths") -> 'PathsCache':
         """
         Loads a cached PathsCache from disk if available, otherwise builds and saves it.
         
-        :param game: The active game instance.
+        :param maze: The maze to load or build the paths for.
         :param cache_dir: Directory to store cache files.
         :return: A PathsCache instance.
         """
@@ -157,47 +194,154 @@ class PathsCache:
         os.makedirs(cache_dir, exist_ok=True)
         
         # Generate a unique cache key based on maze properties
-        maze = game.get_current_maze()
         cache_key = cls._generate_cache_key(maze)
-        cache_file = os.path.join(cache_dir, f"v1_{cache_key}.pkl.gz")
+        cache_file = os.path.join(cache_dir, f"v{CACHE_VERSION}_{cache_key}{PATHS_SUFFIX}")
         
         # Try to load from cache
-        if os.path.exists(cache_file):
+        instance = cls._load_if_present(cache_file)
+        if instance is not None:
+            return instance
+
+        # Only one process builds; the others wait on the lock and then load its file
+        lock = BuildLock(f"{cache_file}.lock")
+        try:
+            locked = lock.acquire(timeout=BUILD_LOCK_TIMEOUT)
+        except OSError as e:
+            print(f"  [WARNING] Cannot lock {cache_file}: {e}")
+            locked = False
+        try:
+            if locked:
+                instance = cls._load_if_present(cache_file)
+                if instance is not None:
+                    return instance
+            else:
+                print(f"  [WARNING] Building {cache_file} without the build lock")
+
+            # Build new cache
+            print(f"  [DEBUG] Building new PathsCache...")
+            instance = cls(maze)
+
+            # Save to cache, then use the mapped copy like every other process will
             try:
-                print(f"  [DEBUG] Loading PathsCache from {cache_file}...")
-                with gzip.open(cache_file, 'rb') as f:
-                    cached_data = pickle.load(f)
-                
-                # Reconstruct PathsCache from cached data
-                instance = cls.__new__(cls)
-                instance.game = game
-                instance.junction_index_converter = cached_data['junction_index_converter']
-                instance.nodes = cached_data['nodes']
-                instance.junctions = cached_data['junctions']
-                
-                print(f"  [DEBUG] PathsCache loaded successfully from cache.")
-                return instance
-            except Exception as e:
-                print(f"  [WARNING] Failed to load cache: {e}. Rebuilding...")
-        
-        # Build new cache
-        print(f"  [DEBUG] Building new PathsCache...")
-        instance = cls(game)
-        
-        # Save to cache
+                instance.save(cache_file)
+                print(f"  [DEBUG] PathsCache saved to {cache_file}")
+                return cls.load(cache_file)
+            except (OSError, ValueError, struct.error) as e:
+                print(f"  [WARNING] Failed to save cache: {e}")
+            return instance
+        finally:
+            lock.release()
+
+    @classmethod
+    def _load_if_present(cls, cache_file: str) -> Optional['PathsCache']:
+        if not os.path.exists(cache_file):
+            return None
         try:
-            cached_data = {
-                'junction_index_converter': instance.junction_index_converter,
-                'nodes': instance.nodes,
-                'junctions': instance.junctions
-            }
-            with gzip.open(cache_file, 'wb') as f:
-                pickle.dump(cached_data, f, protocol=pickle.HIGHEST_PROTOCOL)
-            print(f"  [DEBUG] PathsCache saved to {cache_file}")
-        except Exception as e:
-            print(f"  [WARNING] Failed to save cache: {e}")
-        
+            print(f"  [DEBUG] Loading PathsCache from {cache_file}...")
+            instance = cls.load(cache_file)
+            print(f"  [DEBUG] PathsCache loaded successfully from cache.")
+            return instance
+        except (OSError, ValueError, struct.error) as e:
+            print(f"  [WARNING] Failed to load cache: {e}. Rebuilding...")
+            return None
+
+    def save(self, path: str):
+        """
+        Writes the cache in the flat binary format, via a temporary file and a
+        rename so readers never see a partial file.
+
+        :param path: The destination file.
+        """
+        data = self._encode()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'PathsCache':
+        """
+        Memory-maps a cache written by save(). Nodes and junctions are turned
+        into DNode and Junction objects on first access, and their paths are
+        views into the mapping.
+
+        :param path: The file to map.
+        :return: A PathsCache instance.
+        :raises ValueError: If the file is not a cache of the current version.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, node_count, junction_count, corridor_count, pool_size = PATHS_HEADER.unpack_from(mapped, 0)
+        sizes = [junction_count, node_count, node_count + 1, corridor_count * CORRIDOR_FIELDS,
+                 junction_count * junction_count * len(MOVES) * 2, pool_size]
+        if magic != PATHS_MAGIC or version != CACHE_VERSION:
+            mapped.close()
+            raise ValueError(f"{path} is not a version {CACHE_VERSION} paths cache")
+        if len(mapped) != PATHS_HEADER.size + 4 * sum(sizes):
+            mapped.close()
+            raise ValueError(f"{path} is truncated")
+        if sys.byteorder != "little":
+            ints = array('i', mapped[PATHS_HEADER.size:])
+            ints.byteswap()
+            mapped.close()
+            ints = memoryview(ints)
+        else:
+            ints = memoryview(mapped)[PATHS_HEADER.size:].cast('i')
+        sections = []
+        offset = 0
+        for size in sizes:
+            sections.append(ints[offset:offset + size])
+            offset += size
+        flat = _FlatPaths(*sections)
+
+        instance = cls.__new__(cls)
+        instance.junction_index_converter = {node: i for i, node in enumerate(flat.junction_nodes)}
+        instance.nodes = _LazySequence(node_count, flat.node)
+        instance.junctions = _LazySequence(junction_count, flat.junction)
         return instance
+
+    def _encode(self) -> bytes:
+        pool = array('i')
+        pool_offsets: Dict[int, int] = {}
+
+        def add(path: Sequence[int]) -> int:
+            # Shared path objects (e.g. the NEUTRAL entry) are stored once.
+            offset = pool_offsets.get(id(path))
+            if offset is None:
+                offset = len(pool)
+                pool.extend(path)
+                pool_offsets[id(path)] = offset
+            return offset
+
+        junction_nodes = array('i', [junction.node_id for junction in self.junctions])
+        node_flags = array('i', [1 if node.is_junction else 0 for node in self.nodes])
+        node_corridors = array('i', [0])
+        corridors = array('i')
+        for node in self.nodes:
+            for jd in node.closest_junctions:
+                corridors.extend((jd.node_id, MOVE_CODES[jd.first_move], jd.node_started_from,
+                                  MOVE_CODES[jd.last_move], add(jd.path), add(jd.reverse_path), len(jd.path)))
+            node_corridors.append(len(corridors) // CORRIDOR_FIELDS)
+        junction_paths = array('i')
+        for junction in self.junctions:
+            for paths in junction.paths:
+                for move in MOVES:
+                    path = paths.get(move)
+                    if path is None:
+                        junction_paths.extend((_UNSET, _UNSET))
+                    else:
+                        junction_paths.extend((add(path), len(path)))
+
+        sections = [junction_nodes, node_flags, node_corridors, corridors, junction_paths, pool]
+        if sys.byteorder != "little":
+            for section in sections:
+                section.byteswap()
+        header = PATHS_HEADER.pack(PATHS_MAGIC, CACHE_VERSION, len(self.nodes), len(self.junctions),
+                                   len(corridors) // CORRIDOR_FIELDS, len(pool))
+        return header + b"".join(section.tobytes() for section in sections)
     
     @staticmethod
     def _generate_cache_key(maze) -> str:
@@ -220,24 +364,26 @@ class PathsCache:
         return hashlib.md5(key_string.encode()).hexdigest()
 
 
-    def get_path_from_a2b(self, a: int, b: int) -> List[int]:
+    def get_path_from_a2b(self, a: int, b: int) -> PathView:
         if a == b:
-            return []
+            return EMPTY_PATH
         closest_from_junctions = self.nodes[a].closest_junctions
         for jd in closest_from_junctions:
-            if b in jd.path:
-                idx = jd.path.index(b)
-                return jd.path[:idx + 1]
+            offset = jd.offsets.get(b)
+            if offset is not None:
+                return PathView((jd.path, 0, offset + 1))
         closest_to_junctions = self.nodes[b].closest_junctions
+        converter = self.junction_index_converter
+        to_ids = [converter[to_jd.node_id] for to_jd in closest_to_junctions]
         min_from = -1
         min_to = -1
         min_distance = float('inf')
         shortest_path = None
         for i, from_jd in enumerate(closest_from_junctions):
+            paths_from = self.junctions[converter[from_jd.node_id]].paths
             for j, to_jd in enumerate(closest_to_junctions):
                 distance = len(from_jd.path)
-                tmp_path = self.junctions[self.junction_index_converter[from_jd.node_id]
-                                          ].paths[self.junction_index_converter[to_jd.node_id]][MOVE.NEUTRAL]
+                tmp_path = paths_from[to_ids[j]][MOVE.NEUTRAL]
                 distance += len(tmp_path)
                 distance += len(to_jd.path)
                 if distance < min_distance:
@@ -245,18 +391,18 @@ class PathsCache:
                     min_from = i
                     min_to = j
                     shortest_path = tmp_path
-        return self._concat(closest_from_junctions[min_from].path, shortest_path, closest_to_junctions[min_to].reverse_path)
+        return PathView.of(closest_from_junctions[min_from].path, shortest_path, closest_to_junctions[min_to].reverse_path)
 
     def get_path_distance_from_a2b(self, a: int, b: int, last_move_made: MOVE) -> int:
-        return len(self.get_path_from_a2b(a, b, last_move_made))
+        return len(self.get_path_from_a2b_ghost(a, b, last_move_made))
 
-    def get_path_from_a2b_ghost(self, a: int, b: int, last_move_made: MOVE) -> List[int]:
+    def get_path_from_a2b_ghost(self, a: int, b: int, last_move_made: MOVE) -> PathView:
         if a == b:
-            return []
+            return EMPTY_PATH
         from_junction = self.nodes[a].get_nearest_junction(last_move_made)
-        for i in range(len(from_junction.path)):
-            if from_junction.path[i] == b:
-                return from_junction.path[:i + 1]
+        offset = from_junction.offsets.get(b)
+        if offset is not None:
+            return PathView((from_junction.path, 0, offset + 1))
         junction_from = from_junction.node_id
         junction_from_id = self.junction_index_converter[junction_from]
         move_entered_junction = from_junction.last_move if from_junction.last_move != MOVE.NEUTRAL else last_move_made
@@ -264,63 +410,253 @@ class PathsCache:
         min_dist = float('inf')
         min_jct = -1
         shortest_path = None
+        paths_from = self.junctions[junction_from_id].paths
         for i, to_jd in enumerate(junctions_to):
-            tmp_path = self.junctions[junction_from_id].paths[self.junction_index_converter[to_jd.node_id]
-                                                              ][move_entered_junction]
+            tmp_path = paths_from[self.junction_index_converter[to_jd.node_id]][move_entered_junction]
             distance = len(tmp_path) + len(to_jd.path)
             if distance < min_dist:
                 min_dist = distance
                 min_jct = i
                 shortest_path = tmp_path
-        return self._concat(from_junction.path, shortest_path, junctions_to[min_jct].reverse_path)
+        return PathView.of(from_junction.path, shortest_path, junctions_to[min_jct].reverse_path)
 
-    def _assign_junctions_to_nodes(self, game: 'Game') -> List[DNode]:
-        from pacman.game.game import Game
-
-        all_nodes = [DNode(i, game.is_junction(i))
-                     for i in range(game.get_number_of_nodes())]
+    def _assign_junctions_to_nodes(self, maze: 'Maze') -> List[DNode]:
+        graph = maze.graph
+        all_nodes = [DNode(i, graph[i].num_neighbouring_nodes > 2)
+                     for i in range(len(graph))]
         for i in range(len(all_nodes)):
             if not all_nodes[i].is_junction:
-                possible_moves = game.get_possible_moves(i)
+                possible_moves = graph[i].all_possible_moves[MOVE.NEUTRAL]
                 for j, move in enumerate(possible_moves):
                     path = []
-                    current_node = game.get_neighbour(i, move)
+                    current_node = graph[i].neighbourhood[move]
                     last_move = move
                     path.append(current_node)
-                    while not game.is_junction(current_node):
-                        new_possible_moves = game.get_possible_moves(
-                            current_node)
+                    while not graph[current_node].num_neighbouring_nodes > 2:
+                        new_possible_moves = graph[current_node].all_possible_moves[MOVE.NEUTRAL]
                         for q in range(len(new_possible_moves)):
                             if new_possible_moves[q].opposite() != last_move:
                                 last_move = new_possible_moves[q]
                                 break
-                        current_node = game.get_neighbour(
-                            current_node, last_move)
+                        current_node = graph[current_node].neighbourhood[last_move]
                         path.append(current_node)
                     all_nodes[i].add_path(
                         path[-1], possible_moves[j], i, path, last_move)
         return all_nodes
 
-    def _junction_distances(self, game: 'Game') -> List[Junction]:
-        from pacman.game.game import Game
+    def _junction_distances(self, maze: 'Maze') -> List[Junction]:
+        jct_indices = maze.junction_indices
+        astar = HeapAStar()
+        astar.create_graph(maze.graph)
 
-        junctions = [Junction(i, game.get_junction_indices()[
-                              i], game.get_number_of_junctions()) for i in range(game.get_number_of_junctions())]
+        junctions = [Junction(i, jct_indices[i], len(jct_indices))
+                     for i in range(len(jct_indices))]
         for i in range(len(junctions)):
+            # One search from each junction yields the same routes to all later
+            # junctions as a separate search per pair would.
+            tree = astar.compute_path_tree(jct_indices[i], MOVE.NEUTRAL)
             for j in range(i + 1, len(junctions)):
-                path = game.get_shortest_path(game.get_junction_indices()[
-                                              i], game.get_junction_indices()[j])
-                first_move = game.get_move_to_make_to_reach_direct_neighbour(
-                    game.get_junction_indices()[i], path[0]) if len(path) > 0 else MOVE.NEUTRAL
+                # The route starts with the junction itself; paths in the
+                # cache exclude their start node and include their end node.
+                route = astar.route_from_tree(tree, jct_indices[j])
+                path = route[1:]
+                first_move = self._move_to_neighbour(
+                    maze, jct_indices[i], path[0]) if len(path) > 0 else MOVE.NEUTRAL
                 junctions[i].add_path(j, first_move, path)
-                reverse_path = path[::-1]
-                first_move_reverse = game.get_move_to_make_to_reach_direct_neighbour(
-                    game.get_junction_indices()[j], reverse_path[0]) if len(reverse_path) > 0 else MOVE.NEUTRAL
+                reverse_path = route[:-1][::-1]
+                first_move_reverse = self._move_to_neighbour(
+                    maze, jct_indices[j], reverse_path[0]) if len(reverse_path) > 0 else MOVE.NEUTRAL
                 junctions[j].add_path(i, first_move_reverse, reverse_path)
         return junctions
 
-    def _concat(self, *arrays: List[int]) -> List[int]:
-        full_array = []
-        for arr in arrays:
-            full_array.extend(arr)
-        return full_array
+    @staticmethod
+    def _move_to_neighbour(maze: 'Maze', node_index: int, neighbour_index: int) -> Optional[MOVE]:
+        for move, neighbour in maze.graph[node_index].neighbourhood.items():
+            if neighbour == neighbour_index:
+                return move
+        return None
+
+
+class PathsCacheSet:
+    """
+    One PathsCache per maze index. A cache is loaded (or built) the first time
+    its maze is entered, or earlier in the background via prefetch(), and is
+    then shared by every Game in the process.
+    """
+
+    def __init__(self, mazes: MazeRegistry, cache_dir: str = ".cache/paths"):
+        self.mazes = mazes
+        self.cache_dir = cache_dir
+        self._caches: List[Optional[PathsCache]] = [None] * len(mazes)
+        self._loaders: Dict[int, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, index: int) -> PathsCache:
+        cache = self._caches[index]
+        if cache is None:
+            loader = self.prefetch(index)
+            if loader is not None:
+                loader.join()
+            cache = self._caches[index]
+            if cache is None:
+                # The background load failed; load here so the error surfaces.
+                cache = PathsCache.load_or_build(self.mazes[index], self.cache_dir)
+                self._caches[index] = cache
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._caches)
+
+    def prefetch(self, index: int) -> Optional[threading.Thread]:
+        """
+        Starts loading the cache of a maze in a background thread, unless it is
+        already loaded or loading.
+
+        :param index: The maze index.
+        :return: The thread loading the cache, or None if it is already loaded.
+        """
+        if self._caches[index] is not None:
+            return None
+        with self._lock:
+            if self._caches[index] is not None:
+                return None
+            loader = self._loaders.get(index)
+            if loader is None:
+                loader = threading.Thread(target=self._load, args=(index,), daemon=True)
+                self._loaders[index] = loader
+                loader.start()
+            return loader
+
+    def is_loaded(self, index: int) -> bool:
+        """
+        :param index: The maze index.
+        :return: Whether the cache for the maze is ready to use.
+        """
+        return self._caches[index] is not None
+
+    def _load(self, index: int):
+        try:
+            self._caches[index] = PathsCache.load_or_build(self.mazes[index], self.cache_dir)
+        finally:
+            with self._lock:
+                del self._loaders[index]
+
+
+T = TypeVar('T')
+
+
+class _LazySequence(Generic[T]):
+    """
+    A fixed-length sequence whose items are created on first access and then
+    kept. Two threads racing on the same item may each create one; either is
+    equivalent.
+    """
+
+    def __init__(self, length: int, factory: Callable[[int], T]):
+        self._items: List[Optional[T]] = [None] * length
+        self._factory = factory
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __getitem__(self, index: int) -> T:
+        item = self._items[index]
+        if item is None:
+            item = self._factory(index if index >= 0 else index + len(self._items))
+            self._items[index] = item
+        return item
+
+    def __iter__(self):
+        for index in range(len(self._items)):
+            yield self[index]
+
+
+class _FlatPaths:
+    """
+    The sections of a mapped cache file, and the factories that turn them
+    into DNode and Junction objects.
+    """
+
+    def __init__(self, junction_nodes, node_flags, node_corridors, corridors, junction_paths, pool):
+        # The index sections are small and read field by field, so they are
+        # copied into lists; only the path pool stays in the mapping.
+        self.junction_nodes = junction_nodes.tolist()
+        self.node_flags = node_flags.tolist()
+        self.node_corridors = node_corridors.tolist()
+        self.corridors = corridors.tolist()
+        self.junction_paths = junction_paths.tolist()
+        self.pool = pool
+
+    def node(self, index: int) -> DNode:
+        node = DNode.__new__(DNode)
+        node.node_id = index
+        node.is_junction = self.node_flags[index] == 1
+        node.closest_junctions = [self._corridor(c) for c in range(self.node_corridors[index],
+                                                                    self.node_corridors[index + 1])]
+        return node
+
+    def junction(self, index: int) -> Junction:
+        junction_count = len(self.junction_nodes)
+        junction = Junction.__new__(Junction)
+        junction.jct_id = index
+        junction.node_id = self.junction_nodes[index]
+        base = index * junction_count
+        junction.paths = _LazySequence(junction_count, lambda j: self._junction_paths(base + j))
+        return junction
+
+    def _junction_paths(self, pair: int) -> Dict[MOVE, Sequence[int]]:
+        moves = len(MOVES)
+        entries = self.junction_paths[pair * moves * 2:(pair + 1) * moves * 2]
+        pool = self.pool
+        paths = defaultdict(list)
+        for code in range(moves):
+            offset, length = entries[2 * code], entries[2 * code + 1]
+            if length != _UNSET:
+                paths[MOVES[code]] = pool[offset:offset + length]
+        return paths
+
+    def _corridor(self, index: int) -> JunctionData:
+        junction_node, first_move, started_from, last_move, path_offset, reverse_offset, length = \
+            self.corridors[index * CORRIDOR_FIELDS:(index + 1) * CORRIDOR_FIELDS]
+        jd = JunctionData.__new__(JunctionData)
+        jd.node_id = junction_node
+        jd.node_started_from = started_from
+        jd.first_move = MOVES[first_move]
+        jd.last_move = MOVES[last_move]
+        jd.path = self.pool[path_offset:path_offset + length]
+        jd.reverse_path = self.pool[reverse_offset:reverse_offset + length]
+        jd._offsets = None
+        return jd
+
+
+def _build_one(index: int, cache_dir: str) -> str:
+    PathsCache.load_or_build(MAZES[index], cache_dir)
+    return MAZES[index].name
+
+
+def build_all(indices: Optional[List[int]] = None, cache_dir: str = ".cache/paths",
+              processes: Optional[int] = None):
+    """
+    Builds (or verifies) the on-disk path caches of several mazes in parallel,
+    one maze per worker process. Mazes whose cache already exists are only
+    loaded.
+
+    :param indices: The maze indices to build; None builds every maze.
+    :param cache_dir: Directory to store cache files.
+    :param processes: The number of worker processes; None uses one per maze (up to the CPU count).
+    """
+    if indices is None:
+        indices = list(range(len(MAZES)))
+    if processes is None:
+        processes = min(len(indices), os.cpu_count() or 1)
+    if processes <= 1:
+        for index in indices:
+            _build_one(index, cache_dir)
+        return
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for name in pool.map(_build_one, indices, [cache_dir] * len(indices)):
+            print(f"  [DEBUG] PathsCache ready for maze {name}")
+
+
+# The shared per-maze caches used by all games in this process.
+PATHS_CACHES = PathsCacheSet(MAZES)
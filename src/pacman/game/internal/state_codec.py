@@ -0,0 +1,142 @@
+# pacman/game/internal/state_codec.py
+
+import struct
+from typing import List, TYPE_CHECKING
+
+from pacman.game.constants import GHOST
+from pacman.game.internal.maze import MAZES
+
+if TYPE_CHECKING:
+    from pacman.game.fast_game import FastGame
+
+# Binary game state: a fixed little-endian struct followed by the pill and
+# power pill bitmaps (bit i of the bitmap = pill i still available), each
+# padded to whole bytes. The bitmap sizes follow from the maze index, so a
+# record's length is known once its first two bytes are read.
+#
+#   version, maze index, level count, total time, level time, score,
+#   ghost eat multiplier, time of last global reversal,
+#   Pac-Man node, last move, lives,
+#   4 x (ghost node, edible time, lair time, last move) in GHOST order,
+#   flags (see the _FLAG_* bits)
+#
+# Unlike the text format, the record also holds the ghost eat multiplier
+# and the game-over flag, so decoding restores the state completely.
+STATE_VERSION = 1
+STATE_STRUCT = struct.Struct("<BBHIHiIiHBB" + "HHHB" * len(GHOST) + "H")
+
+GHOSTS = tuple(GHOST)
+_FLAG_PACMAN_WAS_EATEN = 1 << 0
+_FLAG_PILL_WAS_EATEN = 1 << 1
+_FLAG_POWER_PILL_WAS_EATEN = 1 << 2
+_FLAG_EXTRA_LIFE = 1 << 3
+_FLAG_GAME_OVER = 1 << 4
+_FLAG_GHOST_EATEN = 1 << 5  # one bit per ghost from here, in GHOST order
+
+
+def bitmap_sizes(pill_count: int, power_pill_count: int):
+    """
+    :return: The bytes taken by the pill and power pill bitmaps.
+    """
+    return (pill_count + 7) // 8, (power_pill_count + 7) // 8
+
+
+def record_size(data, offset: int = 0) -> int:
+    """
+    :param data: A buffer holding a record.
+    :param offset: Where the record starts in the buffer.
+    :return: The length of the record in bytes.
+    """
+    maze = MAZES[data[offset + 1]]
+    pill_bytes, power_pill_bytes = bitmap_sizes(len(maze.pill_indices), len(maze.power_pill_indices))
+    return STATE_STRUCT.size + pill_bytes + power_pill_bytes
+
+
+def split_records(data) -> List[bytes]:
+    """
+    :param data: Records written back to back.
+    :return: The individual records.
+    """
+    records = []
+    offset = 0
+    while offset < len(data):
+        end = offset + record_size(data, offset)
+        records.append(bytes(data[offset:end]))
+        offset = end
+    return records
+
+
+def encode(game: 'FastGame') -> bytes:
+    """
+    :param game: The game.
+    :return: Its state as one binary record.
+    """
+    flags = (
+        (_FLAG_PACMAN_WAS_EATEN if game.pacman_was_eaten else 0)
+        | (_FLAG_PILL_WAS_EATEN if game.pill_was_eaten else 0)
+        | (_FLAG_POWER_PILL_WAS_EATEN if game.power_pill_was_eaten else 0)
+        | (_FLAG_EXTRA_LIFE if game.has_received_extra_life else 0)
+        | (_FLAG_GAME_OVER if game.game_over_flag else 0)
+    )
+    ghost_values = []
+    for i in range(len(GHOSTS)):
+        ghost_values += (game.ghost_nodes[i], game.ghost_edible_times[i], game.ghost_lair_times[i], game.ghost_moves[i])
+        if game.ghosts_eaten[i]:
+            flags |= _FLAG_GHOST_EATEN << i
+    maze = game.current_maze
+    pill_bytes, power_pill_bytes = bitmap_sizes(len(maze.pill_indices), len(maze.power_pill_indices))
+    return STATE_STRUCT.pack(
+        STATE_VERSION, game.maze_index, game.level_count, game.total_time, game.current_level_time, game.score,
+        game.ghost_eat_multiplier, game.time_of_last_global_reversal,
+        game.pacman_node, game.pacman_move, game.lives,
+        *ghost_values, flags
+    ) + game.pills.to_bytes(pill_bytes, "little") + game.power_pills.to_bytes(power_pill_bytes, "little")
+
+
+def decode_into(game: 'FastGame', data, offset: int = 0) -> int:
+    """
+    Puts a game into the state of a binary record.
+
+    :param game: The game to update.
+    :param data: A buffer holding the record.
+    :param offset: Where the record starts in the buffer.
+    :return: The offset just past the record.
+    """
+    values = STATE_STRUCT.unpack_from(data, offset)
+    if values[0] != STATE_VERSION:
+        raise ValueError(f"Unsupported game state version {values[0]}")
+    (_, maze_index, level_count, total_time, current_level_time, score, ghost_eat_multiplier,
+     time_of_last_global_reversal, pacman_node, pacman_move, lives) = values[:11]
+    flags = values[-1]
+
+    game._set_maze(maze_index)
+    game.level_count = level_count
+    game.total_time = total_time
+    game.current_level_time = current_level_time
+    game.score = score
+    game.ghost_eat_multiplier = ghost_eat_multiplier
+    game.time_of_last_global_reversal = time_of_last_global_reversal
+    game.pacman_was_eaten = bool(flags & _FLAG_PACMAN_WAS_EATEN)
+    game.pill_was_eaten = bool(flags & _FLAG_PILL_WAS_EATEN)
+    game.power_pill_was_eaten = bool(flags & _FLAG_POWER_PILL_WAS_EATEN)
+    game.game_over_flag = bool(flags & _FLAG_GAME_OVER)
+
+    game.pacman_node = pacman_node
+    game.pacman_move = pacman_move
+    game.lives = lives
+    game.has_received_extra_life = bool(flags & _FLAG_EXTRA_LIFE)
+
+    ghosts = range(len(GHOSTS))
+    game.ghost_nodes = [values[11 + 4 * i] for i in ghosts]
+    game.ghost_edible_times = [values[12 + 4 * i] for i in ghosts]
+    game.ghost_lair_times = [values[13 + 4 * i] for i in ghosts]
+    game.ghost_moves = [values[14 + 4 * i] for i in ghosts]
+    game.ghosts_eaten = [bool(flags & (_FLAG_GHOST_EATEN << i)) for i in ghosts]
+
+    maze = game.current_maze
+    pill_bytes, power_pill_bytes = bitmap_sizes(len(maze.pill_indices), len(maze.power_pill_indices))
+    offset += STATE_STRUCT.size
+    game.pills = int.from_bytes(data[offset:offset + pill_bytes], "little")
+    offset += pill_bytes
+    game.power_pills = int.from_bytes(data[offset:offset + power_pill_bytes], "little")
+    return offset + power_pill_bytes
@@ -0,0 +1,93 @@
+# pacman/game/internal/zobrist.py
+
+from random import Random
+from typing import TYPE_CHECKING
+
+from pacman.game.constants import GHOST, LEVEL_RESET_REDUCTION
+from pacman.game.internal import bitset
+from pacman.game.internal.next_moves import MOVE_CODES
+
+if TYPE_CHECKING:
+    from pacman.game.game import Game
+
+# Zobrist hashing: every (feature, value) pair gets a fixed random 64-bit key
+# and a state hashes to the XOR of the keys of its features. Changing one
+# feature changes the hash by XOR-ing its old and new key, so the pill part
+# (hundreds of features) is kept up to date from the pills that changed.
+#
+# The hash covers what is on the board: the maze, the level count modulo
+# LEVEL_RESET_REDUCTION (it sets the edible and lair times), the pills,
+# Pac-Man (node, last move, lives, extra life), every ghost (node, last move,
+# edible and lair time), the ghost eat multiplier and the game-over flag. The
+# score and the clocks are left out, so transpositions reached along
+# different move orders share a hash.
+
+MAX_NODES = 2048
+MAX_PILLS = 256
+MAX_POWER_PILLS = 16
+TIMER_VALUES = 256  # edible and lair times are hashed modulo this
+LIFE_VALUES = 16
+MULTIPLIER_VALUES = 16  # keyed by bit length; the multiplier is a power of two
+
+_rnd = Random(0x5A0B_5157)
+
+
+def _keys(count: int):
+    return tuple(_rnd.getrandbits(64) for _ in range(count))
+
+
+_AGENTS = 1 + len(GHOST)  # Pac-Man, then the ghosts in GHOST order
+NODE_KEYS = _keys(_AGENTS * MAX_NODES)
+MOVE_KEYS = _keys(_AGENTS * len(MOVE_CODES))
+EDIBLE_KEYS = _keys(len(GHOST) * TIMER_VALUES)
+LAIR_KEYS = _keys(len(GHOST) * TIMER_VALUES)
+PILL_KEYS = _keys(MAX_PILLS)
+POWER_PILL_KEYS = _keys(MAX_POWER_PILLS)
+MAZE_KEYS = _keys(16)
+LIFE_KEYS = _keys(LIFE_VALUES)
+MULTIPLIER_KEYS = _keys(MULTIPLIER_VALUES)
+EXTRA_LIFE_KEY, GAME_OVER_KEY = _keys(2)
+LEVEL_KEYS = _keys(LEVEL_RESET_REDUCTION)
+
+del _rnd
+
+
+def pills_hash(pills: int, power_pills: int) -> int:
+    """
+    :param pills: A pill bitset.
+    :param power_pills: A power pill bitset.
+    :return: The XOR of the keys of the pills in the sets. The function is
+        linear, so pills_hash(a ^ b, ...) turns the hash of a into that of b.
+    """
+    value = 0
+    for i in bitset.indices(pills):
+        value ^= PILL_KEYS[i]
+    for i in bitset.indices(power_pills):
+        value ^= POWER_PILL_KEYS[i]
+    return value
+
+
+def agents_hash(game: 'Game') -> int:
+    """
+    :param game: The game.
+    :return: The hash of everything but the pills.
+    """
+    moves = len(MOVE_CODES)
+    value = (MAZE_KEYS[game.maze_index]
+             ^ LEVEL_KEYS[game.level_count % LEVEL_RESET_REDUCTION]
+             ^ NODE_KEYS[game.pacman_node]
+             ^ MOVE_KEYS[game.pacman_move]
+             ^ LIFE_KEYS[game.lives % LIFE_VALUES]
+             ^ MULTIPLIER_KEYS[game.ghost_eat_multiplier.bit_length() % MULTIPLIER_VALUES])
+    if game.has_received_extra_life:
+        value ^= EXTRA_LIFE_KEY
+    if game.game_over_flag:
+        value ^= GAME_OVER_KEY
+    for i in range(len(GHOST)):
+        agent = i + 1
+        timer = i * TIMER_VALUES
+        value ^= (NODE_KEYS[agent * MAX_NODES + game.ghost_nodes[i]]
+                  ^ MOVE_KEYS[agent * moves + game.ghost_moves[i]]
+                  ^ EDIBLE_KEYS[timer + game.ghost_edible_times[i] % TIMER_VALUES]
+                  ^ LAIR_KEYS[timer + game.ghost_lair_times[i] % TIMER_VALUES])
+    return value
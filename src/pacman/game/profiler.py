@@ -0,0 +1,127 @@
+# pacman/game/profiler.py
+
+import csv
+import json
+from time import perf_counter_ns
+from typing import Dict
+
+from pacman.game.game import Game
+
+# The engine phases that are timed, outermost first. Timings are inclusive:
+# advance_game covers the whole tick, update_ghosts covers the three ghost
+# phases, and update_game covers _feast through _check_level_state.
+PHASES = (
+    'advance_game',
+    'update_pacman',
+    'update_ghosts',
+    '_complete_ghost_moves',
+    '_reverse_ghosts',
+    '_update_ghosts',
+    'update_game',
+    '_feast',
+    '_update_lair_times',
+    '_update_pacman_extra_life',
+    '_check_level_state',
+)
+
+
+def _timed(phase: str):
+    method = getattr(Game, phase)
+
+    def timed(self, *args, **kwargs):
+        start = perf_counter_ns()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            self._profiler.record(phase, perf_counter_ns() - start)
+
+    timed.__name__ = phase
+    timed.__doc__ = method.__doc__
+    return timed
+
+
+class ProfiledGame(Game):
+    """
+    A Game whose engine phases report to a PhaseProfiler. Games are switched
+    to this class by PhaseProfiler.attach and back by detach, so an
+    unprofiled Game runs the plain methods with no instrumentation at all.
+    Copies and snapshots are plain Games and are not profiled.
+    """
+
+
+for _phase in PHASES:
+    setattr(ProfiledGame, _phase, _timed(_phase))
+del _phase
+
+
+class PhaseProfiler:
+    """
+    Per-phase call counts and cumulative perf_counter_ns() timings of the
+    games it is attached to.
+    """
+
+    def __init__(self):
+        self.calls: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.nanoseconds: Dict[str, int] = {phase: 0 for phase in PHASES}
+
+    def attach(self, game: Game) -> Game:
+        """
+        Starts profiling a game, which keeps its state and stays a Game.
+
+        :param game: The game.
+        :return: The same game.
+        """
+        game._profiler = self
+        game.__class__ = ProfiledGame
+        return game
+
+    @staticmethod
+    def detach(game: Game):
+        """
+        Stops profiling a game.
+
+        :param game: The game.
+        """
+        game.__class__ = Game
+        game.__dict__.pop('_profiler', None)
+
+    def record(self, phase: str, nanoseconds: int):
+        """
+        :param phase: The phase that ran.
+        :param nanoseconds: How long it took.
+        """
+        self.calls[phase] += 1
+        self.nanoseconds[phase] += nanoseconds
+
+    def rows(self):
+        """
+        :return: One dict per phase: phase, calls, total_ns, mean_ns.
+        """
+        return [{
+            'phase': phase,
+            'calls': self.calls[phase],
+            'total_ns': self.nanoseconds[phase],
+            'mean_ns': self.nanoseconds[phase] / self.calls[phase] if self.calls[phase] else 0.0,
+        } for phase in PHASES]
+
+    def save(self, file_name: str):
+        """
+        Writes the timings as CSV if the file name ends with ".csv", as JSON otherwise.
+
+        :param file_name: The file name.
+        """
+        rows = self.rows()
+        with open(file_name, 'w', newline='') as f:
+            if file_name.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+            else:
+                json.dump(rows, f, indent=2)
+
+    def __str__(self) -> str:
+        lines = [f"{'phase':28s} {'calls':>9s} {'total ms':>10s} {'mean us':>9s}"]
+        for row in self.rows():
+            lines.append(f"{row['phase']:28s} {row['calls']:9d} {row['total_ns'] / 1e6:10.1f} "
+                         f"{row['mean_ns'] / 1e3:9.2f}")
+        return "\n".join(lines)
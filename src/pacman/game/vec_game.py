@@ -0,0 +1,353 @@
+# pacman/game/vec_game.py
+
+from random import Random
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+from pacman.game.constants import PILL, POWER_PILL, GHOST_EAT_SCORE, LEVEL_RESET_REDUCTION, LEVEL_LIMIT, \
+    GHOST_REVERSAL, MAX_TIME, AWARD_LIFE_LEFT, EXTRA_LIFE_SCORE, EAT_DISTANCE, NUM_MAZES, NUM_LIVES, GHOST_SPEED_REDUCTION
+from pacman.game.fast_game import GHOSTS, LEFT, NUM_MOVE_CODES, OPPOSITE_CODES, EDIBLE_TIMES, EATEN_LAIR_TIMES, \
+    INITIAL_LAIR_TIMES, maze_tables
+from pacman.game.internal import counter_random
+from pacman.game.internal.next_moves import MOVES, NEUTRAL_CODE
+
+NUM_GHOSTS = len(GHOSTS)
+_OPPOSITES = np.array(OPPOSITE_CODES, dtype=np.int8)
+# The level-dependent timers, shared with the scalar rules in FastGame.
+_EDIBLE_TIMES = np.array(EDIBLE_TIMES)
+_EATEN_LAIR_TIMES = np.array(EATEN_LAIR_TIMES)
+_INITIAL_LAIR_TIMES = np.array(INITIAL_LAIR_TIMES)
+
+class VecMazes:
+    """
+    Every maze stacked into padded NumPy arrays, so that games on different
+    mazes can be stepped together.
+    """
+
+    def __init__(self):
+        tables = [maze_tables(index) for index in range(NUM_MAZES)]
+        nodes = max(len(t.pill_of_node) for t in tables)
+        self.tables = tables
+        self.neighbours = np.full((NUM_MAZES, nodes, NUM_MOVE_CODES), -1, dtype=np.int32)
+        self.pill_of_node = np.full((NUM_MAZES, nodes), -1, dtype=np.int32)
+        self.power_pill_of_node = np.full((NUM_MAZES, nodes), -1, dtype=np.int32)
+        self.distances = np.full((NUM_MAZES, max(len(t.distances) for t in tables)), -1, dtype=np.int16)
+        for index, t in enumerate(tables):
+            size = len(t.pill_of_node)
+            self.neighbours[index, :size] = np.asarray(t.neighbours, dtype=np.int32).reshape(size, NUM_MOVE_CODES)
+            self.pill_of_node[index, :size] = t.pill_of_node
+            self.power_pill_of_node[index, :size] = t.power_pill_of_node
+            self.distances[index, :len(t.distances)] = np.asarray(t.distances, dtype=np.int16)
+        self.pill_counts = np.array([t.pill_count for t in tables])
+        self.power_pill_counts = np.array([t.power_pill_count for t in tables])
+        self.lair_node_indices = np.array([t.lair_node_index for t in tables])
+        self.initial_pacman_node_indices = np.array([t.initial_pacman_node_index for t in tables])
+        self.initial_ghost_node_indices = np.array([t.initial_ghost_node_index for t in tables])
+        # pill_masks[maze] marks the pill slots that exist in that maze.
+        self.pill_masks = np.arange(self.pill_counts.max()) < self.pill_counts[:, None]
+        self.power_pill_masks = np.arange(self.power_pill_counts.max()) < self.power_pill_counts[:, None]
+
+
+_VEC_MAZES: Optional[VecMazes] = None
+
+
+def vec_mazes() -> VecMazes:
+    """
+    :return: The stacked maze arrays (built on first use).
+    """
+    global _VEC_MAZES
+    if _VEC_MAZES is None:
+        _VEC_MAZES = VecMazes()
+    return _VEC_MAZES
+
+
+class VecGame:
+    """
+    N independent games stepped in lockstep. The state of every game is a
+    row of NumPy arrays (ghost state has one column per ghost, in GHOST
+    order) and one step applies the rules of Game.advance_game to all rows
+    at once. Moves are codes into MOVES.
+
+    Each game keeps its own random number generator, drawn from in the
+    same order as Game, so game i follows Game(seeds[i]) exactly. Only the
+    draws themselves (one per game per step, plus the rare random turn of
+    a ghost that cannot keep going) run in Python.
+
+    With auto_reset, games that end are restarted at the end of step() with
+    a new seed drawn from the VecGame's own generator; their final scores
+    are left in final_scores.
+    """
+
+    def __init__(self, seeds: Sequence[int], auto_reset: bool = True, initial_maze: int = 0):
+        """
+        :param seeds: One seed per game.
+        :param auto_reset: Restart games as soon as they are over.
+        :param initial_maze: The maze every game starts in.
+        """
+        self.mazes = vec_mazes()
+        self.num_games = n = len(seeds)
+        self.auto_reset = auto_reset
+        self.initial_maze = initial_maze
+        self.rows = np.arange(n)
+        self.seeds = np.array(seeds, dtype=np.int64)
+        # One CounterRandom stream per game, as (key, counter) columns so draws are vectorised.
+        self.rnd_keys = np.array([counter_random.mix(int(seed)) for seed in seeds], dtype=np.uint64)
+        self.rnd_counters = np.zeros(n, dtype=np.uint64)
+        self.reset_rnd = Random(int(self.seeds.sum()))
+
+        self.maze_index = np.zeros(n, dtype=np.int64)
+        self.level_count = np.zeros(n, dtype=np.int64)
+        self.current_level_time = np.zeros(n, dtype=np.int64)
+        self.total_time = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.ghost_eat_multiplier = np.ones(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self.time_of_last_global_reversal = np.full(n, -1, dtype=np.int64)
+        self.pacman_was_eaten = np.zeros(n, dtype=bool)
+        self.pill_was_eaten = np.zeros(n, dtype=bool)
+        self.power_pill_was_eaten = np.zeros(n, dtype=bool)
+        self.pacman_node = np.zeros(n, dtype=np.int64)
+        self.pacman_move = np.zeros(n, dtype=np.int64)
+        self.lives = np.zeros(n, dtype=np.int64)
+        self.has_received_extra_life = np.zeros(n, dtype=bool)
+        self.ghost_nodes = np.zeros((n, NUM_GHOSTS), dtype=np.int64)
+        self.ghost_edible_times = np.zeros((n, NUM_GHOSTS), dtype=np.int64)
+        self.ghost_lair_times = np.zeros((n, NUM_GHOSTS), dtype=np.int64)
+        self.ghost_moves = np.zeros((n, NUM_GHOSTS), dtype=np.int64)
+        self.ghosts_eaten = np.zeros((n, NUM_GHOSTS), dtype=bool)
+        self.pills = np.zeros((n, self.mazes.pill_masks.shape[1]), dtype=bool)
+        self.power_pills = np.zeros((n, self.mazes.power_pill_masks.shape[1]), dtype=bool)
+        self.final_scores = np.zeros(n, dtype=np.int64)
+        self._reset_games(self.rows)
+
+    def reset(self, index: int, seed: int):
+        """
+        Starts game index again with a new seed.
+
+        :param index: The game to restart.
+        :param seed: Its new seed.
+        """
+        self.seeds[index] = seed
+        self.rnd_keys[index] = counter_random.mix(int(seed))
+        self.rnd_counters[index] = 0
+        self._reset_games(np.array([index]))
+
+    def _reset_games(self, rows: np.ndarray):
+        self.maze_index[rows] = self.initial_maze
+        self.level_count[rows] = 0
+        self.current_level_time[rows] = 0
+        self.total_time[rows] = 0
+        self.score[rows] = 0
+        self.game_over[rows] = False
+        self.time_of_last_global_reversal[rows] = -1
+        self.pacman_was_eaten[rows] = False
+        self.pill_was_eaten[rows] = False
+        self.power_pill_was_eaten[rows] = False
+        self.lives[rows] = NUM_LIVES
+        self.has_received_extra_life[rows] = False
+        self.ghosts_eaten[rows] = False
+        self._set_pills(rows)
+        self._level_reset(rows)
+
+    def _set_pills(self, rows: np.ndarray):
+        maze = self.maze_index[rows]
+        self.pills[rows] = self.mazes.pill_masks[maze]
+        self.power_pills[rows] = self.mazes.power_pill_masks[maze]
+
+    def _level_reset(self, rows: np.ndarray):
+        maze = self.maze_index[rows]
+        self.ghost_eat_multiplier[rows] = 1
+        self.ghost_nodes[rows] = self.mazes.lair_node_indices[maze][:, None]
+        self.ghost_edible_times[rows] = 0
+        self.ghost_lair_times[rows] = _INITIAL_LAIR_TIMES[self.level_count[rows] % LEVEL_RESET_REDUCTION]
+        self.ghost_moves[rows] = NEUTRAL_CODE
+        self.pacman_node[rows] = self.mazes.initial_pacman_node_indices[maze]
+        self.pacman_move[rows] = LEFT
+
+    def step(self, pacman_moves: Sequence[int], ghost_moves: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Advances every game by one tick, like Game.advance_game.
+
+        :param pacman_moves: One move code per game.
+        :param ghost_moves: An (N, NUM_GHOSTS) array of move codes (None repeats the ghosts' last moves).
+        :return: (rewards, dones): the score gained this tick and whether the game ended. With auto_reset,
+            games that ended have already been restarted.
+        """
+        mazes = self.mazes
+        neighbours = mazes.neighbours
+        rows = self.rows
+        maze = self.maze_index
+        start_score = self.score.copy()
+
+        # Pac-Man
+        pacman_moves = np.asarray(pacman_moves, dtype=np.int64)
+        node = self.pacman_node
+        wanted = neighbours[maze, node, pacman_moves] != -1
+        keep = neighbours[maze, node, self.pacman_move] != -1
+        move = np.where(wanted, pacman_moves, np.where(keep, self.pacman_move, NEUTRAL_CODE))
+        self.pacman_move = move
+        moving = move != NEUTRAL_CODE
+        node = np.where(moving, neighbours[maze, node, move], node)
+        self.pacman_node = node
+
+        pill = mazes.pill_of_node[maze, node]
+        eaten = pill >= 0
+        eaten[eaten] = self.pills[rows[eaten], pill[eaten]]
+        self.pills[rows[eaten], pill[eaten]] = False
+        self.score += PILL * eaten
+        self.pill_was_eaten = eaten
+
+        power_pill = mazes.power_pill_of_node[maze, node]
+        eaten = power_pill >= 0
+        eaten[eaten] = self.power_pills[rows[eaten], power_pill[eaten]]
+        self.power_pills[rows[eaten], power_pill[eaten]] = False
+        self.score += POWER_PILL * eaten
+        self.ghost_eat_multiplier[eaten] = 1
+        edible_time = _EDIBLE_TIMES[self.level_count[eaten] % LEVEL_RESET_REDUCTION]
+        self.ghost_edible_times[eaten] = np.where(self.ghost_lair_times[eaten] == 0, edible_time[:, None], 0)
+        self.power_pill_was_eaten = eaten
+
+        # Ghosts: a global reversal (or a power pill) reverses them, otherwise they move.
+        global_reverse = (self._draw(self.rows) >> 11).astype(np.float64) * counter_random.FLOAT_SCALE \
+            < GHOST_REVERSAL
+        if ghost_moves is None:
+            ghost_moves = self.ghost_moves
+        ghost_moves = np.asarray(ghost_moves, dtype=np.int64)
+        maze_column = maze[:, None]
+        ghost_nodes = self.ghost_nodes
+        last_moves = self.ghost_moves
+        free = self.ghost_lair_times == 0
+        reverse = ((self.current_level_time > 1) & (self.power_pill_was_eaten | global_reverse))[:, None] \
+            & free & (last_moves != NEUTRAL_CODE)
+        reversed_games = reverse.any(axis=1)
+        if reversed_games.any():
+            last_moves = np.where(reverse, _OPPOSITES[last_moves], last_moves)
+            ghost_nodes = np.where(reverse, neighbours[maze_column, ghost_nodes, last_moves], ghost_nodes)
+            self.time_of_last_global_reversal[reversed_games] = self.total_time[reversed_games]
+
+        edible = self.ghost_edible_times
+        active = ~reversed_games[:, None] & free & ((edible == 0) | (edible % GHOST_SPEED_REDUCTION != 0))
+        wanted = (neighbours[maze_column, ghost_nodes, ghost_moves] != -1) & (ghost_moves != _OPPOSITES[last_moves])
+        keep = neighbours[maze_column, ghost_nodes, last_moves] != -1
+        new_moves = np.where(wanted, ghost_moves, last_moves)
+        for game, ghost in zip(*np.nonzero(active & ~wanted & ~keep)):
+            options = mazes.tables[maze[game]].possible_moves[ghost_nodes[game, ghost] * NUM_MOVE_CODES
+                                                              + last_moves[game, ghost]]
+            draw = counter_random.draw(int(self.rnd_keys[game]), int(self.rnd_counters[game]))
+            self.rnd_counters[game] += 1
+            new_moves[game, ghost] = options[(draw * len(options)) >> 64]  # CounterRandom.randint
+        self.ghost_moves = np.where(active, new_moves, last_moves)
+        self.ghost_nodes = np.where(active, neighbours[maze_column, ghost_nodes, self.ghost_moves], ghost_nodes)
+
+        self._feast()
+
+        lair = self.ghost_lair_times
+        leaving = lair == 1
+        lair -= lair > 0
+        self.ghost_nodes = np.where(leaving, mazes.initial_ghost_node_indices[maze][:, None], self.ghost_nodes)
+
+        extra_life = ~self.has_received_extra_life & (self.score >= EXTRA_LIFE_SCORE)
+        self.has_received_extra_life |= extra_life
+        self.lives += extra_life
+        self.total_time += 1
+        self.current_level_time += 1
+        self._check_level_state()
+
+        rewards = self.score - start_score
+        dones = self.game_over.copy()
+        if self.auto_reset and dones.any():
+            finished = np.nonzero(dones)[0]
+            self.final_scores[finished] = self.score[finished]
+            for index in finished:
+                seed = self.reset_rnd.randrange(2 ** 32)
+                self.seeds[index] = seed
+                self.rnd_keys[index] = counter_random.mix(int(seed))
+                self.rnd_counters[index] = 0
+            self._reset_games(finished)
+        return rewards, dones
+
+    def _draw(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Draws the next number of each given game's stream, like CounterRandom._next.
+
+        :param rows: The games.
+        :return: One uint64 draw per game.
+        """
+        z = self.rnd_keys[rows] + self.rnd_counters[rows] * np.uint64(counter_random.GAMMA)
+        self.rnd_counters[rows] += np.uint64(1)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(counter_random.MIX1)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(counter_random.MIX2)
+        return z ^ (z >> np.uint64(31))
+
+    def _feast(self):
+        maze = self.maze_index
+        pacman = self.pacman_node[:, None]
+        ghosts = self.ghost_nodes
+        high = np.maximum(pacman, ghosts)
+        low = np.minimum(pacman, ghosts)
+        distance = self.mazes.distances[maze[:, None], (high * (high + 1)) // 2 + low]
+        distance = np.where(pacman == ghosts, 0, distance)
+        close = (distance != -1) & (distance <= EAT_DISTANCE)
+        edible = self.ghost_edible_times > 0
+
+        # Ghosts are checked in order and the first inedible one that is close
+        # enough ends the check, so only edible ghosts before it are eaten.
+        killers = close & ~edible
+        killed = killers.any(axis=1)
+        first_killer = np.where(killed, killers.argmax(axis=1), NUM_GHOSTS)
+        eaten = close & edible & (np.arange(NUM_GHOSTS) < first_killer[:, None])
+        self.ghosts_eaten = eaten
+        count = eaten.sum(axis=1)
+        # The multiplier doubles after every ghost: m + 2m + 4m + ... = m * (2^count - 1).
+        self.score += GHOST_EAT_SCORE * self.ghost_eat_multiplier * ((1 << count) - 1)
+        self.ghost_eat_multiplier <<= count
+        if eaten.any():
+            self.ghost_edible_times[eaten] = 0
+            self.ghost_lair_times = np.where(
+                eaten, _EATEN_LAIR_TIMES[self.level_count % LEVEL_RESET_REDUCTION][:, None], self.ghost_lair_times)
+            self.ghost_nodes = np.where(eaten, self.mazes.lair_node_indices[maze][:, None], self.ghost_nodes)
+            self.ghost_moves[eaten] = NEUTRAL_CODE
+
+        self.pacman_was_eaten = killed
+        if killed.any():
+            self.lives -= killed
+            self.game_over |= killed & (self.lives <= 0)
+            self._level_reset(np.nonzero(killed & (self.lives > 0))[0])
+        surviving = ~killed[:, None] & (self.ghost_edible_times > 0)
+        self.ghost_edible_times -= surviving
+
+    def _check_level_state(self):
+        timed_out = self.total_time + 1 > MAX_TIME
+        self.game_over |= timed_out
+        self.score += timed_out * self.lives * AWARD_LIFE_LEFT
+        cleared = ~timed_out & ((~self.pills.any(axis=1) & ~self.power_pills.any(axis=1))
+                                | (self.current_level_time >= LEVEL_LIMIT))
+        if cleared.any():
+            rows = np.nonzero(cleared)[0]
+            self.maze_index[rows] = (self.maze_index[rows] + 1) % NUM_MAZES
+            self.level_count[rows] += 1
+            self.current_level_time[rows] = 0
+            self._set_pills(rows)
+            self._level_reset(rows)
+
+    def get_game_state(self, index: int) -> str:
+        """
+        :param index: The game.
+        :return: Its state in the format of Game.get_game_state().
+        """
+        i = index
+        maze = self.mazes.tables[self.maze_index[i]]
+        sb = [f"{self.maze_index[i]},{self.total_time[i]},{self.score[i]},{self.current_level_time[i]},"
+              f"{self.level_count[i]},{self.pacman_node[i]},{MOVES[self.pacman_move[i]].value},{self.lives[i]},"
+              f"{bool(self.has_received_extra_life[i])},"]
+        for g in range(NUM_GHOSTS):
+            sb.append(f"{self.ghost_nodes[i, g]},{self.ghost_edible_times[i, g]},{self.ghost_lair_times[i, g]},"
+                      f"{MOVES[self.ghost_moves[i, g]].value},")
+        sb.append("".join("1" if p else "0" for p in self.pills[i, :maze.pill_count]) + ",")
+        sb.append("".join("1" if p else "0" for p in self.power_pills[i, :maze.power_pill_count]) + ",")
+        sb.append(f"{self.time_of_last_global_reversal[i]},{bool(self.pacman_was_eaten[i])},")
+        for g in range(NUM_GHOSTS):
+            sb.append(f"{bool(self.ghosts_eaten[i, g])},")
+        sb.append(f"{bool(self.pill_was_eaten[i])},{bool(self.power_pill_was_eaten[i])}")
+        return "".join(sb)
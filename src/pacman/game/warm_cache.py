@@ -0,0 +1,74 @@
+"""
+Precomputes every on-disk cache the game uses, for all mazes, so that
+processes started afterwards only map files and never build anything:
+
+  .cache/distances   binary shortest-path distance tables
+  .cache/paths       PathsCache files
+  .cache/next_moves  next-move tables
+
+Each maze is warmed in its own worker process. Caches that already exist are
+only checked, so the command is cheap to run again. Run it from the directory
+the games will be started from (the caches are looked up relative to it):
+
+  python -m pacman.game.warm_cache [--processes N] [--mazes 0 1 ...]
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from pacman.game.constants import DIST_NAMES, NUM_MAZES
+from pacman.game.internal import distances, next_moves
+from pacman.game.internal.maze import MAZES
+from pacman.game.internal.paths_cache import PathsCache
+
+
+def warm_maze(index: int) -> float:
+    """
+    Loads, or builds and saves, every cache of one maze.
+
+    :param index: The maze index.
+    :return: The seconds it took.
+    """
+    start = time.perf_counter()
+    maze = MAZES[index]
+    distances.load_distances(DIST_NAMES[index], len(maze.graph))
+    PathsCache.load_or_build(maze)
+    next_moves.load_or_build(maze, DIST_NAMES[index])
+    return time.perf_counter() - start
+
+
+def warm_all(indices: Optional[List[int]] = None, processes: Optional[int] = None):
+    """
+    Warms the caches of several mazes, one maze per worker process.
+
+    :param indices: The maze indices; None warms every maze.
+    :param processes: The number of worker processes; None uses one per maze (up to the CPU count).
+    """
+    if indices is None:
+        indices = list(range(NUM_MAZES))
+    if processes is None:
+        processes = min(len(indices), os.cpu_count() or 1)
+    if processes <= 1:
+        results = [warm_maze(index) for index in indices]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            results = list(pool.map(warm_maze, indices))
+    for index, seconds in zip(indices, results):
+        print(f"maze {index} ({DIST_NAMES[index]}): caches ready in {seconds:.2f}s")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Precompute the distance, path and next-move caches of every maze.")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="number of worker processes (default: one per maze)")
+    parser.add_argument("--mazes", type=int, nargs="+", default=None,
+                        help="maze indices to warm (default: all)")
+    args = parser.parse_args(argv)
+    warm_all(args.mazes, args.processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,7 @@ from __future__ import annotations
 import contextlib
 import io
 import sys
-from typing import Callable, Union
+from typing import Callable, Optional, Union
 
 from pacman.controllers.controller import Controller
 from pacman.game.game import Game
@@ -33,15 +33,24 @@ def suppress_game_output():
     return _suppress_output()
 
 
+def new_game(seed: int, game: Optional[Game] = None) -> Game:
+    """Returns a fresh game, resetting the given one instead of building a new one if there is one."""
+    with _suppress_output():
+        if game is None:
+            return Game(seed)
+        game.reset(seed)
+    return game
+
+
 def play_timed_game(
     pacman_controller: Controller,
     ghost_controller: Controller,
     *,
     max_steps: int = MAX_STEPS,
     seed: int = 0,
+    game: Optional[Game] = None,
 ) -> float:
-    with _suppress_output():
-        game = Game(seed)
+    game = new_game(seed, game)
     steps = 0
     while not game.game_over() and steps < max_steps:
         with _suppress_output():
@@ -61,10 +70,11 @@ def average_score(
     seed_offset: int = 0,
 ) -> float:
     total = 0.0
+    game = new_game(seed_offset)  # reset for every game below
     for index in range(games):
         pacman = _instantiate(pacman_controller)
         ghosts = _instantiate(ghost_controller)
-        score = play_timed_game(pacman, ghosts, seed=seed_offset + index)
+        score = play_timed_game(pacman, ghosts, seed=seed_offset + index, game=game)
         print(
             f"{prefix}  - Game {index + 1}/{games} "
             f"(max {MAX_STEPS} iterations, <={MAX_DURATION_SECONDS}s): {score:.2f}"
@@ -0,0 +1,209 @@
+"""
+The game rules as Game ran them before it delegated to FastGame: Pac-Man and
+Ghost objects keyed by GHOST, moves as MOVE members and the maze walked
+through its Node graph. Kept frozen as the reference the engines are checked
+against (test_11's golden traces pin it too) and timed against
+(benchmarks/bench_fast_game.py). Do not change the rules here.
+"""
+
+from typing import Dict, Optional
+
+from pacman.game.constants import MOVE, GHOST, PILL, POWER_PILL, GHOST_EAT_SCORE, EDIBLE_TIME, EDIBLE_TIME_REDUCTION, \
+    LAIR_REDUCTION, LEVEL_RESET_REDUCTION, COMMON_LAIR_TIME, LEVEL_LIMIT, GHOST_REVERSAL, MAX_TIME, AWARD_LIFE_LEFT, \
+    EXTRA_LIFE_SCORE, NUM_MAZES, NUM_LIVES, GHOST_SPEED_REDUCTION
+from pacman.game.internal import bitset
+from pacman.game.internal.counter_random import CounterRandom
+from pacman.game.internal.ghost import Ghost
+from pacman.game.internal.maze import MAZES
+from pacman.game.internal.pacman import PacMan
+
+
+class ReferenceGame:
+    def __init__(self, seed: int, initial_maze: int = 0):
+        self.rnd = CounterRandom(seed)
+        self.maze_index = initial_maze
+        self.current_maze = MAZES[initial_maze]
+        self.score = 0
+        self.current_level_time = 0
+        self.level_count = 0
+        self.total_time = 0
+        self.ghost_eat_multiplier = 1
+        self.game_over_flag = False
+        self.time_of_last_global_reversal = -1
+        self.pacman_was_eaten = False
+        self.pill_was_eaten = False
+        self.power_pill_was_eaten = False
+        self.ghosts_eaten = {ghost: False for ghost in GHOST}
+        self._set_pills()
+        self._init_ghosts()
+        self.pacman = PacMan(self.current_maze.initial_pacman_node_index, MOVE.LEFT, NUM_LIVES, False)
+
+    def _new_level_reset(self):
+        self.maze_index = (self.maze_index + 1) % NUM_MAZES
+        self.level_count += 1
+        self.current_maze = MAZES[self.maze_index]
+        self.current_level_time = 0
+        self.ghost_eat_multiplier = 1
+        self._set_pills()
+        self._level_reset()
+
+    def _level_reset(self):
+        self.ghost_eat_multiplier = 1
+        self._init_ghosts()
+        self.pacman.current_node_index = self.current_maze.initial_pacman_node_index
+        self.pacman.last_move_made = MOVE.LEFT
+
+    def _set_pills(self):
+        self.pills = bitset.full(len(self.current_maze.pill_indices))
+        self.power_pills = bitset.full(len(self.current_maze.power_pill_indices))
+
+    def _init_ghosts(self):
+        self.ghosts = {
+            ghost_type: Ghost(ghost_type, self.current_maze.lair_node_index, 0,
+                              int(ghost_type.initial_lair_time * (LAIR_REDUCTION **
+                                                                  (self.level_count % LEVEL_RESET_REDUCTION))),
+                              MOVE.NEUTRAL)
+            for ghost_type in GHOST
+        }
+
+    def game_over(self) -> bool:
+        return self.game_over_flag
+
+    def get_game_state(self) -> str:
+        sb = [f"{self.maze_index},{self.total_time},{self.score},{self.current_level_time},{self.level_count},"
+              f"{self.pacman.current_node_index},{self.pacman.last_move_made.value},"
+              f"{self.pacman.number_of_lives_remaining},{self.pacman.has_received_extra_life},"]
+        for ghost in self.ghosts.values():
+            sb.append(f"{ghost.current_node_index},{ghost.edible_time},{ghost.lair_time},{ghost.last_move_made.value},")
+        sb.append(bitset.to_bit_string(self.pills, len(self.current_maze.pill_indices)) + ",")
+        sb.append(bitset.to_bit_string(self.power_pills, len(self.current_maze.power_pill_indices)) + ",")
+        sb.append(f"{self.time_of_last_global_reversal},")
+        sb.append(f"{self.pacman_was_eaten},")
+        for ghost in GHOST:
+            sb.append(f"{self.ghosts_eaten[ghost]},")
+        sb.append(f"{self.pill_was_eaten},")
+        sb.append(f"{self.power_pill_was_eaten}")
+        return "".join(sb)
+
+    def advance_game(self, pacman_move: MOVE, ghost_moves: Optional[Dict[GHOST, MOVE]]):
+        # Pac-Man
+        node = self.current_maze.graph[self.pacman.current_node_index]
+        if pacman_move not in node.neighbourhood:
+            pacman_move = self.pacman.last_move_made if self.pacman.last_move_made in node.neighbourhood \
+                else MOVE.NEUTRAL
+        self.pacman.last_move_made = pacman_move
+        if pacman_move != MOVE.NEUTRAL:
+            self.pacman.current_node_index = node.neighbourhood[pacman_move]
+        self._eat_pill()
+        self._eat_power_pill()
+
+        # Ghosts: the caller's dictionary is completed in place, in its own order.
+        if ghost_moves is None:
+            ghost_moves = {ghost_type: self.ghosts[ghost_type].last_move_made for ghost_type in GHOST}
+        for ghost_type in GHOST:
+            if ghost_type not in ghost_moves:
+                ghost_moves[ghost_type] = MOVE.NEUTRAL
+        if not self._reverse_ghosts(ghost_moves):
+            self._update_ghosts(ghost_moves)
+
+        self._feast()
+        self._update_lair_times()
+        self._update_pacman_extra_life()
+        self.total_time += 1
+        self.current_level_time += 1
+        self._check_level_state()
+
+    def _eat_pill(self):
+        self.pill_was_eaten = False
+        pill_index = self.current_maze.graph[self.pacman.current_node_index].pill_index
+        if pill_index >= 0 and self.pills >> pill_index & 1:
+            self.score += PILL
+            self.pills &= ~(1 << pill_index)
+            self.pill_was_eaten = True
+
+    def _eat_power_pill(self):
+        self.power_pill_was_eaten = False
+        power_pill_index = self.current_maze.graph[self.pacman.current_node_index].power_pill_index
+        if power_pill_index >= 0 and self.power_pills >> power_pill_index & 1:
+            self.score += POWER_PILL
+            self.ghost_eat_multiplier = 1
+            self.power_pills &= ~(1 << power_pill_index)
+            new_edible_time = int(EDIBLE_TIME * (EDIBLE_TIME_REDUCTION ** (self.level_count % LEVEL_RESET_REDUCTION)))
+            for ghost in self.ghosts.values():
+                ghost.edible_time = new_edible_time if ghost.lair_time == 0 else 0
+            self.power_pill_was_eaten = True
+
+    def _reverse_ghosts(self, moves: Dict[GHOST, MOVE]) -> bool:
+        reversed = False
+        global_reverse = self.rnd.random() < GHOST_REVERSAL
+        for ghost_type in moves:
+            ghost = self.ghosts[ghost_type]
+            if self.current_level_time > 1 and ghost.lair_time == 0 and ghost.last_move_made != MOVE.NEUTRAL:
+                if self.power_pill_was_eaten or global_reverse:
+                    ghost.last_move_made = ghost.last_move_made.opposite()
+                    ghost.current_node_index = self.current_maze.graph[
+                        ghost.current_node_index].neighbourhood[ghost.last_move_made]
+                    reversed = True
+                    self.time_of_last_global_reversal = self.total_time
+        return reversed
+
+    def _update_ghosts(self, moves: Dict[GHOST, MOVE]):
+        for ghost_type, move in moves.items():
+            ghost = self.ghosts[ghost_type]
+            if ghost.lair_time == 0 and (ghost.edible_time == 0 or ghost.edible_time % GHOST_SPEED_REDUCTION != 0):
+                node = self.current_maze.graph[ghost.current_node_index]
+                if move not in node.neighbourhood or move == ghost.last_move_made.opposite():
+                    if ghost.last_move_made in node.neighbourhood:
+                        move = ghost.last_move_made
+                    else:
+                        options = node.all_possible_moves[ghost.last_move_made]
+                        move = options[self.rnd.randint(0, len(options) - 1)]
+                ghost.last_move_made = move
+                moves[ghost_type] = move
+                ghost.current_node_index = node.neighbourhood[move]
+
+    def _feast(self):
+        self.pacman_was_eaten = False
+        for ghost_type in GHOST:
+            self.ghosts_eaten[ghost_type] = False
+        near = self.current_maze.eat_neighbourhoods[self.pacman.current_node_index]
+        for ghost in self.ghosts.values():
+            if ghost.current_node_index in near:
+                if ghost.edible_time > 0:  # Pac-Man eats ghost
+                    self.score += GHOST_EAT_SCORE * self.ghost_eat_multiplier
+                    self.ghost_eat_multiplier *= 2
+                    ghost.edible_time = 0
+                    ghost.lair_time = int(COMMON_LAIR_TIME * (LAIR_REDUCTION ** (self.level_count % LEVEL_RESET_REDUCTION)))
+                    ghost.current_node_index = self.current_maze.lair_node_index
+                    ghost.last_move_made = MOVE.NEUTRAL
+                    self.ghosts_eaten[ghost.type] = True
+                else:  # Ghost eats Pac-Man
+                    self.pacman.number_of_lives_remaining -= 1
+                    self.pacman_was_eaten = True
+                    if self.pacman.number_of_lives_remaining <= 0:
+                        self.game_over_flag = True
+                    else:
+                        self._level_reset()
+                    return
+        for ghost in self.ghosts.values():
+            if ghost.edible_time > 0:
+                ghost.edible_time -= 1
+
+    def _update_lair_times(self):
+        for ghost in self.ghosts.values():
+            if ghost.lair_time > 0:
+                ghost.lair_time -= 1
+                if ghost.lair_time == 0:
+                    ghost.current_node_index = self.current_maze.initial_ghost_node_index
+
+    def _update_pacman_extra_life(self):
+        if not self.pacman.has_received_extra_life and self.score >= EXTRA_LIFE_SCORE:
+            self.pacman.has_received_extra_life = True
+            self.pacman.number_of_lives_remaining += 1
+
+    def _check_level_state(self):
+        if self.total_time + 1 > MAX_TIME:
+            self.game_over_flag = True
+            self.score += self.pacman.number_of_lives_remaining * AWARD_LIFE_LEFT
+        elif not self.pills and not self.power_pills or self.current_level_time >= LEVEL_LIMIT:
+            self._new_level_reset()
@@ -10,7 +10,7 @@ from pacman.controllers.examples.starter_ghosts import StarterGhosts
 from pacman.game.game import Game
 from pacman.game.constants import MOVE
 
-from .game_test_utils import MAX_DURATION_SECONDS, MAX_STEPS, average_score, suppress_game_output
+from .game_test_utils import MAX_DURATION_SECONDS, MAX_STEPS, average_score, new_game, suppress_game_output
 from .progress_tracker import TestProgressTracker
 
 GAMES = 5
@@ -41,9 +41,11 @@ def _train_agent(
     rng = random.Random(seed_offset)
     effective_episodes = min(episodes, simulated_cap)
     virtual_multiplier = max(1, episodes // effective_episodes)
+    episode_game = None
     for episode in range(effective_episodes):
+        episode_game = new_game(seed_offset + episode * virtual_multiplier, episode_game)
+        game = episode_game
         with suppress_game_output():
-            game = Game(seed_offset + episode * virtual_multiplier)
             ghosts = StarterGhosts()
         steps = 0
         while not game.game_over() and steps < step_limit:
@@ -0,0 +1,68 @@
+import os
+
+from pacman.game.constants import PATH_DISTANCES, DIST_NAMES, EAT_DISTANCE
+from pacman.game.internal import distances
+from pacman.game.game import Game
+from pacman.game.internal.maze import Maze, MAZES, MazeRegistry
+
+from .game_test_utils import suppress_game_output
+
+
+def test_binary_distances_match_text_table(tmp_path):
+    maze = Maze(0)
+    count = distances.table_size(len(maze.graph))
+    text = distances.load_text_distances(os.path.join(PATH_DISTANCES, DIST_NAMES[0]), count)
+
+    path = distances.binary_path(DIST_NAMES[0], str(tmp_path))
+    distances.write_binary_distances(text, path)
+    mapped = distances.load_binary_distances(path, count)
+
+    assert len(mapped) == count
+    assert list(mapped) == text
+    assert -1 in text and mapped[text.index(-1)] == -1
+
+
+def test_binary_distances_reject_wrong_size(tmp_path):
+    path = distances.binary_path("tiny", str(tmp_path))
+    distances.write_binary_distances([0, 1, 0], path)
+    try:
+        distances.load_binary_distances(path, 6)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a table of the wrong size should be rejected")
+
+
+def test_load_distances_falls_back_to_text_without_cache():
+    maze = Maze(0)
+    loaded = distances.load_distances(DIST_NAMES[0], len(maze.graph), cache_dir=None)
+    assert list(loaded) == list(maze.shortest_path_distances)
+
+
+def test_registry_loads_each_maze_once():
+    registry = MazeRegistry()
+    assert not registry.is_loaded(2)
+    maze = registry[2]
+    assert registry.is_loaded(2) and not registry.is_loaded(3)
+    assert registry[2] is maze
+    assert len(registry) == 4
+
+
+def test_games_share_registered_mazes():
+    with suppress_game_output():
+        first = Game(0)
+        second = Game(1)
+    assert first.mazes is MAZES and second.mazes is MAZES
+    assert first.current_maze is second.current_maze is MAZES[0]
+
+
+def test_eat_neighbourhoods_match_distance_table():
+    with suppress_game_output():
+        game = Game(0)
+    maze = MAZES[0]
+    neighbourhoods = maze.eat_neighbourhoods
+    assert maze.eat_neighbourhoods is neighbourhoods
+    for node in range(0, len(maze.graph), 7):
+        expected = {other for other in range(len(maze.graph))
+                    if 0 <= game.get_shortest_path_distance(node, other) <= EAT_DISTANCE}
+        assert neighbourhoods[node] == expected
@@ -0,0 +1,508 @@
+import csv
+import json
+import os
+import random
+import zlib
+
+from pacman.controllers.examples.random_pacman import RandomPacMan
+from pacman.controllers.examples.starter_ghosts import StarterGhosts
+from pacman.controllers.examples.starter_pacman import StarterPacMan
+from pacman.game.constants import EVENT, LEVEL_RESET_REDUCTION, MOVE
+from pacman.game.fast_game import FastGame, GHOSTS, MOVES, ghost_move_codes
+from pacman.game.game import Game
+from pacman.game.profiler import PHASES, PhaseProfiler
+from pacman.game.internal import state_codec
+from pacman.game.internal.events import EventBuffer
+from pacman.game.internal.next_moves import MOVE_CODES
+
+from .game_test_utils import suppress_game_output
+from .reference_game import ReferenceGame
+
+# Per-tick traces of the engine from before Game delegated to FastGame (format in the file).
+ENGINE_TRACES = os.path.join(os.path.dirname(__file__), "data", "engine_traces.json")
+
+
+def _play(game: Game, ticks: int, seed: int = 0) -> None:
+    pacman = RandomPacMan()
+    ghosts = StarterGhosts()
+    pacman.rnd.seed(seed)
+    ghosts.rnd.seed(seed)
+    with suppress_game_output():
+        for _ in range(ticks):
+            if game.game_over():
+                break
+            game.advance_game(pacman._get_move(game.copy(), -1), ghosts._get_move(game.copy(), -1))
+
+
+def test_reset_matches_fresh_game():
+    with suppress_game_output():
+        game = Game(3)
+    _play(game, 300)
+    game.reset(7)
+    with suppress_game_output():
+        fresh = Game(7)
+    assert game.get_game_state() == fresh.get_game_state()
+
+    _play(game, 200, seed=1)
+    _play(fresh, 200, seed=1)
+    assert game.get_game_state() == fresh.get_game_state()
+
+
+def _assert_engines_agree(game: Game, fast: FastGame, reference: ReferenceGame, pick_moves, ticks: int):
+    with suppress_game_output():
+        for tick in range(ticks):
+            if game.game_over():
+                break
+            pacman_move, ghost_codes = pick_moves(game)
+            game.advance_game(pacman_move, dict(zip(GHOSTS, (MOVES[code] for code in ghost_codes))))
+            reference.advance_game(pacman_move, dict(zip(GHOSTS, (MOVES[code] for code in ghost_codes))))
+            fast.advance(MOVE_CODES[pacman_move], ghost_codes)
+            assert game.get_game_state() == reference.get_game_state(), f"Game diverged at tick {tick}"
+            assert fast.get_game_state() == reference.get_game_state(), f"FastGame diverged at tick {tick}"
+            assert fast.rnd.getstate() == game.rnd.getstate() == reference.rnd.getstate()
+
+
+def test_engines_match_the_reference_tick_for_tick():
+    rnd = random.Random(0)
+    with suppress_game_output():
+        game = Game(5)
+    _assert_engines_agree(game, FastGame(5), ReferenceGame(5),
+                          lambda _: (rnd.choice(MOVES), [rnd.randrange(len(MOVES)) for _ in GHOSTS]), 3000)
+
+    pacman = StarterPacMan()
+    ghosts = StarterGhosts()
+    ghosts.rnd.seed(4)
+
+    def controllers(current: Game):
+        return (pacman._get_move(current.copy(), -1),
+                ghost_move_codes(ghosts._get_move(current.copy(), -1)))
+
+    with suppress_game_output():
+        game = Game(4)
+    reference = ReferenceGame(4)
+    game.pills &= (1 << 40) - 1  # a short level, so Pac-Man clears it
+    reference.pills &= (1 << 40) - 1
+    _assert_engines_agree(game, FastGame.from_game(game), reference, controllers, 3000)
+    assert game.get_current_level() > 0  # crossed a level transition
+
+
+def _traced_ghost_moves(pairs: str):
+    return {GHOSTS[int(pairs[i])]: MOVES[int(pairs[i + 1])] for i in range(0, len(pairs), 2)}
+
+
+def _assert_replays_trace(name: str, trace: dict, game, advance):
+    digests = trace["digests"]
+    with suppress_game_output():
+        for tick, (pacman_move, ghost_moves) in enumerate(zip(trace["pacman"], trace["ghosts"].split(","))):
+            advance(game, int(pacman_move), _traced_ghost_moves(ghost_moves))
+            digest = "%08x" % zlib.crc32(game.get_game_state().encode())
+            assert digest == digests[8 * tick:8 * tick + 8], f"{type(game).__name__} left {name} at tick {tick}"
+    assert game.get_game_state() == trace["final_state"]
+
+
+def test_engines_reproduce_the_recorded_traces():
+    with open(ENGINE_TRACES) as f:
+        traces = json.load(f)["traces"]
+    for name, trace in traces.items():
+        seed, maze = trace["seed"], trace["maze"]
+        with suppress_game_output():
+            game = Game(seed, maze)
+        _assert_replays_trace(name, trace, game, lambda g, move, ghost_moves: g.advance_game(MOVES[move], ghost_moves))
+        _assert_replays_trace(name, trace, ReferenceGame(seed, maze),
+                              lambda g, move, ghost_moves: g.advance_game(MOVES[move], ghost_moves))
+        if trace["fast_game"]:
+            _assert_replays_trace(name, trace, FastGame(seed, maze),
+                                  lambda g, move, ghost_moves: g.advance(move, ghost_move_codes(ghost_moves)))
+    assert traces["level_clear"]["final_state"].split(",")[4] == "1"  # the trace crosses a level clear
+
+
+def test_controllers_reproduce_the_recorded_matchup():
+    # StarterGhosts hands back the same dictionary every tick, so this also
+    # pins advance_game completing it in place.
+    with open(ENGINE_TRACES) as f:
+        trace = json.load(f)["traces"]["starter_matchup"]
+    pacman = StarterPacMan()
+    ghosts = StarterGhosts()
+    ghosts.rnd.seed(4)
+
+    def advance(game: Game, move: int, ghost_moves):
+        assert pacman._get_move(game.copy(), -1) is MOVES[move]
+        chosen = ghosts._get_move(game.copy(), -1)
+        assert list(chosen.items()) == list(ghost_moves.items())
+        game.advance_game(MOVES[move], chosen)
+
+    with suppress_game_output():
+        game = Game(trace["seed"], trace["maze"])
+    _assert_replays_trace("starter_matchup", trace, game, advance)
+
+
+def test_fast_game_round_trips_through_game():
+    with suppress_game_output():
+        game = Game(1)
+    _play(game, 250)
+    fast = FastGame.from_game(game)
+    copy = fast.copy()
+    fast.advance(MOVE_CODES[MOVE.LEFT])
+    with suppress_game_output():
+        target = Game(9)
+    copy.write_to(target)
+    assert target.get_game_state() == game.get_game_state()
+    assert target.rnd.getstate() == game.rnd.getstate()
+
+
+def test_pacman_and_ghosts_are_views_of_the_game():
+    with suppress_game_output():
+        game = Game(2)
+    _play(game, 150)
+    pacman = game.pacman
+    assert (pacman.current_node_index, pacman.last_move_made, pacman.number_of_lives_remaining) == (
+        game.get_pacman_current_node_index(), game.get_pacman_last_move_made(),
+        game.get_pacman_number_of_lives_remaining())
+    for ghost_type, ghost in game.ghosts.items():
+        assert ghost.type is ghost_type
+        assert (ghost.current_node_index, ghost.edible_time, ghost.lair_time, ghost.last_move_made) == (
+            game.get_ghost_current_node_index(ghost_type), game.get_ghost_edible_time(ghost_type),
+            game.get_ghost_lair_time(ghost_type), game.get_ghost_last_move_made(ghost_type))
+
+    # Writes go to the game, and not to snapshots sharing its state.
+    reader = game.snapshot()
+    state = reader.get_game_state()
+    blinky = game.ghosts[GHOSTS[0]]
+    blinky.lair_time += 5
+    blinky.last_move_made = MOVE.NEUTRAL
+    pacman.number_of_lives_remaining += 1
+    assert game.get_ghost_lair_time(GHOSTS[0]) == reader.get_ghost_lair_time(GHOSTS[0]) + 5
+    assert game.get_ghost_last_move_made(GHOSTS[0]) is MOVE.NEUTRAL
+    assert game.get_pacman_number_of_lives_remaining() == reader.get_pacman_number_of_lives_remaining() + 1
+    assert reader.get_game_state() == state
+
+    # The caller's ghost moves are completed in place, with the moves the ghosts took.
+    with suppress_game_output():
+        game = Game(3)
+    _play(game, 100)
+    ghost_moves = {GHOSTS[1]: MOVE.UP}
+    free = [ghost for ghost in GHOSTS if game.get_ghost_lair_time(ghost) == game.get_ghost_edible_time(ghost) == 0]
+    with suppress_game_output():
+        game.advance_game_without_reverse(MOVE.LEFT, ghost_moves)
+    assert list(ghost_moves) == [GHOSTS[1], GHOSTS[0], GHOSTS[2], GHOSTS[3]]
+    assert free and all(ghost_moves[ghost] is game.get_ghost_last_move_made(ghost) for ghost in free)
+
+
+def test_pill_bitsets_match_pill_queries():
+    with suppress_game_output():
+        game = Game(4)
+    _play(game, 400)
+    maze = game.get_current_maze()
+    copy = game.copy()
+    pills = [i for i in range(game.get_number_of_pills()) if game.is_pill_still_available(i)]
+    power_pills = [i for i in range(game.get_number_of_power_pills()) if game.is_power_pill_still_available(i)]
+    assert 0 < len(pills) < game.get_number_of_pills()
+    assert game.get_number_of_active_pills() == len(pills)
+    assert game.get_number_of_active_power_pills() == len(power_pills)
+    assert game.get_active_pills_indices() == tuple(maze.pill_indices[i] for i in pills)
+    assert game.get_active_power_pills_indices() == tuple(maze.power_pill_indices[i] for i in power_pills)
+    assert game.get_active_pills_indices() is game.get_active_pills_indices()  # cached, not rebuilt
+    assert not game.is_pill_still_available(-1)
+
+    state = game.get_game_state().split(",")
+    assert state[25] == "".join("1" if i in pills else "0" for i in range(game.get_number_of_pills()))
+
+    # The copy shares nothing mutable: eating a pill there leaves the original untouched.
+    copy.pacman.current_node_index = maze.pill_indices[pills[0]]
+    copy._eat_pill()
+    assert copy.get_number_of_active_pills() == len(pills) - 1
+    assert not copy.is_pill_still_available(pills[0])
+    assert game.get_active_pills_indices() == tuple(maze.pill_indices[i] for i in pills)
+
+    restored = game.copy()
+    restored.set_game_state(game.get_game_state())
+    assert restored.get_game_state() == game.get_game_state()
+
+
+def test_snapshots_copy_only_when_advanced():
+    with suppress_game_output():
+        game = Game(6)
+    _play(game, 100)
+    stats = game.copy_stats
+    copies = stats.copies
+    state = game.get_game_state()
+
+    reader = game.snapshot()
+    assert reader.get_game_state() == state
+    assert stats.copies == copies  # reading shares everything
+
+    lookahead = game.snapshot()
+    expected = game.copy()
+    copies = stats.copies
+    with suppress_game_output():
+        lookahead.advance_game(MOVE.LEFT, None)
+        expected.advance_game(MOVE.LEFT, None)
+    assert stats.copies == copies + 1
+    assert lookahead.get_game_state() == expected.get_game_state()
+    assert game.get_game_state() == state == reader.get_game_state()
+
+    # Advancing the live game leaves snapshots handed out earlier untouched.
+    _play(game, 20, seed=2)
+    assert game.get_game_state() != state
+    assert reader.get_game_state() == state
+    assert stats.snapshots >= 2
+
+
+def _advance_and_undo(game: Game, moves, depth: int):
+    state = game.get_game_state()
+    rnd_state = game.rnd.getstate()
+    with suppress_game_output():
+        for _ in range(depth):
+            game.advance_game(moves(), None, undoable=True)
+    for _ in range(depth):
+        game.undo()
+    assert game.get_game_state() == state
+    assert game.rnd.getstate() == rnd_state
+
+
+def test_undo_restores_the_exact_state():
+    rnd = random.Random(4)
+    with suppress_game_output():
+        game = Game(8)
+    for _ in range(300):
+        _advance_and_undo(game, lambda: rnd.choice(MOVES), 3)
+        _play(game, 3, seed=rnd.randrange(100))
+        if game.game_over():
+            break
+
+    # A move that clears the level (new maze, new ghosts) is undone as well.
+    with suppress_game_output():
+        game = Game(8)
+    maze = game.get_current_maze()
+    node = maze.graph[maze.pill_indices[0]]
+    move, neighbour = next(iter(node.neighbourhood.items()))
+    game.pills = 1
+    game.power_pills = 0
+    game.pacman.current_node_index = neighbour
+    _advance_and_undo(game, lambda: move.opposite(), 1)
+    with suppress_game_output():
+        game.advance_game(move.opposite(), None, undoable=True)
+    assert game.get_current_level() == 1
+    game.undo()
+    assert game.get_current_level() == 0 and game.get_current_maze() is maze
+
+    try:
+        game.undo()
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("undo() without an undoable move should fail")
+
+
+def test_binary_state_round_trips():
+    with suppress_game_output():
+        game = Game(6)
+        target = Game(1)
+    records = []
+    for _ in range(60):
+        _play(game, 10, seed=len(records))
+        records.append((game.to_bytes(), game.get_game_state(), game.ghost_eat_multiplier))
+        if game.game_over():
+            break
+
+    data = b"".join(record for record, _, _ in records)
+    offset = 0
+    for record, state, multiplier in records:
+        offset = target.from_bytes(data, offset)
+        assert target.get_game_state() == state
+        assert target.ghost_eat_multiplier == multiplier
+        assert target.to_bytes() == record
+    assert offset == len(data)
+    assert state_codec.split_records(data) == [record for record, _, _ in records]
+
+    try:
+        target.from_bytes(b"\xff" + records[0][0][1:])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("from_bytes() should reject an unknown version")
+
+
+def test_state_hash_follows_the_state():
+    rnd = random.Random(5)
+    with suppress_game_output():
+        game = Game(9)
+        other = Game(2)
+    hashes = set()
+    for _ in range(200):
+        state_hash = game.state_hash()
+        hashes.add(state_hash)
+        # Incremental and from-scratch hashes agree, and copies carry the hash.
+        fresh = game.copy()
+        fresh._pills_hash = None
+        assert fresh.state_hash() == state_hash == game.copy().state_hash()
+        other.from_bytes(game.to_bytes())
+        assert other.state_hash() == state_hash
+        _advance_and_undo(game, lambda: rnd.choice(MOVES), 2)
+        assert game.state_hash() == state_hash
+        _play(game, 2, seed=rnd.randrange(100))
+        if game.game_over():
+            break
+    assert len(hashes) > 100
+
+    # The score and clocks are not part of the hash.
+    state_hash = game.state_hash()
+    game.score += 10
+    game.total_time += 1
+    assert game.state_hash() == state_hash
+    game.pacman.current_node_index += 1
+    assert game.state_hash() != state_hash
+
+    # The level count sets the edible and lair times, so it is hashed (modulo LEVEL_RESET_REDUCTION).
+    state_hash = game.state_hash()
+    game.level_count += 4
+    assert game.state_hash() != state_hash
+    game.level_count += LEVEL_RESET_REDUCTION - 4
+    assert game.state_hash() == state_hash
+
+
+def test_copies_continue_the_random_stream_and_forks_diverge():
+    with suppress_game_output():
+        game = Game(3)
+    _play(game, 50)
+    rnd = game.rnd.copy()
+    draws = [game.rnd.random() for _ in range(5)]
+    assert [rnd.random() for _ in range(5)] == draws
+
+    # A copy draws what the original draws next, so both play out identically.
+    copy = game.copy()
+    _play(game, 200, seed=3)
+    _play(copy, 200, seed=3)
+    assert copy.get_game_state() == game.get_game_state()
+    assert copy.rnd.getstate() == game.rnd.getstate()
+
+    # Forks are reproducible from the same state and independent of each other.
+    state = game.rnd.getstate()
+    forks = [game.fork() for _ in range(3)]
+    game.rnd.setstate(state)
+    again = [game.fork() for _ in range(3)]
+    streams = [[fork.rnd.getrandbits(64) for _ in range(4)] for fork in forks]
+    assert streams == [[fork.rnd.getrandbits(64) for _ in range(4)] for fork in again]
+    assert len({tuple(stream) for stream in streams}) == 3
+    assert all(fork.get_game_state() == game.get_game_state() for fork in forks)
+
+
+def test_advance_until_decision_matches_tick_by_tick_play():
+    rnd = random.Random(6)
+    skip_ghosts = StarterGhosts()
+    step_ghosts = StarterGhosts()
+    skip_ghosts.rnd.seed(6)
+    step_ghosts.rnd.seed(6)
+    with suppress_game_output():
+        skipping = Game(6)
+        stepping = Game(6)
+
+    def pacman_policy(game: Game):
+        return rnd.choice(game.get_possible_moves(game.get_pacman_current_node_index()))
+
+    score = lives_lost = ticks = 0
+    with suppress_game_output():
+        while not skipping.game_over() and ticks < 2000:
+            state = rnd.getstate()
+            summary = skipping.advance_until_decision(pacman_policy, lambda game: skip_ghosts._get_move(game, -1), 40)
+            rnd.setstate(state)
+            move = pacman_policy(stepping)
+            for _ in range(summary.ticks):
+                stepping.advance_game(move, step_ghosts._get_move(stepping.copy(), -1))
+                node = stepping.get_current_maze().graph[stepping.get_pacman_current_node_index()]
+                options = node.all_possible_moves[stepping.get_pacman_last_move_made()]
+                move = options[0]
+            assert skipping.get_game_state() == stepping.get_game_state()
+            assert summary.pacman_decisions == 1 and summary.ticks >= 1
+            score += summary.score
+            lives_lost += summary.lives_lost
+            ticks += summary.ticks
+    assert score == skipping.get_score()
+    assert ticks == skipping.get_total_time()
+    assert lives_lost == 3 - skipping.get_pacman_number_of_lives_remaining() + skipping.pacman.has_received_extra_life
+
+
+def test_event_buffer_matches_polled_flags():
+    with suppress_game_output():
+        game = Game(2)
+    assert game.events is None
+    events = game.attach_events()
+    pacman = RandomPacMan()
+    ghosts = StarterGhosts()
+    pacman.rnd.seed(2)
+    ghosts.rnd.seed(2)
+    polled = []
+    with suppress_game_output():
+        for _ in range(3000):
+            if game.game_over():
+                break
+            tick = game.get_total_time()
+            game.copy().advance_game(MOVE.LEFT, None)  # copies do not record
+            game.advance_game(pacman._get_move(game.snapshot(), -1), ghosts._get_move(game.snapshot(), -1))
+            if game.was_pill_eaten():
+                polled.append((tick, EVENT.PILL_EATEN, None))
+            if game.was_power_pill_eaten():
+                polled.append((tick, EVENT.POWER_PILL_EATEN, None))
+            for index, ghost in enumerate(GHOSTS):
+                if game.was_ghost_eaten(ghost):
+                    polled.append((tick, EVENT.GHOST_EATEN, index))
+            if game.was_pacman_eaten():
+                polled.append((tick, EVENT.PACMAN_EATEN, game.get_pacman_number_of_lives_remaining()))
+    recorded = events.drain()
+    assert [(e.tick, e.kind, e.value if e.kind >= EVENT.GHOST_EATEN else None)
+            for e in recorded if e.kind <= EVENT.PACMAN_EATEN] == polled
+    assert any(e.kind == EVENT.PILL_EATEN for e in recorded)
+    assert any(e.kind == EVENT.PACMAN_EATEN for e in recorded)
+    assert game.game_over() == (recorded[-1].kind == EVENT.GAME_OVER)
+    assert len(events) == 0 and events.dropped == 0
+
+    # Lookahead that is taken back leaves nothing behind, even in a full buffer.
+    with suppress_game_output():
+        game = Game(0)
+        for _ in range(5):
+            game.advance_game(MOVE.LEFT, None)
+        events = game.attach_events(capacity=2)
+        for move in MOVE:
+            game.advance_game(move, None, undoable=True)
+            game.advance_game(move, None, undoable=True)
+            game.advance_game(move, None, undoable=True)
+            game.undo()
+            game.undo()
+            game.undo()
+    assert events.drain() == [] and events.dropped == 0
+    with suppress_game_output():
+        game.advance_game(MOVE.LEFT, None, undoable=True)
+        game.advance_game(MOVE.LEFT, None, undoable=True)
+        game.undo()
+    assert [e.tick for e in events.drain()] == [5]
+
+    # A full buffer keeps the newest events.
+    small = EventBuffer(3)
+    for tick in range(5):
+        small.append(tick, EVENT.PILL_EATEN, 0, tick)
+    assert [e.tick for e in small.drain()] == [2, 3, 4] and small.dropped == 2
+
+
+def test_phase_profiler_counts_engine_phases(tmp_path):
+    with suppress_game_output():
+        game = Game(4)
+        plain = Game(4)
+    profiler = PhaseProfiler()
+    profiler.attach(game)
+    _play(game, 100)
+    _play(plain, 100)
+    assert game.get_game_state() == plain.get_game_state()
+    assert type(game.snapshot()) is Game and type(game.copy()) is Game
+    assert profiler.calls['advance_game'] == profiler.calls['_feast'] == 100
+    assert profiler.nanoseconds['advance_game'] >= profiler.nanoseconds['update_game'] > 0
+
+    profiler.save(str(tmp_path / "phases.json"))
+    profiler.save(str(tmp_path / "phases.csv"))
+    with open(tmp_path / "phases.json") as f:
+        assert [row['phase'] for row in json.load(f)] == list(PHASES)
+    with open(tmp_path / "phases.csv") as f:
+        assert next(csv.DictReader(f))['calls'] == '100'
+
+    PhaseProfiler.detach(game)
+    _play(game, 10)
+    assert type(game) is Game and profiler.calls['advance_game'] == 100
@@ -0,0 +1,290 @@
+import os
+import random
+import threading
+
+from pacman.game.constants import DM, MOVE
+from pacman.game.game import Game
+from pacman.game.internal.a_star import AStar, HeapAStar
+from pacman.game.internal.maze import MAZES
+from pacman.game.internal import next_moves
+from pacman.game.internal.path_view import PathView
+from pacman.game.internal.paths_cache import PATHS_CACHES, PathsCache, build_all
+
+from .game_test_utils import suppress_game_output
+
+
+def _reachable_nodes_of(maze):
+    return [i for i, node in enumerate(maze.graph) if node.neighbourhood]
+
+
+def _reachable_nodes(game: Game):
+    return _reachable_nodes_of(game.get_current_maze())
+
+
+def _assert_valid_shortest_paths(game: Game, pairs: int = 200, seed: int = 0):
+    rnd = random.Random(seed)
+    nodes = _reachable_nodes(game)
+    graph = game.get_current_maze().graph
+    for _ in range(pairs):
+        a, b = rnd.choice(nodes), rnd.choice(nodes)
+        path = game.get_shortest_path(a, b)
+        assert len(path) >= game.get_shortest_path_distance(a, b)
+        assert a == b or path[-1] == b
+        for x, y in zip([a] + list(path), path):
+            assert y in graph[x].neighbourhood.values()
+
+
+def test_path_cache_follows_level_transitions():
+    with suppress_game_output():
+        game = Game(0)
+        assert game.path_cache is PATHS_CACHES[0]
+        game._new_level_reset()
+        assert game.get_maze_index() == 1
+        assert game.get_current_maze() is MAZES[1]
+        assert game.path_cache is PATHS_CACHES[1]
+        _assert_valid_shortest_paths(game)
+
+        copy = game.copy()
+        assert copy.path_cache is PATHS_CACHES[1]
+
+
+def _random_queries(count: int, seed: int):
+    rnd = random.Random(seed)
+    nodes = len(MAZES[0].graph)
+    return [(rnd.randrange(nodes), rnd.randrange(nodes), rnd.choice(list(MOVE))) for _ in range(count)]
+
+
+def test_heap_a_star_matches_a_star():
+    with suppress_game_output():
+        game = Game(0)
+    graph = MAZES[0].graph
+    old = AStar()
+    old.create_graph(graph)
+    new = HeapAStar()
+    new.create_graph(graph)
+    for heuristic in (None, game):
+        for s, t, move in _random_queries(30, seed=1):
+            expected = old.compute_paths_a_star(s, t, move, heuristic)
+            old.reset_graph()
+            assert new.compute_paths_a_star(s, t, move, heuristic) == expected
+
+
+def test_heap_a_star_is_shared_between_threads():
+    astar = HeapAStar()
+    astar.create_graph(MAZES[0].graph)
+    queries = _random_queries(40, seed=2)
+    expected = [astar.compute_paths_a_star(s, t, move) for s, t, move in queries]
+    results = [None] * 4
+
+    def work(slot):
+        results[slot] = [astar.compute_paths_a_star(s, t, move) for s, t, move in queries]
+
+    workers = [threading.Thread(target=work, args=(slot,)) for slot in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(result == expected for result in results)
+
+
+def test_path_tree_matches_per_target_searches():
+    astar = HeapAStar()
+    astar.create_graph(MAZES[0].graph)
+    for s, _, move in _random_queries(10, seed=3):
+        tree = astar.compute_path_tree(s, move)
+        for t in range(0, len(MAZES[0].graph), 7):
+            assert astar.route_from_tree(tree, t) == astar.compute_paths_a_star(s, t, move)
+
+
+def test_build_all_matches_in_process_build(tmp_path):
+    with suppress_game_output():
+        build_all([0, 1], str(tmp_path), processes=2)
+    files = sorted(os.listdir(str(tmp_path)))
+    assert len(files) == 2
+    built = []
+    for name in files:
+        with open(os.path.join(str(tmp_path), name), 'rb') as f:
+            built.append(f.read())
+    for index in (0, 1):
+        expected = os.path.join(str(tmp_path), f"expected_{index}")
+        PathsCache(MAZES[index]).save(expected)
+        with open(expected, 'rb') as f:
+            assert f.read() in built
+
+
+def test_flat_cache_round_trip(tmp_path):
+    cache = PathsCache(MAZES[0])
+    path = os.path.join(str(tmp_path), "cache.bin")
+    cache.save(path)
+    loaded = PathsCache.load(path)
+    assert loaded.junction_index_converter == cache.junction_index_converter
+    nodes = _reachable_nodes_of(MAZES[0])
+    rnd = random.Random(6)
+    for _ in range(500):
+        a, b, move = rnd.choice(nodes), rnd.choice(nodes), rnd.choice(list(MOVE))
+        assert loaded.get_path_from_a2b(a, b) == cache.get_path_from_a2b(a, b)
+        assert loaded.get_path_from_a2b_ghost(a, b, move) == cache.get_path_from_a2b_ghost(a, b, move)
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:-4])
+    try:
+        PathsCache.load(path)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a truncated cache should be rejected")
+
+
+def test_path_view_behaves_like_a_list():
+    a, b, c = [1, 2, 3], [], [4, 5]
+    view = PathView.of(a, b, c)
+    expected = a + b + c
+    assert view == expected and len(view) == 5
+    assert [view[i] for i in range(-5, 5)] == [expected[i] for i in range(-5, 5)]
+    for start in range(-6, 7):
+        for stop in range(-6, 7):
+            assert view[start:stop] == expected[start:stop]
+    assert view[::2] == expected[::2]
+    assert PathView((a, 1, 3)) == [2, 3] and 3 in view and view.index(4) == 3
+
+
+def test_on_path_queries_share_the_cached_corridor():
+    cache = PATHS_CACHES[0]
+    node = next(dn for dn in cache.nodes if not dn.is_junction and dn.closest_junctions)
+    jd = node.closest_junctions[0]
+    for offset, target in enumerate(jd.path):
+        path = cache.get_path_from_a2b(node.node_id, target)
+        assert path == jd.path[:offset + 1]
+        assert all(segment[0] is jd.path for segment in path._segments)
+
+
+def _first_move_by_distance(game: Game, neighbourhood, target: int, sign: int) -> MOVE:
+    best = float('inf')
+    move = MOVE.NEUTRAL
+    for move_key, node in neighbourhood.items():
+        distance = sign * game.get_shortest_path_distance(node, target)
+        if distance < best:
+            best = distance
+            move = move_key
+    return move
+
+
+def test_next_move_tables_match_neighbour_scan():
+    with suppress_game_output():
+        game = Game(0)
+    graph = game.get_current_maze().graph
+    rnd = random.Random(4)
+    for _ in range(2000):
+        a, b = rnd.randrange(len(graph)), rnd.randrange(len(graph))
+        node = graph[a]
+        assert game.get_next_move_towards_target(a, b, DM.PATH) == _first_move_by_distance(game, node.neighbourhood, b, 1)
+        assert game.get_next_move_away_from_target(a, b, DM.PATH) == _first_move_by_distance(game, node.neighbourhood, b, -1)
+        for last_move, neighbourhood in node.all_neighbourhoods.items():
+            assert game.get_approximate_next_move_towards_target(a, b, last_move, DM.PATH) == \
+                _first_move_by_distance(game, neighbourhood, b, 1)
+            assert game.get_approximate_next_move_away_from_target(a, b, last_move, DM.PATH) == \
+                _first_move_by_distance(game, neighbourhood, b, -1)
+
+
+def test_next_move_tables_round_trip(tmp_path):
+    maze = MAZES[0]
+    size = len(maze.graph)
+    with suppress_game_output():
+        built = next_moves.load_or_build(maze, "da", str(tmp_path))
+    table = next_moves.load_next_moves(next_moves.next_moves_path("da", str(tmp_path)), size)
+    for a, b, move in _random_queries(200, seed=5):
+        assert table.towards(a, b) == built.towards(a, b) == maze.next_moves.towards(a, b)
+        assert table.approximate_away(a, b, move) == maze.next_moves.approximate_away(a, b, move)
+    try:
+        next_moves.load_next_moves(next_moves.next_moves_path("da", str(tmp_path)), size + 1)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a table for another maze size should be rejected")
+
+
+def test_batch_shortest_paths_match_single_queries():
+    with suppress_game_output():
+        game = Game(0)
+    graph = game.get_current_maze().graph
+    nodes = _reachable_nodes(game)
+    rnd = random.Random(7)
+    for _ in range(20):
+        source = rnd.choice(nodes)
+        targets = rnd.sample(nodes, 60)
+        tree = game.get_shortest_paths(source, targets)
+        assert sorted(tree.nearest) == sorted(targets)
+        for target in targets:
+            path = tree.path(target)
+            assert len(path) == tree.distance(target) == game.get_shortest_path_distance(source, target)
+            for x, y in zip([source] + path, path):
+                assert y in graph[x].neighbourhood.values()
+            if target != source:
+                assert tree.first_move(target) == game.get_next_move_towards_target(source, target, DM.PATH)
+
+        nearest = game.get_shortest_paths(source, targets, k=3)
+        expected = sorted(targets, key=lambda t: (game.get_shortest_path_distance(source, t), targets.index(t)))
+        assert nearest.nearest == expected[:3]
+        assert nearest.nearest[0] == game.get_closest_node_index_from_node_index(source, targets, DM.PATH)
+
+
+def test_incremental_planner_keeps_plans_optimal_while_chasing():
+    with suppress_game_output():
+        game = Game(0)
+    graph = game.get_current_maze().graph
+    nodes = _reachable_nodes(game)
+    for use_heuristic in (True, False):
+        planner = game.create_path_planner(use_heuristic)
+        rnd = random.Random(3)
+        chaser, target = rnd.choice(nodes), rnd.choice(nodes)
+        for step in range(300):
+            if step % 50 == 49:
+                chaser = rnd.choice(nodes)  # teleports force larger repairs
+            path = planner.update(chaser, target)
+            assert len(path) == planner.distance() == game.get_shortest_path_distance(chaser, target)
+            for x, y in zip([chaser] + path, path):
+                assert y in graph[x].neighbourhood.values()
+            if path:
+                assert planner.next_move(chaser, target) == \
+                    game.get_move_to_make_to_reach_direct_neighbour(chaser, path[0])
+                chaser = path[0]
+            target = rnd.choice(list(graph[target].neighbourhood.values()))
+
+    lair = game.get_current_maze().lair_node_index
+    planner = game.create_path_planner()
+    assert planner.update(nodes[0], lair) == []
+    assert planner.next_move(nodes[0], lair) == MOVE.NEUTRAL
+
+
+def test_int_coded_moves_match_the_enum_api():
+    from pacman.game.constants import MOVE_CODES, MOVES, NEUTRAL_CODE, OPPOSITE_CODES
+
+    assert [MOVES[OPPOSITE_CODES[MOVE_CODES[move]]] for move in MOVE] == [move.opposite() for move in MOVE]
+    with suppress_game_output():
+        game = Game(0)
+    graph = game.get_current_maze().graph
+    for i, node in enumerate(graph):
+        for move in MOVE:
+            assert game.get_neighbour_i(i, MOVE_CODES[move]) == game.get_neighbour(i, move)
+        assert [MOVES[code] for code in game.get_possible_moves_i(i)] == game.get_possible_moves(i)
+        for last_move, neighbourhood in node.all_neighbourhoods.items():
+            assert [MOVES[code] for code in game.get_possible_moves_i(i, MOVE_CODES[last_move])] == \
+                list(neighbourhood)
+    assert game.get_pacman_last_move_made_i() == MOVE_CODES[game.get_pacman_last_move_made()]
+
+    rnd = random.Random(5)
+    for _ in range(1000):
+        a, b = rnd.randrange(len(graph)), rnd.randrange(len(graph))
+        assert MOVES[game.get_next_move_towards_target_i(a, b)] == \
+            game.get_next_move_towards_target(a, b, DM.PATH)
+        assert MOVES[game.get_next_move_away_from_target_i(a, b)] == \
+            game.get_next_move_away_from_target(a, b, DM.PATH)
+        for last_move in graph[a].all_neighbourhoods:
+            code = MOVE_CODES[last_move]
+            assert MOVES[game.get_approximate_next_move_towards_target_i(a, b, code)] == \
+                game.get_approximate_next_move_towards_target(a, b, last_move, DM.PATH)
+            assert MOVES[game.get_approximate_next_move_away_from_target_i(a, b, code)] == \
+                game.get_approximate_next_move_away_from_target(a, b, last_move, DM.PATH)
+    assert game.get_neighbour_i(0, NEUTRAL_CODE) == -1
@@ -0,0 +1,60 @@
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from pacman.game.constants import DIST_NAMES
+from pacman.game.internal import next_moves
+from pacman.game.internal.build_lock import BuildLock
+from pacman.game.internal.maze import MAZES
+from pacman.game.internal.paths_cache import PathsCache
+from pacman.game.warm_cache import warm_all
+
+
+def _load_or_build_log(cache_dir: str) -> str:
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        PathsCache.load_or_build(MAZES[0], cache_dir)
+    return output.getvalue()
+
+
+def test_build_lock_excludes_and_releases(tmp_path):
+    path = os.path.join(str(tmp_path), "cache.lock")
+    first = BuildLock(path)
+    assert first.acquire(timeout=0)
+    assert not BuildLock(path).acquire(timeout=0.1)
+    first.release()
+    assert not os.path.exists(path)
+    with BuildLock(path) as second:
+        assert second.held
+
+
+def test_build_lock_breaks_abandoned_locks(tmp_path):
+    path = os.path.join(str(tmp_path), "cache.lock")
+    with open(path, 'w') as f:
+        f.write(str(os.getpid()))
+    old = time.time() - 60
+    os.utime(path, (old, old))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert BuildLock(path, stale_after=30).acquire(timeout=1)
+
+
+def test_concurrent_cold_start_builds_once(tmp_path):
+    cache_dir = str(tmp_path)
+    MAZES[0]  # load before forking so workers race on the build only
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        logs = list(pool.map(_load_or_build_log, [cache_dir] * 4))
+    assert sum("Building new PathsCache" in log for log in logs) == 1
+    assert not any("Failed to load cache" in log for log in logs)
+    assert [name for name in os.listdir(cache_dir) if not name.endswith(".bin")] == []
+
+
+def test_warm_cache_leaves_nothing_to_build():
+    with contextlib.redirect_stdout(io.StringIO()):
+        warm_all([0], processes=1)
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        warm_all([0], processes=1)
+    assert "Building" not in log.getvalue()
+    assert os.path.exists(next_moves.next_moves_path(DIST_NAMES[0], next_moves.DEFAULT_CACHE_DIR))
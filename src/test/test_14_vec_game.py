@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from pacman.game.fast_game import GHOSTS, MOVES
+from pacman.game.game import Game
+
+from .game_test_utils import suppress_game_output
+
+np = pytest.importorskip("numpy")
+from pacman.game.vec_game import VecGame  # noqa: E402
+
+
+def test_vec_game_matches_game_per_row():
+    seeds = [0, 1, 2, 3, 4, 5]
+    rnd = random.Random(0)
+    with suppress_game_output():
+        games = [Game(seed) for seed in seeds]
+    vec = VecGame(seeds, auto_reset=False)
+    for tick in range(1500):
+        pacman_moves = [rnd.randrange(len(MOVES)) for _ in seeds]
+        ghost_moves = np.array([[rnd.randrange(len(MOVES)) for _ in GHOSTS] for _ in seeds])
+        running = [not game.game_over() for game in games]
+        with suppress_game_output():
+            for i, game in enumerate(games):
+                if running[i]:
+                    game.advance_game(MOVES[pacman_moves[i]], dict(zip(GHOSTS, (MOVES[c] for c in ghost_moves[i]))))
+        rewards, dones = vec.step(pacman_moves, ghost_moves)
+        for i, game in enumerate(games):
+            if running[i]:
+                assert vec.get_game_state(i) == game.get_game_state(), f"game {i} diverged at tick {tick}"
+                assert dones[i] == game.game_over()
+
+
+def test_vec_game_auto_resets_finished_games():
+    vec = VecGame([7, 8])
+    vec.lives[:] = 1
+    rnd = np.random.default_rng(0)
+    ended = None
+    for _ in range(5000):
+        scores = vec.score.copy()
+        rewards, dones = vec.step(rnd.integers(0, len(MOVES), 2), rnd.integers(0, len(MOVES), (2, len(GHOSTS))))
+        if dones.any():
+            ended = int(np.nonzero(dones)[0][0])
+            break
+    assert ended is not None
+    assert vec.final_scores[ended] == scores[ended] + rewards[ended]
+    with suppress_game_output():
+        fresh = Game(int(vec.seeds[ended]))
+    assert vec.get_game_state(ended) == fresh.get_game_state()
+    assert not vec.game_over.any()